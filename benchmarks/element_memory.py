@@ -0,0 +1,90 @@
+
+"""
+memory per element wrapper, measured with tracemalloc in plain CPython
+(using the headless DOM). Run from the repository root:
+
+    python benchmarks/element_memory.py [count] [--baseline DIR]
+
+The elements are never attached to the document, so their DOM nodes are not
+created and only the python side is measured.
+
+--baseline DIR measures the package in DIR as well (e.g. a worktree of an older
+commit: git worktree add /tmp/baseline 49756df) and prints the reduction
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+from pyscript_bootstrap_templates import HTML
+from pyscript_bootstrap_templates import bootstrap_HTML as bHTML
+from pyscript_bootstrap_templates import bootstrap_inputs as bInputs
+
+
+def measure(factory, count: int) -> float:
+    """average bytes allocated per object created by factory"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def measure_cases(count: int) -> dict:
+    """case name -> (bytes per element, whether instances have a __dict__)"""
+    cases = {
+        "HTML.Div": lambda: HTML.Div(),
+        "HTML.Td": lambda: HTML.Td(),
+        "bHTML.Button": lambda: bHTML.ButtonPrimary("x"),
+        # a grid cell as in examples/03_numpy_grid_demo: container, label, input (and help)
+        "bInputs.InputFloat": lambda: bInputs.InputFloat(),
+    }
+
+    return {name: (measure(factory, count), hasattr(factory(), "__dict__"))
+            for name, factory in cases.items()}
+
+
+def measure_baseline(directory: str, count: int) -> dict:
+    """measure_cases of the package in directory, run in a fresh interpreter"""
+    environment = dict(os.environ, PYTHONPATH=os.path.abspath(directory))
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), str(count), "--json"],
+                            env=environment, capture_output=True, text=True, check=True,
+                            cwd=os.path.abspath(directory))
+    return json.loads(result.stdout)
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="memory per element wrapper")
+    argument_parser.add_argument("count", type=int, nargs="?", default=2000)
+    argument_parser.add_argument("--baseline", type=str, default=None,
+                                 help="package tree to compare against")
+    argument_parser.add_argument("--json", action="store_true", help=argparse.SUPPRESS)
+    args = argument_parser.parse_args()
+
+    results = measure_cases(args.count)
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    if args.baseline is None:
+        print(f"{'element':<24}{'bytes/element':>16}{'__dict__':>10}")
+        for name, (nbytes, has_dict) in results.items():
+            print(f"{name:<24}{nbytes:>16.0f}{str(has_dict):>10}")
+        return
+
+    baseline = measure_baseline(args.baseline, args.count)
+    print(f"{'element':<24}{'baseline':>10}{'current':>10}{'reduction':>11}{'__dict__':>10}")
+    for name, (nbytes, has_dict) in results.items():
+        before = baseline[name][0]
+        print(f"{name:<24}{before:>10.0f}{nbytes:>10.0f}{1 - nbytes / before:>11.0%}{str(has_dict):>10}")
+
+
+if __name__ == "__main__":
+    main()
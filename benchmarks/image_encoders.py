@@ -0,0 +1,74 @@
+
+"""
+encode time and output size of the image encoder policies (see HTML.ImageEncoder),
+on arrays like the ones the examples show. Run from the repository root:
+
+    python benchmarks/image_encoders.py [size] [repeat]
+
+size is the side length of the square test images (default 1000, i.e. one
+megapixel). Times are the best of repeat runs, in plain CPython; pyodide is
+slower, but the ratios between the policies are about the same.
+"""
+
+import sys
+import time
+
+import numpy as np
+from PIL import Image as PILImage
+
+from pyscript_bootstrap_templates import HTML
+
+
+def test_images(size: int) -> dict:
+    rows, columns = np.mgrid[0:size, 0:size]
+    gradient = np.stack([columns * 255 // size,
+                         rows * 255 // size,
+                         (rows + columns) * 255 // (2 * size)], axis=-1).astype(np.uint8)
+    # a camera image: smooth content plus sensor noise
+    noise = np.random.default_rng(0).integers(-20, 20, gradient.shape)
+    photo = np.clip(gradient.astype(int) + noise, 0, 255).astype(np.uint8)
+    # a mask overlay as in examples/04_cell_detector: few flat colors with alpha
+    overlay = np.zeros((size, size, 4), dtype=np.uint8)
+    overlay[(rows // 50 + columns // 50) % 2 == 0] = (255, 0, 0, 128)
+    return {"gradient": gradient, "photo": photo, "overlay": overlay}
+
+
+def policies() -> dict:
+    return {
+        "png": HTML.PngEncoder(),
+        "png level 1": HTML.PngEncoder(compress_level=1),
+        "jpeg 75": HTML.JpegEncoder(),
+        "jpeg 90": HTML.JpegEncoder(quality=90),
+        "webp 80": HTML.WebpEncoder(),
+        "bmp": HTML.BmpEncoder(),
+        "auto 100ms": HTML.AutoEncoder(),
+        "auto 20ms": HTML.AutoEncoder(latency_budget_ms=20),
+        "auto jpeg 20ms": HTML.AutoEncoder(latency_budget_ms=20, jpeg_quality=90),
+    }
+
+
+def measure(encoder, img: PILImage, repeat: int) -> tuple:
+    """best encode time in ms and size of the output in bytes"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data, mime_type = encoder.encode(img)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(data), mime_type
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    print(f"{'image':<10}{'policy':<16}{'ms':>10}{'bytes':>12}  mime type")
+    for image_name, m in test_images(size).items():
+        img = PILImage.fromarray(m)
+        for policy_name, encoder in policies().items():
+            elapsed, nbytes, mime_type = measure(encoder, img, repeat)
+            print(f"{image_name:<10}{policy_name:<16}{elapsed:>10.1f}{nbytes:>12}  {mime_type}")
+
+
+if __name__ == "__main__":
+    main()
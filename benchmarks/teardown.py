@@ -0,0 +1,67 @@
+"""
+time to tear down a container of elements, in plain CPython (using the
+headless DOM). Run from the repository root:
+
+    python benchmarks/teardown.py [count] [repeat]
+
+count is the number of children of the container (default 2000), each with a
+child of its own that has a click listener, as the result cards of
+examples/04_cell_detector. Times are the best of repeat runs.
+"""
+
+import sys
+import time
+
+from pyscript_bootstrap_templates import HTML
+
+
+def _on_click(event) -> None:
+    pass
+
+
+def build(count: int) -> HTML.Div:
+    container = HTML.Div()
+    for _ in range(count):
+        child = HTML.Div(parent=container)
+        span = HTML.Span("x", parent=child)
+        span.add_event_listener("click", _on_click)
+        assert len(child.children) == 1
+    # create the DOM nodes, as for a container that was shown
+    container.element
+    return container
+
+
+def destroy_each_child(container: HTML.Div) -> None:
+    # destroy() removes the child from container.children, so iterate over a copy
+    for child in list(container.children):
+        child.destroy()
+
+
+def clear_children(container: HTML.Div) -> None:
+    container.clear_children()
+
+
+def measure(teardown, count: int, repeat: int) -> float:
+    """best time in ms of teardown on a freshly built container"""
+    best = None
+    for _ in range(repeat):
+        container = build(count)
+        start = time.perf_counter()
+        teardown(container)
+        elapsed = (time.perf_counter() - start) * 1000
+        assert not container.children and not container.element.childNodes
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    print(f"{'teardown':<20}{'ms':>10}")
+    for name, teardown in (("destroy each child", destroy_each_child), ("clear_children", clear_children)):
+        print(f"{name:<20}{measure(teardown, count, repeat):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
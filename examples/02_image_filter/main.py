@@ -56,9 +56,7 @@ process_button.m = 2
 
 def on_process(*args, **kwargs):
 
-    for child in app.main.children.copy():
-        app.main.remove_child(child)
-        child.destroy()
+    app.main.clear_children()
 
     file_dictionary = image_input.value
     if len(file_dictionary) == 0:
@@ -78,7 +76,7 @@ def on_process(*args, **kwargs):
 
     bHTML.HTML.H3(f"{name} ({img.shape[0]}x{img.shape[1]}):", parent=app.main)
 
-    output = bHTML.Image.from_numpy_array(img, parent=app.main)
+    output = bHTML.Image.from_numpy_array(img, progressive=True, parent=app.main)
     output.rounded = True
     output.rounded_size = 10
     output.width = "100%"
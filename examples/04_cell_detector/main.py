@@ -29,8 +29,7 @@ def process_image(image,
                   inner_hough_circles=True,
                   cell_colony_color_channel:int = None):
     
-    for child in result_div.children:
-        child.destroy()
+    result_div.clear_children()
 
     # Convert the image to grayscale
     if cell_colony_color_channel is None:
@@ -157,7 +156,7 @@ def process_image(image,
 
         well = well.copy()
         well[cleaned > 0,0] = 255
-        final_img = bHTML.Image.from_numpy_array(well, parent=div_result)
+        final_img = bHTML.Image.from_numpy_array(well.astype(np.uint8, copy=False), raw=True, parent=div_result)
         final_img.rounded = True
         final_img.rounded_size = 50
         final_img.shadow = bHTML.Shadow.LARGE
@@ -178,8 +177,8 @@ btn = bHTML.ButtonPrimary("Process", parent=app.sidebar)
 btn.w = 100
 btn.mt = 3
 btn.mb = 3
-btn.ml = 4
-btn.mr = 4
+btn.ms = 4
+btn.me = 4
 
 i_hough_min_dist = bInputs.InputInt("hough min distance [px]",
                                     parent=app.sidebar,
@@ -237,11 +236,10 @@ def on_image_change(f, *args):
         global loaded_img
         f.seek(0)
         img = np.array(Image.open(f))
-        for child in result_div.children:
-            child.destroy()
+        result_div.clear_children()
 
         bHTML.BootstrapContainer("input image:", parent=result_div)
-        output = bHTML.Image.from_numpy_array(img, parent=result_div)
+        output = bHTML.Image.from_numpy_array(img.astype(np.uint8, copy=False), raw=True, parent=result_div)
         output.rounded = True
         output.rounded_size = 10
         output.shadow = bHTML.Shadow.LARGE
@@ -255,8 +253,7 @@ def on_image_change(f, *args):
         #toast.animation = True
         #toast.show()
     except Exception as e:
-        for child in result_div.children:
-            child.destroy()
+        result_div.clear_children()
         bHTML.AlertDanger(f"error while loading image: {str(e)}", parent=alert_container)
 
 
@@ -266,8 +263,7 @@ def on_click(*args, **kwargs):
     if loaded_img is None:
         app.alert_danger("No image loaded")
         return
-    for child in result_div.children:
-        child.destroy()
+    result_div.clear_children()
 
     try:
         h_min_dist = int(i_hough_min_dist.value)
@@ -300,8 +296,7 @@ def on_click(*args, **kwargs):
         app.toast("successfully processed image", title="info")
 
     except Exception as e:
-        for child in result_div.children:
-            child.destroy()
+        result_div.clear_children()
         app.alert_danger(f"error while processing image: {str(e)}")
 
 btn.onclick = on_click
@@ -1,18 +1,860 @@
 
-from typing import Callable, Iterable, Union
-import uuid
-from js import document, CanvasRenderingContext2D  # type: ignore
-from pyodide.ffi import create_proxy  # type: ignore
-from parse import *
-import base64
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+import hashlib
+import html
+import itertools
+import re
+import time
+import weakref
+from types import MappingProxyType
+import bisect
+try:
+    from js import document, CanvasRenderingContext2D, MutationObserver, Object as JsObject  # type: ignore
+    from js import Blob, URL  # type: ignore
+    from js import setTimeout, clearTimeout, requestAnimationFrame, cancelAnimationFrame, ImageData  # type: ignore
+    from pyodide.ffi import create_proxy, create_once_callable, to_js  # type: ignore
+except ImportError:
+    # outside the browser: build element trees against the headless DOM
+    from .headless import document, CanvasRenderingContext2D, MutationObserver, Object as JsObject
+    from .headless import Blob, URL
+    from .headless import setTimeout, clearTimeout, requestAnimationFrame, cancelAnimationFrame, ImageData
+    from .headless import create_proxy, create_once_callable, to_js
 from PIL import Image as PILImage
 from io import BytesIO, StringIO
+from .markup import VOID_ELEMENTS, css_property_name, style_declarations
+
+
+# class token matching: --------------------------------------------------------
+
+# regular expressions for the parse-style fields used in class search terms
+_SEARCH_TERM_FIELDS = {
+    "{}": r".+",
+    "{:d}": r"\d+",
+    "{:w}": r"\w+",
+}
+
+# fields that never match a '-', so they can be looked up in the prefix index
+_INDEXABLE_FIELDS = ("{:d}", "{:w}")
+
+_SEARCH_TERM_FIELD_REGEX = re.compile(r"(\{[^}]*\})")
+
+
+@lru_cache(maxsize=None)
+def _compile_search_term(search_term: str) -> "re.Pattern":
+    """
+    compile a parse-style search term like 'p-{:d}' or 'order-{}' into a regular
+    expression that matches whole class tokens. Compiled patterns are cached
+    """
+    regex = ""
+    for part in _SEARCH_TERM_FIELD_REGEX.split(search_term):
+        if part.startswith("{") and part.endswith("}"):
+            regex += _SEARCH_TERM_FIELDS.get(part, r".+")
+        else:
+            regex += re.escape(part)
+    return re.compile(regex + r"\Z")
+
+
+@lru_cache(maxsize=4096)
+def _class_token_prefix(token: str) -> Union[str, None]:
+    """
+    the prefix a class token is indexed under: everything up to (and including) the last '-',
+    so 'p-3' -> 'p-', 'col-md-4' -> 'col-md-', 'order-first' -> 'order-'
+    """
+    index = token.rfind("-")
+    if index <= 0:
+        return None
+    return token[:index + 1]
+
+
+# element ids: -----------------------------------------------------------------
+
+class IdAllocator(object):
+    """
+    allocates element ids from a monotonic counter ('id-0', 'id-1', ...).
+    The ids are deterministic, so the same app code produces the same ids on every run
+    (e.g. for markup rendered ahead of time). Use a per-app prefix to keep the ids of
+    several apps on one page apart
+    """
+
+    def __init__(self, prefix: str = "id-", start: int = 0) -> None:
+        self._prefix = prefix
+        self._counter = itertools.count(start)
+
+    def __call__(self) -> str:
+        return f"{self._prefix}{next(self._counter)}"
+
+    @property
+    def prefix(self) -> str:
+        return self._prefix
+
+    def reset(self, start: int = 0) -> None:
+        self._counter = itertools.count(start)
+
+
+_id_allocator: Callable[[], str] = IdAllocator()
+
+# id -> element wrapper, without keeping destroyed/unreferenced elements alive
+_element_registry: "weakref.WeakValueDictionary[str, Element]" = weakref.WeakValueDictionary()
+
+
+def set_id_allocator(allocator: Callable[[], str]) -> None:
+    """
+    replace the id generator used for elements created without an explicit id.
+    Any callable returning a new unique string works
+    """
+    global _id_allocator
+    _id_allocator = allocator
+
+
+def get_id_allocator() -> Callable[[], str]:
+    return _id_allocator
+
+
+def new_id() -> str:
+    """a new unique id from the current id allocator"""
+    return _id_allocator()
+
+
+# events that do not bubble up to a delegating root and are always listened to directly
+_NON_BUBBLING_EVENTS = frozenset((
+    "blur", "focus", "load", "unload", "error", "abort", "scroll",
+    "mouseenter", "mouseleave", "pointerenter", "pointerleave",
+))
+
+
+class EventDelegator(object):
+    """
+    listens once per event type on a root node and dispatches to the python
+    callbacks of the element the event happened in (and its ancestors up to the root).
+    Callbacks are looked up by element id in the element registry, so the number of
+    js proxies stays constant regardless of how many elements have handlers.
+    """
+
+    def __init__(self, root) -> None:
+        self._root = root
+        # event name -> the single proxy listening on the root
+        self._proxies = {}
+
+    @property
+    def root(self):
+        return self._root
+
+    def handles(self, event_name: str) -> bool:
+        return event_name not in _NON_BUBBLING_EVENTS
+
+    def listen(self, event_name: str) -> None:
+        if event_name in self._proxies:
+            return
+        proxy = create_proxy(lambda event, name=event_name: self._dispatch(name, event))
+        self._root.addEventListener(event_name, proxy)
+        self._proxies[event_name] = proxy
+
+    def _dispatch(self, event_name: str, event) -> None:
+        node = event.target
+        while node is not None:
+            element = _element_registry.get(node.id) if node.id else None
+            if element is not None and _bound(element._element) == node:
+                for _, listener, proxy in list(element._listeners.get(event_name, ())):
+                    if proxy is None:
+                        listener(event)
+                if event.cancelBubble:
+                    return
+            if node == self._root:
+                return
+            node = node.parentElement
+
+    def destroy(self) -> None:
+        for event_name, proxy in self._proxies.items():
+            self._root.removeEventListener(event_name, proxy)
+            proxy.destroy()
+        self._proxies = {}
+
+
+class RateLimitedCallback(object):
+    """
+    base for callbacks that run the wrapped callback less often than they are called.
+    Only the latest event of a burst is passed on. destroy() cancels anything still
+    scheduled and releases the timer proxy
+    """
+
+    def __init__(self, callback: Callable) -> None:
+        self._callback = callback
+        self._pending_event = None
+        self._has_pending = False
+        self._handle = None
+        self._proxy = None
+
+    @property
+    def callback(self) -> Callable:
+        return self._callback
+
+    def _timer_proxy(self):
+        if self._proxy is None:
+            self._proxy = create_proxy(lambda *_: self._fire())
+        return self._proxy
+
+    def _fire(self) -> None:
+        self._handle = None
+        if not self._has_pending:
+            return
+        event = self._pending_event
+        self._pending_event = None
+        self._has_pending = False
+        self._callback(event)
+
+    def _cancel(self, handle) -> None:
+        raise NotImplementedError()
+
+    def __call__(self, event=None) -> None:
+        raise NotImplementedError()
+
+    def destroy(self) -> None:
+        if self._handle is not None:
+            self._cancel(self._handle)
+            self._handle = None
+        self._pending_event = None
+        self._has_pending = False
+        if self._proxy is not None:
+            self._proxy.destroy()
+            self._proxy = None
+
+
+class DebouncedCallback(RateLimitedCallback):
+    """runs the callback once calls have settled for wait_ms"""
+
+    def __init__(self, callback: Callable, wait_ms: float) -> None:
+        super().__init__(callback)
+        self._wait_ms = wait_ms
+
+    def _cancel(self, handle) -> None:
+        clearTimeout(handle)
+
+    def __call__(self, event=None) -> None:
+        self._pending_event = event
+        self._has_pending = True
+        if self._handle is not None:
+            clearTimeout(self._handle)
+        self._handle = setTimeout(self._timer_proxy(), self._wait_ms)
+
+
+class ThrottledCallback(RateLimitedCallback):
+    """
+    runs the callback at most once every interval_ms. The first call runs right away,
+    the last call of a burst runs when the interval has passed
+    """
+
+    def __init__(self, callback: Callable, interval_ms: float) -> None:
+        super().__init__(callback)
+        self._interval_ms = interval_ms
+        self._last_run = None
+
+    def _cancel(self, handle) -> None:
+        clearTimeout(handle)
+
+    def _fire(self) -> None:
+        if self._has_pending:
+            self._last_run = time.monotonic()
+        super()._fire()
+
+    def __call__(self, event=None) -> None:
+        self._pending_event = event
+        self._has_pending = True
+        if self._handle is not None:
+            return
+        elapsed_ms = None if self._last_run is None else (time.monotonic() - self._last_run) * 1000
+        if elapsed_ms is None or elapsed_ms >= self._interval_ms:
+            self._fire()
+        else:
+            self._handle = setTimeout(self._timer_proxy(), self._interval_ms - elapsed_ms)
+
+
+class AnimationFrameCallback(RateLimitedCallback):
+    """runs the callback at most once per animation frame"""
+
+    def _cancel(self, handle) -> None:
+        cancelAnimationFrame(handle)
+
+    def __call__(self, event=None) -> None:
+        self._pending_event = event
+        self._has_pending = True
+        if self._handle is None:
+            self._handle = requestAnimationFrame(self._timer_proxy())
+
+
+def rate_limited(callback: Callable,
+                 throttle_ms: float = None,
+                 debounce_ms: float = None,
+                 coalesce: str = None) -> Callable:
+    """
+    wrap callback according to at most one of the rate limiting options.
+    Returns the callback itself if no option is given
+    """
+    if sum(option is not None for option in (throttle_ms, debounce_ms, coalesce)) > 1:
+        raise ValueError("throttle_ms, debounce_ms and coalesce cannot be combined")
+    if throttle_ms is not None:
+        return ThrottledCallback(callback, throttle_ms)
+    if debounce_ms is not None:
+        return DebouncedCallback(callback, debounce_ms)
+    if coalesce is not None:
+        if coalesce != "animation_frame":
+            raise ValueError(f"unknown coalesce mode '{coalesce}'")
+        return AnimationFrameCallback(callback)
+    return callback
+
+
+_event_delegator: Union[EventDelegator, None] = None
+
+
+def set_event_delegator(delegator: Union[EventDelegator, None]) -> None:
+    """
+    route listeners added from now on through the given delegator instead of one
+    js listener per element. Pass None to go back to direct listeners
+    """
+    global _event_delegator
+    if _event_delegator is not None and _event_delegator is not delegator:
+        _event_delegator.destroy()
+    _event_delegator = delegator
+
+
+def get_event_delegator() -> Union[EventDelegator, None]:
+    return _event_delegator
+
+
+# hydration: -------------------------------------------------------------------
+#
+# a page can ship markup pre-rendered from the same python code at build time.
+# While hydrating, elements adopt the existing node with their id instead of
+# creating a new one, so the page is usable before python has run.
+
+# id -> pre-rendered node not adopted yet, None if not hydrating
+_hydration_nodes: Union[Dict[str, object], None] = None
+
+
+def begin_hydration(root) -> None:
+    """adopt the nodes with an id below root for elements created from now on"""
+    global _hydration_nodes
+    _hydration_nodes = {node.id: node for node in root.querySelectorAll("[id]")}
+
+
+def end_hydration(remove_unclaimed: bool = True) -> None:
+    """
+    stop adopting pre-rendered nodes. Nodes no element has claimed are
+    stale markup and removed, unless remove_unclaimed is False
+    """
+    global _hydration_nodes
+    nodes, _hydration_nodes = _hydration_nodes, None
+    if nodes and remove_unclaimed:
+        for node in nodes.values():
+            node.remove()
+
+
+def is_hydrating() -> bool:
+    return _hydration_nodes is not None
+
+
+# template stamping: -----------------------------------------------------------
+#
+# composite widgets (element classes with _stamped = True) build the same node
+# structure for every instance. Once a structure was built twice, a copy is kept
+# in a <template>, and later instances clone it with one call and only patch
+# what differs: ids, classes, attributes, styles and inner html.
+
+_STAMP_CACHE_SIZE = 256
+
+# marks an attribute value that references an element of the same subtree by
+# id, like aria-controls="id-3" or data-bs-target="#id-3": (_ID_REFERENCE, index, prefix)
+_ID_REFERENCE = object()
+
+
+class _StampTemplate(object):
+
+    __slots__ = ("prototype", "records")
+
+    def __init__(self, prototype, records: List[tuple]) -> None:
+        # root node of the structure, inside the content of a <template>
+        self.prototype = prototype
+        # what was written to each node of the structure, in document order
+        self.records = records
+
+
+# structure signature -> _StampTemplate, None while the structure was built only once
+_stamp_templates: "OrderedDict[tuple, Union[_StampTemplate, None]]" = OrderedDict()
+
+
+def _stamp_subtree(root: "Element") -> Union[List["Element"], None]:
+    """root and its descendants in document order, None if they cannot be stamped"""
+    elements = []
+    stack = [root]
+    while stack:
+        element = stack.pop()
+        if element._batch_depth or (element is not root and element._element is not None):
+            return None
+        inner_html = element._pending_inner_html
+        if inner_html is not None and "id=" in inner_html:
+            # nodes with ids in the inner html would shift the nodes matched by id
+            return None
+        elements.append(element)
+        stack.extend(reversed(element._children))
+    return elements
+
+
+def _stamp_records(elements: List["Element"]) -> Tuple[tuple, List[tuple]]:
+    """the structure signature of elements and what is written to each node"""
+    positions = {element._id: index for index, element in enumerate(elements)}
+    signature = []
+    records = []
+    for element in elements:
+        attributes = {}
+        for name, value in element._pending_attributes.items():
+            if value is None:
+                continue
+            if isinstance(value, str):
+                if value in positions:
+                    value = (_ID_REFERENCE, positions[value], "")
+                elif value.startswith("#") and value[1:] in positions:
+                    value = (_ID_REFERENCE, positions[value[1:]], "#")
+            attributes[name] = value
+        styles = {name: value for name, value in element._pending_styles.items() if value is not None}
+        inner_html = element._pending_inner_html
+        signature.append((element.tag_type, len(element._children), inner_html is not None,
+                          tuple(sorted(attributes)), tuple(sorted(styles))))
+        records.append((element._class_name, attributes, styles, inner_html))
+    return tuple(signature), records
+
+
+def _remember_stamp(signature: tuple, records: List[tuple], node) -> None:
+    """note that node was built for signature, and keep a template once it was built twice"""
+    if signature not in _stamp_templates:
+        _stamp_templates[signature] = None
+        if len(_stamp_templates) > _STAMP_CACHE_SIZE:
+            _stamp_templates.popitem(last=False)
+        return
+    template = document.createElement("template")
+    prototype = node.cloneNode(True)
+    template.content.appendChild(prototype)
+    _stamp_templates[signature] = _StampTemplate(prototype, records)
+    _stamp_templates.move_to_end(signature)
+
+
+def _stamp(elements: List["Element"], records: List[tuple], template: _StampTemplate):
+    """clone template for elements and bind them to the cloned nodes, None if the clone does not match"""
+    root = document.importNode(template.prototype, True)
+    nodes = [root]
+    nodes.extend(root.querySelectorAll("[id]"))
+    if len(nodes) != len(elements):
+        return None
+
+    for element, node, record, template_record in zip(elements, nodes, records, template.records):
+        class_name, attributes, styles, inner_html = record
+        template_class_name, template_attributes, template_styles, template_inner_html = template_record
+        node.id = element._id
+        if class_name != template_class_name:
+            node.className = class_name or ""
+        for name, value in attributes.items():
+            if isinstance(value, tuple) and value[0] is _ID_REFERENCE:
+                node.setAttribute(name, value[2] + elements[value[1]]._id)
+            elif value != template_attributes[name]:
+                node.setAttribute(name, value)
+        for name, value in styles.items():
+            if value != template_styles[name]:
+                setattr(node.style, name, value)
+        if inner_html != template_inner_html:
+            node.innerHTML = inner_html
+
+        element._element = node
+        element._adopted = False
+        element._pending_attributes = _NO_ENTRIES
+        element._pending_styles = _NO_ENTRIES
+        element._pending_inner_html = None
+        for event_name, listeners in element._listeners.items():
+            for _, _, proxy in listeners:
+                if proxy is not None:
+                    node.addEventListener(event_name, proxy)
+    return root
+
+
+# compiled styles: -------------------------------------------------------------
+#
+# inline styles make the browser recompute the style of every node they are
+# written to. With a StyleCompiler installed, the styles of an element are
+# turned into a generated class instead, and equal style dictionaries share
+# the class and its single rule.
+
+_STYLE_CLASS_PREFIX = "ps-style-"
+
+
+class StyleCompiler(object):
+    """
+    generates one class per distinct style dictionary, with its rule in a
+    shared <style> sheet added to the document head on first use.
+
+    Unlike inline styles, the generated rules lose against more specific
+    selectors of other style sheets
+    """
+
+    def __init__(self) -> None:
+        # sorted style items -> class token
+        self._class_names: Dict[Tuple[Tuple[str, str], ...], str] = {}
+        # class token -> css rule
+        self._rules: Dict[str, str] = {}
+        self._style_element = None
+
+    def class_name(self, style: Dict[str, str]) -> str:
+        """the class token applying style, added to the sheet if it is new"""
+        items = tuple(sorted(style.items()))
+        token = self._class_names.get(items)
+        if token is None:
+            declarations = " ".join(f"{css_property_name(name)}: {value};" for name, value in items)
+            # derived from the declarations only, so tokens are the same on every run
+            token = _STYLE_CLASS_PREFIX + hashlib.blake2s(declarations.encode(), digest_size=5).hexdigest()
+            self._class_names[items] = token
+            if token not in self._rules:
+                self._add_rule(token, f".{token} {{ {declarations} }}")
+        return token
+
+    def _add_rule(self, token: str, rule: str) -> None:
+        self._rules[token] = rule
+        if self._style_element is None:
+            self._style_element = document.createElement("style")
+            document.head.appendChild(self._style_element)
+        sheet = getattr(self._style_element, "sheet", None)
+        if sheet is not None:
+            sheet.insertRule(rule, sheet.cssRules.length)
+        else:
+            self._style_element.appendChild(document.createTextNode(rule))
+
+    @property
+    def css_text(self) -> str:
+        """all generated rules"""
+        return "\n".join(self._rules.values())
+
+    @property
+    def style_element(self):
+        return self._style_element
+
+    def destroy(self) -> None:
+        if self._style_element is not None:
+            self._style_element.remove()
+            self._style_element = None
+
+
+_style_compiler: Union[StyleCompiler, None] = None
+
+
+def set_style_compiler(compiler: Union[StyleCompiler, None]) -> None:
+    """
+    compile styles set from now on into generated classes of the given compiler
+    instead of writing them inline. Pass None to go back to inline styles.
+    Elements styled by the previous compiler are moved over to the new one (or
+    to inline styles) before the previous compiler's sheet is removed
+    """
+    global _style_compiler
+    previous, _style_compiler = _style_compiler, compiler
+    if previous is None or previous is compiler:
+        return
+    for element in list(_element_registry.values()):
+        if element._compiled_style:
+            element._recompile_style()
+    previous.destroy()
+
+
+def get_style_compiler() -> Union[StyleCompiler, None]:
+    return _style_compiler
+
+
+# object urls: -----------------------------------------------------------------
+#
+# binary media is handed to the browser as a Blob behind an object url, instead
+# of a base64 data uri that stays in the DOM as text. A blob lives until its url
+# is revoked, so the elements using an object url as their src are counted and
+# the url is revoked when the last of them lets go of it.
+
+# object url -> number of elements holding it
+_object_url_users: Dict[str, int] = {}
+# element id -> object url held by the element
+_held_object_urls: Dict[str, str] = {}
+
+
+def create_object_url(data: bytes, mime_type: str) -> str:
+    """
+    an object url for data. It is revoked automatically once it was set as src
+    of a media element (Image, Audio, Video, Source) and no element uses it anymore
+    """
+    blob = Blob.new(to_js([data]), to_js({"type": mime_type}, dict_converter=JsObject.fromEntries))
+    url = URL.createObjectURL(blob)
+    # (headless, equal data gives the same data uri)
+    _object_url_users.setdefault(url, 0)
+    return url
+
+
+def _release_object_url(url: str) -> None:
+    users = _object_url_users[url] - 1
+    if users > 0:
+        _object_url_users[url] = users
+    else:
+        del _object_url_users[url]
+        URL.revokeObjectURL(url)
+
+
+def content_hash(*parts: object) -> bytes:
+    """a blake2b digest of the content of bytes-like objects, like bytes or contiguous numpy arrays"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return digest.digest()
+
+
+class EncodeCache(object):
+    """
+    keeps the object urls of recently encoded images, by a key naming their content
+    (see content_hash) and how they were encoded, so showing the same image again
+    skips the encoding. Holds on to at most max_bytes of encoded data, dropping the
+    least recently used urls first (they are revoked once no element shows them)
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self._max_bytes = max_bytes
+        # key -> (object url, size of the encoded data)
+        self._entries: "OrderedDict[tuple, Tuple[str, int]]" = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def object_url(self, key: tuple, encode: Callable[[], Tuple[bytes, str]]) -> str:
+        """the cached object url for key, or one of the (data, mime type) encode() returns"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        self._misses += 1
+        data, mime_type = encode()
+        url = create_object_url(data, mime_type)
+        if len(data) <= self._max_bytes:
+            # the cache is a user of the url as well, until the entry is dropped
+            _object_url_users[url] += 1
+            self._entries[key] = (url, len(data))
+            self._nbytes += len(data)
+            while self._nbytes > self._max_bytes:
+                self._drop_oldest()
+        return url
+
+    def _drop_oldest(self) -> None:
+        _, (url, size) = self._entries.popitem(last=False)
+        self._nbytes -= size
+        _release_object_url(url)
+
+    def clear(self) -> None:
+        while self._entries:
+            self._drop_oldest()
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def nbytes(self) -> int:
+        """size of the encoded data of all cached urls"""
+        return self._nbytes
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries
+
+
+# off by default: most images are shown once, and the cache would only hold on to their data
+_encode_cache: Union[EncodeCache, None] = None
+
+
+def set_encode_cache(cache: Union[EncodeCache, None]) -> None:
+    """
+    use cache for the encoded images of the Image constructors, e.g. set_encode_cache(EncodeCache())
+    for apps that show the same images repeatedly. None (the default) encodes every time
+    """
+    global _encode_cache
+    if _encode_cache is not None and _encode_cache is not cache:
+        _encode_cache.clear()
+    _encode_cache = cache
+
+
+def get_encode_cache() -> Union[EncodeCache, None]:
+    return _encode_cache
+
+
+def _encoded_object_url(key: Callable[[], tuple], encode: Callable[[], Tuple[bytes, str]]) -> str:
+    """
+    the object url of the (data, mime type) encode() returns, from the encode cache if it has key().
+    key is only called with a cache installed, as hashing the content costs about as much as a copy of it
+    """
+    if _encode_cache is None:
+        return create_object_url(*encode())
+    return _encode_cache.object_url(key(), encode)
+
+
+# shared by all elements until they store something in the respective mapping.
+# Most elements never get listeners or keep pending changes, so this saves a
+# dict per mapping and element
+_NO_ENTRIES = MappingProxyType({})
+
+
+def _identity(item: object) -> object:
+    return item
+
+
+def _stable_positions(positions: List[int]) -> set:
+    """
+    indices of a longest increasing subsequence of positions, ignoring negative
+    entries. These are the children that keep their relative order, so they can
+    stay where they are while all others are moved around them
+    """
+    tails: List[int] = []  # index of the smallest tail of each subsequence length
+    tail_positions: List[int] = []
+    previous = [-1] * len(positions)
+    for index, position in enumerate(positions):
+        if position < 0:
+            continue
+        length = bisect.bisect_left(tail_positions, position)
+        if length > 0:
+            previous[index] = tails[length - 1]
+        if length == len(tails):
+            tails.append(index)
+            tail_positions.append(position)
+        else:
+            tails[length] = index
+            tail_positions[length] = position
+    stable = set()
+    index = tails[-1] if tails else -1
+    while index >= 0:
+        stable.add(index)
+        index = previous[index]
+    return stable
+
+
+def _attribute_string(value: object) -> str:
+    """the string javascript's setAttribute stores for a value"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _attach_after_init(init: Callable) -> Callable:
+    """wrap the constructor of a stamped element class to insert its node once the outermost constructor is done"""
+    @wraps(init)
+    def __init__(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        if type(self).__init__ is __init__:
+            self._attach_constructed()
+    return __init__
+
+
+# building from specs: ---------------------------------------------------------
+#
+# Element.build creates a whole subtree from a nested description with one
+# insertAdjacentHTML instead of several js calls per node. The wrappers get a
+# stand-in for their node, which looks the real node up by id on first use.
+
+def from_spec(spec, parent: "Element" = None) -> Union["Element", List["Element"]]:
+    """
+    create the elements described by spec: a tuple (element_class, kwargs, child specs),
+    where kwargs and the child specs are optional, or a list of such tuples, e.g.
+
+    from_spec((Div, {"class_name": "card"}, [
+        (H5, {"inner_html": "title"}),
+        (P, {"inner_html": "text"}),
+    ]), parent=container)
+
+    With a parent, the elements are appended to it (see Element.build).
+    Returns the element, or the list of elements for a list of specs
+    """
+    if parent is not None:
+        return parent.build(spec)
+    if isinstance(spec, list):
+        return [_construct_spec(item) for item in spec]
+    return _construct_spec(spec)
+
+
+def _construct_spec(spec: tuple) -> "Element":
+    element_class, kwargs, children = (tuple(spec) + (None, None))[:3]
+    element = element_class(**(kwargs or {}))
+    if children:
+        element.append_children([_construct_spec(child) for child in children])
+    return element
+
+
+def _id_selector(element_id: str) -> str:
+    escaped = element_id.replace("\\", "\\\\").replace('"', '\\"')
+    return f'[id="{escaped}"]'
+
+
+class _UnboundNode(object):
+    """
+    stands in for the node of an element built from markup until the node is
+    used. The node is then looked up by id, in the document or else below the
+    closest ancestor with a node of its own, and replaces the stand-in
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: "Element") -> None:
+        object.__setattr__(self, "_owner", owner)
+
+    def _bind(self):
+        owner = self._owner
+        if owner._element is self:
+            node = document.getElementById(owner._id)
+            if node is None:
+                # not in the document (yet)
+                ancestor = owner._parent
+                while ancestor is not None and isinstance(ancestor._element, _UnboundNode):
+                    ancestor = ancestor._parent
+                if ancestor is not None and ancestor._element is not None:
+                    node = ancestor._element.querySelector(_id_selector(owner._id))
+            owner._element = node
+        return owner._element
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._bind(), name)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        setattr(self._bind(), name, value)
+
+
+def _bound(node):
+    """the node itself, for nodes passed to js or compared"""
+    if isinstance(node, _UnboundNode):
+        return node._bind()
+    return node
 
 
 class Element(object):
 
+    # no per instance __dict__: pages can hold many thousands of elements. Subclasses
+    # declare their own __slots__ too (empty if they add no state). Only one base of a
+    # class may add slots, so mixins like BootstrapContainer keep theirs empty.
+    # __weakref__ is needed for the id registry
+    __slots__ = ("__weakref__", "_parent", "_class_name", "_classes", "_class_index",
+                 "_class_observer", "_children", "_key", "_id", "_element", "_adopted",
+                 "_pending_inner_html", "_display", "_listeners", "_event_handlers",
+                 "_batch_depth", "_pending_attributes", "_pending_styles", "_compiled_style")
+
     _tag_type: str = None
     _default_class_name: str = None
+    # build the nodes of this element's subtree by cloning a cached template (see _stamp)
+    _stamped: bool = False
 
     def __init__(self,
                  inner_html: str = None,
@@ -21,74 +863,560 @@ class Element(object):
                  parent: "Element" = None) -> None:
         self._parent = None
         self._class_name = class_name if class_name is not None else self._default_class_name
+        # authoritative, ordered set of class tokens. The DOM's className is only
+        # written when this set changes, so reading classes never crosses into js
+        self._classes = {}
+        # prefix -> class tokens with that prefix, e.g. 'p-md-' -> {'p-md-3': None}
+        self._class_index: Dict[str, Dict[str, None]] = {}
+        self._reset_classes(self._class_name)
+        self._class_observer = None
         self._children = []
+        # key of this element among its siblings, set by the parent's set_children
+        self._key = None
 
-        if id is None:
-            self._id = "id-" + str(uuid.uuid4())
-            # TODO: use a better id generator
-        else:
-            self._id = id
+        self._id = _id_allocator() if id is None else id
+        _element_registry[self._id] = self
 
+        # the DOM node. Elements stay python-side records until they are attached to
+        # an element that has a node, or until .element is accessed (see _init_element)
         self._element = None
+        # whether _element was adopted from pre-rendered markup and not attached yet
+        self._adopted = False
+        # inner html set before the node exists
+        self._pending_inner_html: Union[str, None] = None
 
         self._display = None
 
-        self._init_element()
+        # event name -> [(callback, rate limited callback or callback, js proxy)],
+        # so proxies can be removed and destroyed again
+        self._listeners: Dict[str, List[Tuple[Callable, Callable, object]]] = _NO_ENTRIES
+        # event name -> the single handler set through a property like onclick
+        self._event_handlers: Dict[str, Callable] = _NO_ENTRIES
+
+        # pending changes of an active batch() or of an element without node yet
+        # (attribute/style name -> value, None means remove)
+        self._batch_depth = 0
+        self._pending_attributes: Dict[str, Union[object, None]] = _NO_ENTRIES
+        self._pending_styles: Dict[str, Union[str, None]] = _NO_ENTRIES
+        # styles turned into a generated class by the style compiler
+        self._compiled_style: Dict[str, str] = _NO_ENTRIES
+
+        if self.tag_type is None:
+            raise NotImplementedError("tag_type is not implemented")
+
+        if _hydration_nodes:
+            node = _hydration_nodes.pop(self._id, None)
+            if node is not None:
+                # the pre-rendered node already has this element's classes, attributes and content
+                self._element = node
+                self._adopted = True
 
         if parent is not None:
-            parent.append_child(self)
+            if self._stamped:
+                # the node is inserted when the whole widget is built, so the
+                # subtree can be stamped at once instead of node by node
+                parent._children.append(self)
+                self._parent = parent
+            else:
+                parent.append_child(self)
 
-        if inner_html is not None:
+        if inner_html is not None and not self._adopted:
             self.inner_html = inner_html
 
     def _init_element(self):
-        if self.tag_type is None:
-            raise NotImplementedError("tag_type is not implemented")
-
-        if self._element is None:
-            self._element = document.createElement(self.tag_type)
-            self._element.id = self._id
-            if self._class_name is not None:
-                self._element.className = self._class_name
-        return self._element
+        """
+        create the DOM node, with everything recorded while the element had none:
+        classes, attributes, styles, inner html, listeners and the nodes of all children.
+
+        This happens once the element is attached to an element that has a node, whether
+        or not that node is connected to the document yet. A node without the nodes of
+        its children would be incomplete when it is inserted into the document by plain
+        DOM calls (e.g. appendChild on a node taken from .element), which python does not see
+        """
+        stamp = None
+        if self._stamped:
+            elements = _stamp_subtree(self)
+            if elements is not None:
+                signature, records = _stamp_records(elements)
+                stamp = (signature, records)
+                template = _stamp_templates.get(signature)
+                if template is not None:
+                    _stamp_templates.move_to_end(signature)
+                    node = _stamp(elements, records, template)
+                    if node is not None:
+                        return node
+
+        node = document.createElement(self.tag_type)
+        node.id = self._id
+        self._element = node
+        if self._class_name:
+            node.className = self._class_name
+
+        # a new node has nothing to remove
+        if self._pending_attributes:
+            self._pending_attributes = {name: value for name, value in self._pending_attributes.items()
+                                        if value is not None}
+        if self._pending_styles:
+            self._pending_styles = {name: value for name, value in self._pending_styles.items()
+                                    if value is not None}
+        if not self._batch_depth:
+            self._flush_batch()
+
+        if self._pending_inner_html is not None:
+            node.innerHTML = self._pending_inner_html
+            self._pending_inner_html = None
+
+        for event_name, listeners in self._listeners.items():
+            for _, _, proxy in listeners:
+                if proxy is not None:
+                    node.addEventListener(event_name, proxy)
+
+        if self._children:
+            fragment = document.createDocumentFragment()
+            for child in self._children:
+                child._adopted = False
+                fragment.appendChild(child.element)
+            node.appendChild(fragment)
+
+        if stamp is not None:
+            _remember_stamp(*stamp, node)
+        return node
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls._stamped and "__init__" in cls.__dict__:
+            cls.__init__ = _attach_after_init(cls.__dict__["__init__"])
+
+    def _attach_constructed(self) -> None:
+        """insert the node of a stamped element that was given a parent with a node"""
+        parent = self._parent
+        if parent is None or parent._element is None:
+            return
+        if self._element is not None and not self._adopted and self._element.parentNode == _bound(parent._element):
+            # already inserted, e.g. by moving the element during construction
+            return
+        if self._claim_adopted_place(parent._element):
+            return
+        index = parent._children.index(self)
+        reference = None
+        for sibling in parent._children[index + 1:]:
+            if sibling._element is not None:
+                reference = _bound(sibling._element)
+                break
+        parent._element.insertBefore(self.element, reference)
 
     def append_child(self, child: "Element") -> None:
         if child is None:
             return
         self._children.append(child)
         child._parent = self
-        self._element.appendChild(child._element)
+        if self._element is not None and not child._claim_adopted_place(self._element):
+            self._element.appendChild(child.element)
+
+    def append_children(self, children: Iterable["Element"]) -> None:
+        """
+        append several children with a single DOM insertion. The children's nodes
+        are collected in a detached DocumentFragment first, so the document only
+        reflows once instead of once per child
+        """
+        children = [child for child in children if child is not None]
+        if len(children) == 0:
+            return
+        if self._element is None:
+            # the children's nodes are created together with ours
+            for child in children:
+                child._parent = self
+            self._children.extend(children)
+            return
+        fragment = None
+        for child in children:
+            child._parent = self
+            if not child._claim_adopted_place(self._element):
+                if fragment is None:
+                    fragment = document.createDocumentFragment()
+                fragment.appendChild(child.element)
+        self._children.extend(children)
+        if fragment is not None:
+            self._element.appendChild(fragment)
+
+    def extend(self, children: Iterable["Element"]) -> None:
+        """alias for append_children"""
+        self.append_children(children)
+
+    def _claim_adopted_place(self, parent_node) -> bool:
+        """
+        whether this element's node was adopted from pre-rendered markup and already
+        sits in parent_node, so attaching it needs no DOM insertion. Only the first
+        attachment after adoption can skip the insertion
+        """
+        if not self._adopted:
+            return False
+        self._adopted = False
+        return self._element.parentNode == _bound(parent_node)
+
+    def insert_child(self, child: "Element", index: int) -> None:
+        """
+        insert child before the child currently at index, or append it if index is
+        past the end. A child of another (or this) element is moved
+        """
+        if child._parent is self:
+            self._children.remove(child)
+        elif child._parent is not None:
+            child._parent.remove_child(child)
+        reference = self._children[index] if index < len(self._children) else None
+        self._children.insert(index, child)
+        child._parent = self
+        child._adopted = False
+        if self._element is not None:
+            self._element.insertBefore(child.element,
+                                       None if reference is None else _bound(reference._element))
 
     def remove_child(self, child: "Element") -> None:
         self._children.remove(child)
-        self._element.removeChild(child._element)
+        if self._element is not None and child._element is not None:
+            self._element.removeChild(_bound(child._element))
         child._parent = None
 
     def hide(self) -> None:
-        self._display = self.element.style.display
-        self.element.style.display = "none"
+        self._display = self.get_style("display")
+        self.set_style("display", "none")
 
 
     def show(self) -> None:
         if self._display is None:
             return
-        self.element.style.display = self._display
+        self.set_style("display", self._display)
         self._display = None
 
     def destroy(self) -> None:
+        """
+        remove this element and its subtree. Only the element's own node is taken
+        out of the DOM, the descendants go with it and are released in python only
+        """
+        if self._element is not None:
+            self._element.remove()
         if self._parent is not None:
-            self._parent.remove_child(self)
-        for c in self.children:
-            c.destroy()
-        self._children = []
-        self._element.remove()
-        self._element = None
-        self._parent = None
-        
+            self._parent._children.remove(self)
+            self._parent = None
+        self._release_subtree()
+
+    def _release(self) -> None:
+        """release what this element holds apart from its node: proxies, observers, object urls and its registry entry"""
+        self.unobserve_classes()
+        self._release_event_listeners()
+        if self._id in _held_object_urls:
+            self._hold_object_url(None)
+        if _element_registry.get(self._id) is self:
+            del _element_registry[self._id]
+
+    def _release_subtree(self) -> None:
+        """release this element and all descendants, without touching the DOM"""
+        stack = [self]
+        while stack:
+            element = stack.pop()
+            stack.extend(element._children)
+            element._release()
+            element._children = []
+            element._element = None
+            element._parent = None
+
+    def set_children(self,
+                     items: Iterable[object],
+                     factory: Callable[[object], "Element"],
+                     key: Callable[[object], object] = None,
+                     update: Callable[["Element", object], None] = None,
+                     start: int = 0,
+                     stop: int = None) -> List["Element"]:
+        """
+        make the children (from index start on, up to stop if given) one element per
+        item, reusing the children of a previous call by key. factory(item) creates the
+        element for a new key and must return an element without parent, update(element, item)
+        is called for every reused element. key(item) defaults to the item itself,
+        items with equal keys are matched in order. Children from stop on are kept after
+        the new ones.
+
+        Only the difference touches the DOM: children of removed keys are taken
+        out, new ones are inserted and reused ones are moved only if they left
+        the longest run that is still in order. Returns the new children
+        """
+        if key is None:
+            key = _identity
+        reusable: Dict[object, List["Element"]] = {}
+        for child in reversed(self._children[start:stop]):
+            if child._key is not None:
+                reusable.setdefault(child._key, []).append(child)
+
+        children = []
+        for item in items:
+            item_key = key(item)
+            matches = reusable.get(item_key)
+            if matches:
+                child = matches.pop()
+                if update is not None:
+                    update(child, item)
+            else:
+                child = factory(item)
+                child._key = item_key
+            children.append(child)
+        following = self._children[stop:] if stop is not None else []
+        self._place_children(children + following, start)
+        return children
+
+    def _place_children(self, children: List["Element"], start: int = 0) -> None:
+        """
+        make children the children from index start on. Previous children not in
+        children are destroyed, with as few DOM operations as possible
+        """
+        old_children = self._children[start:]
+        kept = set(map(id, children))
+        old_positions = {}
+        stale = []
+        for position, child in enumerate(old_children):
+            if id(child) in kept:
+                old_positions[id(child)] = position
+            else:
+                stale.append(child)
 
-    def add_event_listener(self, event_name: str, callback: callable) -> None:
-        self._element.addEventListener(event_name,
-                                       create_proxy(callback))
+        if stale and self._element is not None:
+            if start == 0 and not old_positions:
+                self._element.replaceChildren()
+            else:
+                for child in stale:
+                    if child._element is not None:
+                        child._element.remove()
+        for child in stale:
+            child._release_subtree()
+
+        for child in children:
+            if child._parent is not self and child._parent is not None:
+                child._parent.remove_child(child)
+            child._parent = self
+            child._adopted = False
+        self._children[start:] = children
+        if self._element is None:
+            return
+
+        positions = [old_positions.get(id(child), -1) for child in children]
+        stable = _stable_positions(positions)
+        # walk backwards, inserting each run of moved or new children before
+        # the stable child that follows it
+        reference = None
+        run = []
+        for index in range(len(children) - 1, -1, -1):
+            child = children[index]
+            if index not in stable:
+                run.append(child)
+                continue
+            self._insert_run(run, reference)
+            run = []
+            reference = _bound(child._element)
+        self._insert_run(run, reference)
+
+    def _insert_run(self, run: List["Element"], reference) -> None:
+        """insert the nodes of run (in reverse order) before reference, None meaning at the end"""
+        if not run:
+            return
+        if len(run) == 1:
+            self._element.insertBefore(run[0].element, reference)
+            return
+        fragment = document.createDocumentFragment()
+        for child in reversed(run):
+            fragment.appendChild(child.element)
+        self._element.insertBefore(fragment, reference)
+
+    def clear_children(self) -> None:
+        """destroy all children with a single DOM operation. This also removes content set as inner html"""
+        children, self._children = self._children, []
+        if self._element is not None:
+            self._element.replaceChildren()
+        for child in children:
+            child._release_subtree()
+
+    def replace_children(self, children: Iterable["Element"]) -> None:
+        """
+        destroy all children except those in children, and make children the new
+        children (see clear_children and append_children)
+        """
+        children = [child for child in children if child is not None]
+        kept = set(map(id, children))
+        old_children, self._children = self._children, []
+        if self._element is not None:
+            self._element.replaceChildren()
+        for child in old_children:
+            if id(child) in kept:
+                child._parent = None
+            else:
+                child._release_subtree()
+        self.append_children(children)
+
+    def build(self, spec) -> Union["Element", List["Element"]]:
+        """
+        append the elements described by spec (see from_spec) as children. If this
+        element has a node, the markup of the whole new subtree is generated in python
+        and inserted with one insertAdjacentHTML, and the new elements look their
+        nodes up by id when they first use them. The browser parses the markup, so
+        elements have to be nested the way html allows (e.g. no div inside a p).
+        Returns the element, or the list of elements for a list of specs
+        """
+        elements = from_spec(spec)
+        children = elements if isinstance(elements, list) else [elements]
+        subtree = []
+        stack = list(children)
+        while stack:
+            element = stack.pop()
+            if element._element is not None or element._batch_depth:
+                # nodes that exist already are moved, not rebuilt
+                subtree = None
+                break
+            subtree.append(element)
+            stack.extend(element._children)
+        if self._element is None or subtree is None:
+            self.append_children(children)
+            return elements
+
+        markup = []
+        for child in children:
+            child._parent = self
+            child._write_markup(markup)
+        self._children.extend(children)
+        self.element.insertAdjacentHTML("beforeend", "".join(markup))
+
+        for element in subtree:
+            element._element = _UnboundNode(element)
+            element._pending_attributes = _NO_ENTRIES
+            element._pending_styles = _NO_ENTRIES
+            element._pending_inner_html = None
+            for event_name, listeners in element._listeners.items():
+                for _, _, proxy in listeners:
+                    if proxy is not None:
+                        element._element.addEventListener(event_name, proxy)
+        return elements
+
+    def _write_markup(self, out: List[str]) -> None:
+        """append the markup of this element and its children, as _init_element would build them"""
+        attributes = {"id": self._id}
+        if self._class_name:
+            attributes["class"] = self._class_name
+        for name, value in self._pending_attributes.items():
+            if value is not None:
+                attributes[name] = _attribute_string(value)
+        styles = " ".join(f"{css_property_name(name)}: {value};"
+                          for name, value in self._pending_styles.items() if value is not None)
+        if styles:
+            attributes["style"] = f"{attributes['style']}; {styles}" if "style" in attributes else styles
+
+        tag = self.tag_type
+        out.append(f"<{tag}")
+        for name, value in attributes.items():
+            out.append(f' {name}="{html.escape(value)}"')
+        out.append(">")
+        if tag in VOID_ELEMENTS:
+            return
+        if self._pending_inner_html is not None:
+            out.append(str(self._pending_inner_html))
+        for child in self._children:
+            child._write_markup(out)
+        out.append(f"</{tag}>")
+
+
+    def _hold_object_url(self, url: Union[str, None]) -> None:
+        """
+        note that this element uses url (e.g. as src) instead of the object url it
+        used before, which is revoked if no other element uses it. Urls that were
+        not made by create_object_url are ignored
+        """
+        if url in _object_url_users:
+            _object_url_users[url] += 1
+            previous = _held_object_urls.get(self._id)
+            _held_object_urls[self._id] = url
+        else:
+            previous = _held_object_urls.pop(self._id, None)
+        if previous is not None:
+            _release_object_url(previous)
+
+    def add_event_listener(self,
+                           event_name: str,
+                           callback: callable,
+                           throttle_ms: float = None,
+                           debounce_ms: float = None,
+                           coalesce: str = None) -> None:
+        """
+        call callback on the given event. High frequency events can be rate limited
+        with throttle_ms (at most once per interval), debounce_ms (once calls have settled)
+        or coalesce="animation_frame" (at most once per frame)
+        """
+        listener = rate_limited(callback,
+                                throttle_ms=throttle_ms,
+                                debounce_ms=debounce_ms,
+                                coalesce=coalesce)
+        if _event_delegator is not None and _event_delegator.handles(event_name):
+            # no proxy of our own, the delegator's root listener calls back into _listeners
+            _event_delegator.listen(event_name)
+            proxy = None
+        else:
+            proxy = create_proxy(listener)
+            if self._element is not None:
+                # otherwise added when the node is created
+                self._element.addEventListener(event_name, proxy)
+        if self._listeners is _NO_ENTRIES:
+            self._listeners = {}
+        self._listeners.setdefault(event_name, []).append((callback, listener, proxy))
+
+    @staticmethod
+    def _release_listener(listener: Callable, proxy) -> None:
+        if proxy is not None:
+            proxy.destroy()
+        if isinstance(listener, RateLimitedCallback):
+            listener.destroy()
+
+    def remove_event_listener(self, event_name: str, callback: callable = None) -> None:
+        """
+        remove a listener added with add_event_listener and destroy its proxy.
+        If no callback is given, all listeners for this event are removed
+        """
+        if event_name not in self._listeners:
+            return
+        remaining = []
+        for entry in self._listeners[event_name]:
+            listener_callback, listener, proxy = entry
+            if callback is None or listener_callback == callback:
+                if proxy is not None and self._element is not None:
+                    self._element.removeEventListener(event_name, proxy)
+                self._release_listener(listener, proxy)
+            else:
+                remaining.append(entry)
+        if remaining:
+            self._listeners[event_name] = remaining
+        else:
+            del self._listeners[event_name]
+        if event_name in self._event_handlers and (
+                callback is None or self._event_handlers[event_name] == callback):
+            del self._event_handlers[event_name]
+
+    def _set_event_handler(self, event_name: str, callback: Union[callable, None], **rate_limit) -> None:
+        """
+        set the handler behind a property like onclick. Unlike add_event_listener,
+        a new handler replaces the previous one instead of firing in addition to it.
+        rate_limit takes the throttle_ms/debounce_ms/coalesce options of add_event_listener
+        """
+        previous = self._event_handlers.get(event_name)
+        if previous is not None:
+            self.remove_event_listener(event_name, previous)
+        if callback is not None:
+            self.add_event_listener(event_name, callback, **rate_limit)
+            if self._event_handlers is _NO_ENTRIES:
+                self._event_handlers = {}
+            self._event_handlers[event_name] = callback
+
+    def _get_event_handler(self, event_name: str) -> Union[callable, None]:
+        return self._event_handlers.get(event_name)
+
+    def _release_event_listeners(self) -> None:
+        for listeners in self._listeners.values():
+            for _, listener, proxy in listeners:
+                self._release_listener(listener, proxy)
+        self._listeners = _NO_ENTRIES
+        self._event_handlers = _NO_ENTRIES
 
     def set_class(self, class_name: str, active: bool) -> None:
         if active:
@@ -96,26 +1424,220 @@ class Element(object):
         else:
             self.remove_class(class_name=class_name)
 
+    def _add_token(self, token: str) -> None:
+        if token in self._classes:
+            return
+        self._classes[token] = None
+        prefix = _class_token_prefix(token)
+        if prefix is not None:
+            self._class_index.setdefault(prefix, {})[token] = None
+
+    def _discard_token(self, token: str) -> None:
+        if token not in self._classes:
+            return
+        del self._classes[token]
+        prefix = _class_token_prefix(token)
+        if prefix is not None:
+            tokens = self._class_index[prefix]
+            del tokens[token]
+            if not tokens:
+                del self._class_index[prefix]
+
+    def _discard_tokens(self, *tokens: str) -> None:
+        for token in tokens:
+            self._discard_token(token)
+
+    def _reset_classes(self, class_name: Union[str, None]) -> None:
+        self._classes = {}
+        self._class_index = {}
+        if class_name:
+            for token in class_name.split():
+                self._add_token(token)
+
     def add_class(self, class_name: Union[str, None]) -> None:
         if class_name is None:
             return
-        self._element.classList.add(class_name)
+        if class_name in self._classes:
+            return
+        for token in class_name.split():
+            self._add_token(token)
+        self._write_class_name()
 
     def add_classes(self, *class_names: str) -> None:
         for class_name in class_names:
-            self.add_class(class_name)
+            if class_name is not None:
+                for token in class_name.split():
+                    self._add_token(token)
+        self._write_class_name()
 
     def has_class(self, class_name: str) -> bool:
-        return self._element.classList.contains(class_name)
+        return class_name in self._classes
 
     def remove_class(self, class_name: str) -> None:
-        self._element.classList.remove(class_name)
+        if class_name not in self._classes:
+            return
+        self._discard_token(class_name)
+        self._write_class_name()
 
     def remove_classes(self, *class_names: str) -> None:
-        for class_name in class_names:
-            self.remove_class(class_name)
+        self._discard_tokens(*class_names)
+        self._write_class_name()
+
+    def _write_class_name(self, class_name: str = None) -> None:
+        """
+        Write the class token set to the DOM, if it differs from the last written value.
+        class_name can pass the joined token set if the caller already has it
+        """
+        if self._batch_depth:
+            return
+        if class_name is None:
+            class_name = " ".join(self._classes)
+        if class_name == (self._class_name or ""):
+            return
+        self._class_name = class_name
+        if self._element is not None:
+            self._element.className = class_name
+
+    def sync_classes(self) -> None:
+        """
+        re-read the class attribute from the DOM. Use this after javascript code
+        (e.g. bootstrap's collapse or button plugins) changed the element's classes
+        """
+        if self._element is None:
+            return
+        self._class_name = self._element.className
+        self._reset_classes(self._class_name)
+
+    def observe_classes(self) -> None:
+        """
+        keep the python side class set in sync automatically, by resyncing
+        whenever the class attribute is changed from javascript
+        """
+        if self._class_observer is not None:
+            return
+        proxy = create_proxy(lambda *_: self.sync_classes())
+        observer = MutationObserver.new(proxy)
+        observer.observe(self.element, to_js({"attributes": True, "attributeFilter": ["class"]},
+                                              dict_converter=JsObject.fromEntries))
+        self._class_observer = (observer, proxy)
+
+    def unobserve_classes(self) -> None:
+        if self._class_observer is None:
+            return
+        observer, proxy = self._class_observer
+        observer.disconnect()
+        proxy.destroy()
+        self._class_observer = None
+
+    @contextmanager
+    def batch(self):
+        """
+        collect class, attribute and style changes made inside the with block and
+        write them to the DOM at once when the (outermost) block is left:
+
+        with element.batch():
+            element.p = 3
+            element.set_attribute("role", "alert")
+            element.width = "100%"
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        if self._compiled_style is not _NO_ENTRIES:
+            self._apply_compiled_style()
+        self._write_class_name()
+        if self._element is None:
+            # kept until the node is created
+            return
+
+        for attribute_name, attribute_value in self._pending_attributes.items():
+            if attribute_value is None:
+                self._element.removeAttribute(attribute_name)
+            else:
+                self._element.setAttribute(attribute_name, attribute_value)
+        self._pending_attributes = _NO_ENTRIES
+
+        if self._pending_styles:
+            style = self._element.style
+            declarations = {}
+            for property_name, value in self._pending_styles.items():
+                if value is None or value == "":
+                    # like assigning "" to a style property, this removes it
+                    style.removeProperty(css_property_name(property_name))
+                else:
+                    declarations[css_property_name(property_name)] = value
+            if declarations:
+                merged = style_declarations(style.cssText)
+                merged.update(declarations)
+                style.cssText = " ".join(f"{name}: {value};" for name, value in merged.items())
+            self._pending_styles = _NO_ENTRIES
+
+    def apply(self, style: Dict[str, str] = None, **properties) -> "Element":
+        """
+        set several properties (and optionally inline styles) in one batch, e.g.
+        element.apply(p=3, shadow=Shadow.LARGE, style={"overflow": "auto"})
+        """
+        with self.batch():
+            for property_name, value in properties.items():
+                setattr(self, property_name, value)
+            if style is not None:
+                self.set_styles(**style)
+        return self
+
+    def _pend_attribute(self, attribute_name: str, attribute_value: Union[object, None]) -> None:
+        if self._pending_attributes is _NO_ENTRIES:
+            self._pending_attributes = {}
+        self._pending_attributes[attribute_name] = attribute_value
+
+    def _pend_style(self, property_name: str, value: Union[str, None]) -> None:
+        if self._pending_styles is _NO_ENTRIES:
+            self._pending_styles = {}
+        # an empty value removes the property, as when it is written directly
+        self._pending_styles[property_name] = None if value == "" else value
+
+    def _compile_style(self, property_name: str, value: Union[str, None]) -> None:
+        if self._compiled_style is _NO_ENTRIES:
+            self._compiled_style = {}
+        if value is None or value == "":
+            # like an inline style, an empty value removes the property
+            self._compiled_style.pop(property_name, None)
+        else:
+            self._compiled_style[property_name] = value
+        if not self._batch_depth:
+            # otherwise the class is resolved once, when the batch is flushed
+            self._apply_compiled_style()
+            self._write_class_name()
+
+    def _recompile_style(self) -> None:
+        """write the compiled styles again with the current style compiler, inline if there is none"""
+        styles, self._compiled_style = self._compiled_style, _NO_ENTRIES
+        with self.batch():
+            self._discard_tokens(*self._classes_with_prefix(_STYLE_CLASS_PREFIX))
+            for property_name, value in styles.items():
+                self.set_style(property_name, value)
+
+    def _apply_compiled_style(self) -> None:
+        """swap the generated style class for the one of the current compiled styles"""
+        if _style_compiler is None:
+            return
+        token = _style_compiler.class_name(self._compiled_style) if self._compiled_style else None
+        for current in list(self._classes_with_prefix(_STYLE_CLASS_PREFIX)):
+            if current != token:
+                self._discard_token(current)
+        if token is not None:
+            self._add_token(token)
 
     def has_attribute(self, attribute_name: str) -> bool:
+        if attribute_name in self._pending_attributes:
+            return self._pending_attributes[attribute_name] is not None
+        if self._element is None:
+            return False
         return self._element.hasAttribute(attribute_name)
 
     def set_attribute(self, attribute_name: str, attribute_value: Union[object, None], is_boolean_attribute: bool = False) -> None:
@@ -126,16 +1648,32 @@ class Element(object):
 
         if is_boolean_attribute:
             if attribute_value:
-                self._element.setAttribute(attribute_name, "")
+                self._write_attribute(attribute_name, "")
             else:
-                self._element.removeAttribute(attribute_name)
+                self.remove_attribute(attribute_name)
+        else:
+            self._write_attribute(attribute_name, attribute_value)
+
+    def _write_attribute(self, attribute_name: str, attribute_value: object) -> None:
+        if self._batch_depth or self._element is None:
+            self._pend_attribute(attribute_name, attribute_value)
         else:
             self._element.setAttribute(attribute_name, attribute_value)
 
     def remove_attribute(self, attribute_name: str) -> None:
-        self._element.removeAttribute(attribute_name)
+        if self._batch_depth or self._element is None:
+            self._pend_attribute(attribute_name, None)
+        else:
+            self._element.removeAttribute(attribute_name)
 
     def get_attribute(self, attribute_name: str, is_boolean_attribute: bool = False) -> Union[str, None]:
+        if attribute_name in self._pending_attributes:
+            value = self._pending_attributes[attribute_name]
+            if is_boolean_attribute:
+                return value is not None
+            return _attribute_string(value) if value is not None else None
+        if self._element is None:
+            return False if is_boolean_attribute else None
         if is_boolean_attribute:
             return self._element.hasAttribute(attribute_name)
         elif self._element.hasAttribute(attribute_name):
@@ -156,67 +1694,111 @@ class Element(object):
 
     @property
     def element(self):
+        """the DOM node, created on first access"""
+        if self._element is None:
+            self._init_element()
+        elif isinstance(self._element, _UnboundNode):
+            return self._element._bind()
         return self._element
 
+    def to_html(self) -> str:
+        """the element's markup, including itself and its children"""
+        return self.element.outerHTML
+
     @property
     def inner_html(self):
-        return self._element.innerHTML
+        if self._element is None and not self._children:
+            return self._pending_inner_html or ""
+        return self.element.innerHTML
 
     @inner_html.setter
     def inner_html(self, value: str):
-        self._element.innerHTML = value
+        if self._element is None and not self._children:
+            self._pending_inner_html = value
+        else:
+            self.element.innerHTML = value
 
     @property
     def class_name(self):
+        if self._batch_depth:
+            return " ".join(self._classes)
         return self._class_name
 
     @class_name.setter
     def class_name(self, value: str):
-        self._class_name = value
-        self._element.className = value
+        self._reset_classes(value)
+        self._write_class_name()
 
     @property
-    def class_list(self):
-        return self._element.classList
+    def class_list(self) -> list:
+        return list(self._classes)
 
     @property
     def width(self):
-        return self._element.style.width
+        return self.get_style("width")
 
     @width.setter
     def width(self, value: str):
-        self._element.style.width = value
+        self.set_style("width", value)
 
     @property
     def height(self):
-        return self._element.style.height
+        return self.get_style("height")
 
     @height.setter
     def height(self, value: str):
-        self._element.style.height = value
+        self.set_style("height", value)
+
+    def _classes_with_prefix(self, prefix: str) -> Iterable[str]:
+        """all class tokens indexed under the given prefix (see _class_token_prefix)"""
+        return self._class_index.get(prefix, ())
 
     def _search_class_list(self, search_term: str) -> Iterable:
-        classes = self.class_list
-        # TODO: use compiled parse objects to make it faster?
-        return filter(lambda x: parse(search_term, x) is not None, classes)
+        pattern = _compile_search_term(search_term)
+        literal, _, field = search_term.partition("{")
+        if literal.endswith("-") and "{" + field in _INDEXABLE_FIELDS:
+            # the search term ends with a single field that cannot contain '-',
+            # so only tokens indexed under the literal prefix can match
+            candidates = self._classes_with_prefix(literal)
+        else:
+            candidates = self._classes
+        return [x for x in candidates if pattern.match(x)]
 
     def _remove_classes_by_search_term(self, search_term) -> None:
-        for css_class in self._search_class_list(search_term=search_term):
-            self.remove_class(css_class)
+        self.remove_classes(*self._search_class_list(search_term=search_term))
 
     @property
     def id(self):
         return self._id
+
+    @staticmethod
+    def get_by_id(id: str) -> Union["Element", None]:
+        """
+        the python wrapper of a living element with the given id, without searching the document
+        """
+        return _element_registry.get(id)
     
     def write(self, object):
         self.element.write(self.id, object) # type: ignore
     
     def set_style(self, property_name: str, value: str) -> None:
         """Set a CSS style property on this element."""
+        if _style_compiler is not None:
+            self._compile_style(property_name, value)
+            return
+        if self._batch_depth or self._element is None:
+            self._pend_style(property_name, value)
+            return
         setattr(self._element.style, property_name, value)
 
     def get_style(self, property_name: str) -> str:
         """Get the value of a CSS style property on this element."""
+        if property_name in self._compiled_style:
+            return self._compiled_style[property_name]
+        if property_name in self._pending_styles:
+            return self._pending_styles[property_name]
+        if self._element is None:
+            return ""
         try:
             return getattr(self._element.style, property_name)
         except AttributeError:
@@ -224,17 +1806,25 @@ class Element(object):
 
     def remove_style(self, property_name: str) -> None:
         """Remove a CSS style property from this element."""
+        if property_name in self._compiled_style:
+            self._compile_style(property_name, None)
+            return
+        if self._batch_depth or self._element is None:
+            self._pend_style(property_name, None)
+            return
         setattr(self._element.style, property_name, None)
     
     def set_styles(self, **styles) -> None:
         """Set multiple CSS style properties on this element."""
-        for property_name, value in styles.items():
-            self.set_style(property_name, value)
+        with self.batch():
+            for property_name, value in styles.items():
+                self.set_style(property_name, value)
 
 
 
 class A(Element):
 
+    __slots__ = ()
     _tag_type: str = "a"
 
     def __init__(self, inner_html: str = None, id: str = None, class_name: str = None, parent: Element = None, href: str = None) -> None:
@@ -257,6 +1847,7 @@ class A(Element):
 
 class Abbr(Element):
 
+    __slots__ = ()
     _tag_type: str = "abbr"
 
     def __init__(self,
@@ -284,11 +1875,13 @@ class Abbr(Element):
 
 class Address(Element):
 
+    __slots__ = ()
     _tag_type: str = "address"
 
 
 class Area(Element):
 
+    __slots__ = ()
     _tag_type: str = "area"
 
     def __init__(self,
@@ -371,23 +1964,26 @@ class Area(Element):
 
 class Article(Element):
 
+    __slots__ = ()
     _tag_type: str = "article"
 
 
 class Aside(Element):
 
+    __slots__ = ()
     _tag_type: str = "aside"
 
 
 class Audio(Element):
 
+    __slots__ = ()
+
     @classmethod
     def from_file(cls, file_path: str, format: str) -> "Audio":
-        bytes = open(file_path, "rb").read()
-
-        src = "data:audio/{};base64,{}".format(format, base64.b64encode(bytes).decode("utf-8"))
+        with open(file_path, "rb") as f:
+            data = f.read()
 
-        return cls(src=src)
+        return cls(src=create_object_url(data, f"audio/{format.lower()}"))
 
     _tag_type: str = "audio"
 
@@ -461,16 +2057,19 @@ class Audio(Element):
 
     @src.setter
     def src(self, value: str) -> None:
+        self._hold_object_url(value)
         self.set_attribute("src", value)
 
 
 class B(Element):
 
+    __slots__ = ()
     _tag_type: str = "b"
 
 
 class Base(Element):
 
+    __slots__ = ()
     _tag_type: str = "base"
 
     def __init__(self,
@@ -507,11 +2106,13 @@ class Base(Element):
 
 class Bdi(Element):
 
+    __slots__ = ()
     _tag_type: str = "bdi"
 
 
 class Blockquote(Element):
 
+    __slots__ = ()
     _tag_type: str = "blockquote"
 
     def __init__(self,
@@ -539,16 +2140,19 @@ class Blockquote(Element):
 
 class Body(Element):
 
+    __slots__ = ()
     _tag_type: str = "body"
 
 
 class Br(Element):
 
+    __slots__ = ()
     _tag_type: str = "br"
 
 
 class Button(Element):
 
+    __slots__ = ()
     _tag_type: str = "button"
 
     def __init__(self,
@@ -562,8 +2166,6 @@ class Button(Element):
                  onclick=None) -> None:
         super().__init__(id=id, class_name=class_name, parent=parent, inner_html=inner_html)
 
-        self._onclick = None
-
         self.type = type
 
         if name is not None:
@@ -576,10 +2178,10 @@ class Button(Element):
             self.onclick = onclick
 
     def disable(self) -> None:
-        self._element.disabled = True
+        self.element.disabled = True
 
     def enable(self) -> None:
-        self._element.disabled = False
+        self.element.disabled = False
 
     @property
     def type(self) -> str:
@@ -615,16 +2217,27 @@ class Button(Element):
 
     @property
     def onclick(self) -> str:
-        return self._onclick
+        return self._get_event_handler("click")
 
     @onclick.setter
     def onclick(self, value) -> None:
-        self._onclick = value
-        self.add_event_listener("click", value)
+        self._set_event_handler("click", value)
+
+    def set_onclick(self,
+                    value: Union[callable, None],
+                    throttle_ms: float = None,
+                    debounce_ms: float = None,
+                    coalesce: str = None) -> None:
+        """like assigning onclick, with the rate limiting options of add_event_listener"""
+        self._set_event_handler("click", value,
+                                throttle_ms=throttle_ms,
+                                debounce_ms=debounce_ms,
+                                coalesce=coalesce)
 
 
 class Canvas(Element):
 
+    __slots__ = ()
     _tag_type: str = "canvas"
 
     def __init__(self,
@@ -660,26 +2273,30 @@ class Canvas(Element):
 
     @property
     def get_context(self) -> CanvasRenderingContext2D:
-        return self._element.getContext("2d")
+        return self.element.getContext("2d")
 
 
 class Caption(Element):
 
+    __slots__ = ()
     _tag_type: str = "caption"
 
 
 class Citation(Element):
 
+    __slots__ = ()
     _tag_type: str = "cite"
 
 
 class Code(Element):
 
+    __slots__ = ()
     _tag_type: str = "code"
 
 
 class Col(Element):
 
+    __slots__ = ()
     _tag_type: str = "col"
 
     def __init__(self,
@@ -705,6 +2322,7 @@ class Col(Element):
 
 class Colgroup(Element):
 
+    __slots__ = ()
     _tag_type: str = "colgroup"
 
     def __init__(self,
@@ -730,26 +2348,31 @@ class Colgroup(Element):
 
 class Data(Element):
 
+    __slots__ = ()
     _tag_type: str = "data"
 
 
 class DataList(Element):
 
+    __slots__ = ()
     _tag_type: str = "datalist"
 
 
 class Dd(Element):
 
+    __slots__ = ()
     _tag_type: str = "dd"
 
 
 class Del(Element):
 
+    __slots__ = ()
     _tag_type: str = "del"
 
 
 class Details(Element):
 
+    __slots__ = ()
     _tag_type: str = "details"
 
     def __init__(self,
@@ -774,11 +2397,13 @@ class Details(Element):
 
 class Dfn(Element):
 
+    __slots__ = ()
     _tag_type: str = "dfn"
 
 
 class Dialog(Element):
 
+    __slots__ = ()
     _tag_type: str = "dialog"
 
     def __init__(self,
@@ -803,26 +2428,31 @@ class Dialog(Element):
 
 class Div(Element):
 
+    __slots__ = ()
     _tag_type: str = "div"
 
 
 class Dt(Element):
 
+    __slots__ = ()
     _tag_type: str = "dt"
 
 
 class Dl(Element):
 
+    __slots__ = ()
     _tag_type: str = "dl"
 
 
 class Em(Element):
 
+    __slots__ = ()
     _tag_type: str = "em"
 
 
 class Embed(Element):
 
+    __slots__ = ()
     _tag_type: str = "embed"
 
     def __init__(self,
@@ -883,6 +2513,7 @@ class Embed(Element):
 
 class Fieldset(Element):
 
+    __slots__ = ()
     _tag_type: str = "fieldset"
 
     def __init__(self,
@@ -931,21 +2562,25 @@ class Fieldset(Element):
 
 class Figcaption(Element):
 
+    __slots__ = ()
     _tag_type: str = "figcaption"
 
 
 class Figure(Element):
 
+    __slots__ = ()
     _tag_type: str = "figure"
 
 
 class Footer(Element):
 
+    __slots__ = ()
     _tag_type: str = "footer"
 
 
 class Form(Element):
 
+    __slots__ = ()
     _tag_type: str = "form"
 
     def __init__(self,
@@ -1006,61 +2641,73 @@ class Form(Element):
 
 class H1(Element):
 
+    __slots__ = ()
     _tag_type: str = "h1"
 
 
 class H2(Element):
 
+    __slots__ = ()
     _tag_type: str = "h2"
 
 
 class H3(Element):
 
+    __slots__ = ()
     _tag_type: str = "h3"
 
 
 class H4(Element):
 
+    __slots__ = ()
     _tag_type: str = "h4"
 
 
 class H5(Element):
 
+    __slots__ = ()
     _tag_type: str = "h5"
 
 
 class H6(Element):
 
+    __slots__ = ()
     _tag_type: str = "h6"
 
 
 class Head(Element):
 
+    __slots__ = ()
     _tag_type: str = "head"
 
 
 class Header(Element):
 
+    __slots__ = ()
     _tag_type: str = "header"
 
 
 class Hr(Element):
 
+    __slots__ = ()
     _tag_type: str = "hr"
 
 
 class Html(Element):
 
+    __slots__ = ()
     _tag_type: str = "html"
 
 
 class I(Element):
 
+    __slots__ = ()
     _tag_type: str = "i"
 
 
 class IFrame(Element):
 
+    __slots__ = ()
     _tag_type: str = "iframe"
 
     def __init__(self,
@@ -1131,39 +2778,280 @@ class IFrame(Element):
                            is_boolean_attribute=True)
 
 
-class Image(Element):
+def _pil_format(format: str) -> str:
+    """the PIL format name of an image format like 'png' or 'jpg'"""
+    format = format.upper()
+    return "JPEG" if format == "JPG" else format
 
-    @classmethod
-    def from_numpy_array(cls, m:"np.ndarray", format="PNG", **kwargs):
-        if format.upper() == "JPG":
-            format = "JPEG"
 
-        img = PILImage.fromarray(m)
-        buf = BytesIO()
+def _image_mime_type(format: str) -> str:
+    return f"image/{_pil_format(format).lower()}"
 
-        img.save(buf, format=format.upper())
 
-        img_base64 = f"data:image/{format.lower()};base64, {base64.b64encode(buf.getvalue()).decode('ascii')}"
+# longest side of the previews of progressive images
+_PREVIEW_SIZE = 256
 
-        return cls(src=img_base64, **kwargs)
-    
-    @classmethod
-    def from_pil_image(cls, img:PILImage, format="PNG", **kwargs):
 
+def _after_next_paint(callback: Callable[[], None]) -> None:
+    """call callback once the browser has painted the next frame"""
+    # a timeout set from an animation frame runs after that frame was rendered
+    requestAnimationFrame(create_once_callable(
+        lambda *_: setTimeout(create_once_callable(callback), 0)))
+
+
+# image encoders: --------------------------------------------------------------
+#
+# the Image constructors encode pixels with an encoder policy, passed as
+# encoder=. Policies trade encode time against the size of the result.
+
+class ImageEncoder(object):
+    """
+    encodes PIL images in a PIL format with fixed save options. Any format PIL can
+    write works; the subclasses below set the useful options of the common ones
+    """
+
+    # rough encode time per megapixel, for AutoEncoder's first guesses
+    expected_ms_per_megapixel: float = 100.0
+    keeps_transparency: bool = True
+
+    def __init__(self, format: str = "PNG", **options) -> None:
+        self._format = _pil_format(format)
+        self._options = options
+
+    @property
+    def format(self) -> str:
+        return self._format
+
+    @property
+    def mime_type(self) -> str:
+        return _image_mime_type(self._format)
+
+    @property
+    def cache_key(self) -> tuple:
+        """what the output depends on apart from the pixels, for the encode cache"""
+        return (self._format,) + tuple(sorted(self._options.items()))
+
+    def encode(self, img: PILImage) -> Tuple[bytes, str]:
+        """the encoded image and its mime type"""
         buf = BytesIO()
+        self._prepare(img).save(buf, format=self._format, **self._options)
+        return buf.getvalue(), self.mime_type
 
-        img.save(buf, format=format.upper())
+    def _prepare(self, img: PILImage) -> PILImage:
+        """img converted to what the format can store"""
+        return img
 
-        img_base64 = f"data:image/{format.lower()};base64, {base64.b64encode(buf.getvalue()).decode('ascii')}"
+    def __repr__(self) -> str:
+        options = ", ".join(f"{name}={value!r}" for name, value in self._options.items())
+        return f"{type(self).__name__}({options})"
 
-        return cls(src=img_base64, **kwargs)
+
+class PngEncoder(ImageEncoder):
+    """
+    lossless. compress_level (0-9) trades zlib time against size, 6 is PIL's
+    default. Level 1 helps on smooth images, most of the time on noisy ones goes into filtering
+    """
+
+    def __init__(self, compress_level: int = 6) -> None:
+        super().__init__("PNG", compress_level=compress_level)
+
+    @property
+    def expected_ms_per_megapixel(self) -> float:
+        return 150.0 if self._options["compress_level"] > 1 else 100.0
+
+
+class JpegEncoder(ImageEncoder):
+    """lossy, small and fast for photos. quality goes from 1 to 95. Transparency is dropped"""
+
+    expected_ms_per_megapixel: float = 10.0
+    keeps_transparency: bool = False
+
+    def __init__(self, quality: int = 75) -> None:
+        super().__init__("JPEG", quality=quality)
+
+    def _prepare(self, img: PILImage) -> PILImage:
+        return img if img.mode in ("L", "RGB", "CMYK") else img.convert("RGB")
+
+
+class WebpEncoder(ImageEncoder):
+    """the smallest files, but slower to encode than png. method (0-6) trades time against size"""
+
+    expected_ms_per_megapixel: float = 200.0
+
+    def __init__(self, quality: int = 80, lossless: bool = False, method: int = 4) -> None:
+        super().__init__("WEBP", quality=quality, lossless=lossless, method=method)
+
+
+class BmpEncoder(ImageEncoder):
+    """uncompressed, for the lowest latency: about 3 bytes per pixel, but next to no encode time"""
+
+    expected_ms_per_megapixel: float = 3.0
+
+    def __init__(self) -> None:
+        super().__init__("BMP")
+
+
+class AutoEncoder(object):
+    """
+    encodes with the first of candidates that is expected to take at most
+    latency_budget_ms for the image's size, or else the fastest of them. The
+    expected times start at the candidates' expected_ms_per_megapixel and follow
+    the measured encode times. Candidates that would drop transparency are skipped
+    for images that have some. By default the candidates go from the smallest
+    lossless output (png) to the fastest (bmp), all of them lossless. With a
+    jpeg_quality, a JpegEncoder of that quality comes before bmp, trading exact
+    pixels for smaller output than bmp
+    """
+
+    def __init__(self,
+                 latency_budget_ms: float = 100.0,
+                 candidates: List[ImageEncoder] = None,
+                 jpeg_quality: int = None) -> None:
+        self._latency_budget_ms = latency_budget_ms
+        if candidates is None:
+            candidates = [PngEncoder(), PngEncoder(compress_level=1), BmpEncoder()]
+            if jpeg_quality is not None:
+                candidates.insert(-1, JpegEncoder(quality=jpeg_quality))
+        elif jpeg_quality is not None:
+            raise ValueError("jpeg_quality only applies to the default candidates")
+        self._candidates = candidates
+        self._ms_per_megapixel = [candidate.expected_ms_per_megapixel for candidate in candidates]
+
+    @property
+    def cache_key(self) -> tuple:
+        # the choice depends on measured times, but any of the candidates' output may be reused
+        return ("auto", self._latency_budget_ms) + tuple(candidate.cache_key for candidate in self._candidates)
+
+    def choose(self, img: PILImage) -> int:
+        """index of the candidate used for img"""
+        transparent = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+        usable = [index for index, candidate in enumerate(self._candidates)
+                  if candidate.keeps_transparency or not transparent] or list(range(len(self._candidates)))
+        megapixels = img.size[0] * img.size[1] / 1e6
+        for index in usable:
+            if self._ms_per_megapixel[index] * megapixels <= self._latency_budget_ms:
+                return index
+        return min(usable, key=self._ms_per_megapixel.__getitem__)
+
+    def encode(self, img: PILImage) -> Tuple[bytes, str]:
+        index = self.choose(img)
+        start = time.perf_counter()
+        encoded = self._candidates[index].encode(img)
+        megapixels = max(img.size[0] * img.size[1] / 1e6, 1e-3)
+        measured = (time.perf_counter() - start) * 1000 / megapixels
+        self._ms_per_megapixel[index] = (self._ms_per_megapixel[index] + measured) / 2
+        return encoded
+
+    def __repr__(self) -> str:
+        return f"AutoEncoder(latency_budget_ms={self._latency_budget_ms!r}, candidates={self._candidates!r})"
+
+
+# encoder names accepted as encoder=
+_NAMED_ENCODERS = {
+    "png": PngEncoder,
+    "jpeg": JpegEncoder,
+    "jpg": JpegEncoder,
+    "webp": WebpEncoder,
+    "bmp": BmpEncoder,
+    "auto": AutoEncoder,
+}
+
+
+def _image_encoder(encoder: Union[ImageEncoder, AutoEncoder, str, None], format: str) -> Union[ImageEncoder, AutoEncoder]:
+    """the encoder for an encoder= argument; without one, the default encoder of format"""
+    if encoder is None:
+        encoder_class = _NAMED_ENCODERS.get(format.lower())
+        return encoder_class() if encoder_class is not None else ImageEncoder(format)
+    if isinstance(encoder, str):
+        return _NAMED_ENCODERS[encoder.lower()]()
+    return encoder
+
+
+class Image(Element):
+
+    __slots__ = ("_src_generation",)
+    # the ImageCanvas class used by from_numpy_array(raw=True), ImageCanvas if None
+    _canvas_class: type = None
+
+    @classmethod
+    def from_numpy_array(cls,
+                         m:"np.ndarray",
+                         format="PNG",
+                         raw: bool = False,
+                         encoder=None,
+                         progressive: bool = False,
+                         **kwargs):
+        """
+        an image showing the pixels of m. encoder picks how they are encoded: an
+        ImageEncoder or AutoEncoder, or one of "png", "jpeg", "webp", "bmp" and "auto".
+        By default, format's encoder with PIL's default options is used.
+
+        With progressive=True, a large image first shows a downscaled preview, and
+        the full image is encoded and swapped in after the preview was painted
+        (unless src was changed or the element destroyed before). m must not be
+        modified until then.
+        With raw=True, m (uint8 gray, RGB or RGBA) is drawn into a canvas instead
+        (see ImageCanvas), without encoding it first
+        """
+        if raw:
+            kwargs.setdefault("class_name", cls._default_class_name)
+            return (cls._canvas_class or ImageCanvas)(pixels=m, **kwargs)
+
+        import numpy as np
+
+        encoder = _image_encoder(encoder, format)
+        key = lambda: ("array", content_hash(np.ascontiguousarray(m)), m.shape, m.dtype.str) + encoder.cache_key
+        if progressive and max(m.shape[:2]) > _PREVIEW_SIZE:
+            if _encode_cache is not None:
+                # hashed once, for the lookup here and for the url of the full image
+                cache_key = key()
+                key = lambda: cache_key
+            if _encode_cache is None or key() not in _encode_cache:
+                return cls._from_numpy_array_progressive(m, encoder, key, kwargs)
+        src = _encoded_object_url(key, lambda: encoder.encode(PILImage.fromarray(m)))
+
+        return cls(src=src, **kwargs)
+
+    @classmethod
+    def _from_numpy_array_progressive(cls, m:"np.ndarray", encoder, key: Callable[[], tuple], kwargs: dict) -> "Image":
+        step = -(-max(m.shape[:2]) // _PREVIEW_SIZE)
+        element = cls.from_numpy_array(m[::step, ::step], encoder=encoder, **kwargs)
+        # shown at the full image's size until it replaces the preview
+        element.set_attribute("width", m.shape[1])
+        generation = element._src_generation
+
+        def show_full_image() -> None:
+            if element._src_generation != generation or _element_registry.get(element._id) is not element:
+                # src was replaced or the element destroyed in the meantime
+                return
+            src = _encoded_object_url(key, lambda: encoder.encode(PILImage.fromarray(m)))
+            with element.batch():
+                element.src = src
+                element.remove_attribute("width")
+
+        _after_next_paint(show_full_image)
+        return element
+    
+    @classmethod
+    def from_pil_image(cls, img:PILImage, format="PNG", encoder=None, **kwargs):
+
+        encoder = _image_encoder(encoder, format)
+        key = lambda: ("pil", content_hash(img.tobytes(), bytes(img.getpalette() or ())), img.mode, img.size) + encoder.cache_key
+        src = _encoded_object_url(key, lambda: encoder.encode(img))
+
+        return cls(src=src, **kwargs)
     
     @classmethod
     def from_bytes(cls, img:bytes, format="PNG", **kwargs):
+        """
+        an image showing the encoded image img, through an object url (see create_object_url).
+        Like the other constructors, equal content reuses the url of the encode cache, if one is set
+        """
 
-        img_base64 = f"data:image/{format.lower()};base64, {base64.b64encode(img).decode('ascii')}"
+        mime_type = _image_mime_type(format)
+        src = _encoded_object_url(lambda: ("bytes", content_hash(img), mime_type), lambda: (img, mime_type))
 
-        return cls(src=img_base64, **kwargs)
+        return cls(src=src, **kwargs)
     
     @classmethod
     def from_base64(cls, img:str, format="PNG", **kwargs):
@@ -1173,31 +3061,27 @@ class Image(Element):
         return cls(src=img_base64, **kwargs)
     
     @classmethod
-    def from_file(cls, file_path:str, format="PNG", **kwargs):
-        img = PILImage.open(file_path)
-        buf = BytesIO()
-
-        img.save(buf, format=format.upper())
+    def from_file(cls, file_path:str, format="PNG", encoder=None, **kwargs):
 
-        img_base64 = f"data:image/{format.lower()};base64, {base64.b64encode(buf.getvalue()).decode('utf-8')}"
+        with open(file_path, "rb") as f:
+            data = f.read()
+        encoder = _image_encoder(encoder, format)
+        src = _encoded_object_url(lambda: ("file", content_hash(data)) + encoder.cache_key,
+                                  lambda: encoder.encode(PILImage.open(BytesIO(data))))
 
-        return cls(src=img_base64, **kwargs)
+        return cls(src=src, **kwargs)
     
     @classmethod
     def from_bytesio(cls, buf:BytesIO, format="PNG", **kwargs):
-            
-        img_base64 = f"data:image/{format.lower()};base64, {base64.b64encode(buf.getvalue()).decode('utf-8')}"
-    
-        return cls(src=img_base64, **kwargs)
+
+        return cls.from_bytes(buf.getvalue(), format=format, **kwargs)
     
     @classmethod
     def from_matplotlib_figure(cls, fig:"matplotlib.pyplot.Figure", format="PNG", **kwargs):
         buf = BytesIO()
-        fig.savefig(buf, format=format.upper())
-
-        img_base64 = f"data:image/{format.lower()};base64, {base64.b64encode(buf.getvalue()).decode('utf-8')}"
+        fig.savefig(buf, format=format.lower())
 
-        return cls(src=img_base64, **kwargs)
+        return cls.from_bytes(buf.getvalue(), format=format, **kwargs)
 
 
     _tag_type: str = "img"
@@ -1212,6 +3096,8 @@ class Image(Element):
                  height: str = None,
                  usemap: str = None,
                  inner_html: str = None) -> None:
+        # counts src changes, so a scheduled change can tell if it is stale
+        self._src_generation = 0
         super().__init__(id=id, class_name=class_name, parent=parent, inner_html=inner_html)
 
         if src is not None:
@@ -1232,6 +3118,8 @@ class Image(Element):
 
     @src.setter
     def src(self, value: str) -> None:
+        self._src_generation += 1
+        self._hold_object_url(value)
         self.set_attribute("src", value)
 
     @property
@@ -1252,8 +3140,91 @@ class Image(Element):
         self.set_attribute("usemap", value)
 
 
+def _rgba_pixels(m: "np.ndarray") -> "np.ndarray":
+    """m as a contiguous height x width x 4 uint8 array, only copied if it is not one already"""
+    import numpy as np
+
+    if m.dtype != np.uint8:
+        raise TypeError(f"raw pixels have to be uint8, not {m.dtype}")
+    if m.ndim == 2:
+        m = m[:, :, np.newaxis]
+    if m.ndim != 3 or m.shape[2] not in (1, 3, 4):
+        raise ValueError(f"expected gray, RGB or RGBA pixels, not an array of shape {m.shape}")
+    if m.shape[2] == 4:
+        return np.ascontiguousarray(m)
+    rgba = np.empty(m.shape[:2] + (4,), dtype=np.uint8)
+    rgba[:, :, :3] = m
+    rgba[:, :, 3] = 255
+    return rgba
+
+
+class ImageCanvas(Image):
+    """
+    an Image drawn into a <canvas>. The pixels are handed to the canvas' ImageData
+    as a view of the array's memory, without the PNG and base64 encoding of an
+    <img> src. Without a browser (headless) the canvas stays empty
+    """
+
+    __slots__ = ("_pixel_shape",)
+    _tag_type: str = "canvas"
+
+    def __init__(self,
+                 id: str = None,
+                 class_name: str = None,
+                 parent: Element = None,
+                 pixels: "np.ndarray" = None,
+                 alt: str = None,
+                 width: str = None,
+                 height: str = None,
+                 inner_html: str = None) -> None:
+        # (height, width) of the canvas bitmap
+        self._pixel_shape = None
+        super().__init__(id=id, class_name=class_name, parent=parent, alt=alt,
+                         width=width, height=height, inner_html=inner_html)
+        self.set_attribute("role", "img")
+
+        if pixels is not None:
+            self.set_pixels(pixels)
+
+    @classmethod
+    def from_numpy_array(cls, m:"np.ndarray", format=None, raw: bool = True, **kwargs):
+        return cls(pixels=m, **kwargs)
+
+    def set_pixels(self, m: "np.ndarray") -> None:
+        """draw m (uint8 gray, RGB or RGBA), resizing the canvas to the array's size"""
+        pixels = _rgba_pixels(m)
+        height, width = pixels.shape[:2]
+        if self._pixel_shape != (height, width):
+            # resizing reallocates the canvas bitmap, so it is only done if needed
+            with self.batch():
+                self.set_attribute("width", width)
+                self.set_attribute("height", height)
+            self._pixel_shape = (height, width)
+
+        context = self.element.getContext("2d")
+        if context is None:
+            return
+        proxy = create_proxy(pixels)
+        buffer = proxy.getBuffer("u8clamped")
+        try:
+            # ImageData wraps the view of the wasm heap, putImageData does the only copy
+            context.putImageData(ImageData.new(buffer.data, width, height), 0, 0)
+        finally:
+            buffer.release()
+            proxy.destroy()
+
+    @property
+    def alt(self) -> str:
+        return self.get_attribute("aria-label")
+
+    @alt.setter
+    def alt(self, value: str) -> None:
+        self.set_attribute("aria-label", value)
+
+
 class Input(Element):
 
+    __slots__ = ()
     _tag_type: str = "input"
 
     def __init__(self,
@@ -1280,7 +3251,6 @@ class Input(Element):
         if placeholder is not None:
             self.placeholder = placeholder
         
-        self._onchange = None
         if onchange is not None:
             self.onchange = onchange
 
@@ -1304,11 +3274,11 @@ class Input(Element):
 
     @property
     def value(self) -> str:
-        return self._element.value
+        return self.element.value
 
     @value.setter
     def value(self, value: str) -> None:
-        self._element.value = value
+        self.element.value = value
 
     @property
     def placeholder(self) -> str:
@@ -1328,26 +3298,39 @@ class Input(Element):
     
     @property
     def onchange(self) -> str:
-        return self._onchange
+        return self._get_event_handler("change")
 
     @onchange.setter
     def onchange(self, value) -> None:
-        self._onchange = value
-        self.add_event_listener("change", value)
+        self._set_event_handler("change", value)
+
+    def set_onchange(self,
+                     value: Union[callable, None],
+                     throttle_ms: float = None,
+                     debounce_ms: float = None,
+                     coalesce: str = None) -> None:
+        """like assigning onchange, with the rate limiting options of add_event_listener"""
+        self._set_event_handler("change", value,
+                                throttle_ms=throttle_ms,
+                                debounce_ms=debounce_ms,
+                                coalesce=coalesce)
 
 
 class Ins(Element):
 
+    __slots__ = ()
     _tag_type: str = "ins"
 
 
 class Kbd(Element):
 
+    __slots__ = ()
     _tag_type: str = "kbd"
 
 
 class Label(Element):
 
+    __slots__ = ()
     _tag_type: str = "label"
 
     def __init__(self,
@@ -1396,16 +3379,19 @@ class Label(Element):
 
 class Legend(Element):
 
+    __slots__ = ()
     _tag_type: str = "legend"
 
 
 class Li(Element):
 
+    __slots__ = ()
     _tag_type: str = "li"
 
 
 class Link(Element):
 
+    __slots__ = ()
     _tag_type: str = "link"
 
     def __init__(self,
@@ -1454,21 +3440,25 @@ class Link(Element):
 
 class Main(Element):
 
+    __slots__ = ()
     _tag_type: str = "main"
 
 
 class Map(Element):
 
+    __slots__ = ()
     _tag_type: str = "map"
 
 
 class Mark(Element):
 
+    __slots__ = ()
     _tag_type: str = "mark"
 
 
 class Meta(Element):
 
+    __slots__ = ()
     _tag_type: str = "meta"
 
     def __init__(self,
@@ -1529,21 +3519,25 @@ class Meta(Element):
 
 class Meter(Element):
 
+    __slots__ = ()
     _tag_type: str = "meter"
 
 
 class Nav(Element):
 
+    __slots__ = ()
     _tag_type: str = "nav"
 
 
 class Noscript(Element):
 
+    __slots__ = ()
     _tag_type: str = "noscript"
 
 
 class Object(Element):
 
+    __slots__ = ()
     _tag_type: str = "object"
 
     def __init__(self,
@@ -1628,11 +3622,13 @@ class Object(Element):
 
 class Ol(Element):
 
+    __slots__ = ()
     _tag_type: str = "ol"
 
 
 class Optgroup(Element):
 
+    __slots__ = ()
     _tag_type: str = "optgroup"
 
     def __init__(self,
@@ -1657,6 +3653,7 @@ class Optgroup(Element):
 
 class Option(Element):
 
+    __slots__ = ()
     _tag_type: str = "option"
 
     def __init__(self,
@@ -1693,11 +3690,13 @@ class Option(Element):
 
 class P(Element):
 
+    __slots__ = ()
     _tag_type: str = "p"
 
 
 class Param(Element):
 
+    __slots__ = ()
     _tag_type: str = "param"
 
     def __init__(self,
@@ -1746,16 +3745,19 @@ class Param(Element):
 
 class Picture(Element):
 
+    __slots__ = ()
     _tag_type: str = "picture"
 
 
 class Pre(Element):
 
+    __slots__ = ()
     _tag_type: str = "pre"
 
 
 class Progress(Element):
 
+    __slots__ = ()
     _tag_type: str = "progress"
 
     def __init__(self,
@@ -1792,6 +3794,7 @@ class Progress(Element):
 
 class Q(Element):
 
+    __slots__ = ()
     _tag_type: str = "q"
 
     def __init__(self,
@@ -1816,27 +3819,33 @@ class Q(Element):
 
 class Rp(Element):
 
+    __slots__ = ()
     _tag_type: str = "rp"
 
 
 class Rt(Element):
 
+    __slots__ = ()
     _tag_type: str = "rt"
 
 class Ruby(Element):
 
+    __slots__ = ()
     _tag_type: str = "ruby"
 
 class S(Element):
 
+    __slots__ = ()
     _tag_type: str = "s"
 
 class Samp(Element):
 
+    __slots__ = ()
     _tag_type: str = "samp"
 
 class Script(Element):
 
+    __slots__ = ()
     _tag_type: str = "script"
 
     def __init__(self,
@@ -1872,10 +3881,12 @@ class Script(Element):
 
 class Section(Element):
 
+    __slots__ = ()
     _tag_type: str = "section"
 
 class Select(Element):
 
+    __slots__ = ()
     _tag_type: str = "select"
 
     def __init__(self,
@@ -1935,10 +3946,12 @@ class Select(Element):
 
 class Small(Element):
 
+    __slots__ = ()
     _tag_type: str = "small"
 
 class Source(Element):
 
+    __slots__ = ()
     _tag_type: str = "source"
 
     def __init__(self,
@@ -1966,6 +3979,7 @@ class Source(Element):
 
     @src.setter
     def src(self, value: str) -> None:
+        self._hold_object_url(value)
         self.set_attribute("src", value)
 
     @property
@@ -1986,14 +4000,17 @@ class Source(Element):
 
 class Span(Element):
 
+    __slots__ = ()
     _tag_type: str = "span"
 
 class Strong(Element):
 
+    __slots__ = ()
     _tag_type: str = "strong"
 
 class Style(Element):
 
+    __slots__ = ()
     _tag_type: str = "style"
 
     def __init__(self,
@@ -2029,18 +4046,22 @@ class Style(Element):
 
 class Sub(Element):
 
+    __slots__ = ()
     _tag_type: str = "sub"
 
 class Summary(Element):
 
+    __slots__ = ()
     _tag_type: str = "summary"
 
 class Sup(Element):
 
+    __slots__ = ()
     _tag_type: str = "sup"
 
 class Svg(Element):
 
+    __slots__ = ()
     _tag_type: str = "svg"
 
     def __init__(self,
@@ -2076,22 +4097,27 @@ class Svg(Element):
 
 class Table(Element):
     
+    __slots__ = ()
     _tag_type: str = "table"
 
 class TBody(Element):
 
+    __slots__ = ()
     _tag_type: str = "tbody"
 
 class Td(Element):
 
+    __slots__ = ()
     _tag_type: str = "td"
 
 class Template(Element):
 
+    __slots__ = ()
     _tag_type: str = "template"
 
 class TextArea(Element):
 
+    __slots__ = ()
     _tag_type: str = "textarea"
 
     def __init__(self,
@@ -2139,18 +4165,22 @@ class TextArea(Element):
 
 class TFoot(Element):
 
+    __slots__ = ()
     _tag_type: str = "tfoot"
 
 class Th(Element):
 
+    __slots__ = ()
     _tag_type: str = "th"
 
 class THead(Element):
 
+    __slots__ = ()
     _tag_type: str = "thead"
 
 class Time(Element):
 
+    __slots__ = ()
     _tag_type: str = "time"
 
     def __init__(self,
@@ -2174,14 +4204,17 @@ class Time(Element):
 
 class Title(Element):
 
+    __slots__ = ()
     _tag_type: str = "title"
 
 class Tr(Element):
 
+    __slots__ = ()
     _tag_type: str = "tr"
 
 class Track(Element):
 
+    __slots__ = ()
     _tag_type: str = "track"
 
     def __init__(self,
@@ -2254,20 +4287,24 @@ class Track(Element):
 
 class U(Element):
 
+    __slots__ = ()
     _tag_type: str = "u"
 
 class Ul(Element):
 
+    __slots__ = ()
     _tag_type: str = "ul"
 
 class Var(Element):
 
+    __slots__ = ()
     _tag_type: str = "var"
 
 
 
 class Video(Element):
 
+    __slots__ = ()
     _tag_type: str = "video"
 
     def __init__(self,
@@ -2354,6 +4391,7 @@ class Video(Element):
 
     @src.setter
     def src(self, value: str) -> None:
+        self._hold_object_url(value)
         self.set_attribute("src", value)
 
     @property
@@ -2366,4 +4404,5 @@ class Video(Element):
 
 class Wbr(Element):
 
+    __slots__ = ()
     _tag_type: str = "wbr"
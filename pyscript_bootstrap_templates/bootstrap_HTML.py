@@ -4,13 +4,33 @@ from typing import Dict, List, Union, Callable
 from . import HTML
 
 from .bootstrap_HTML_container import *
-from js import bootstrap  # type: ignore
+try:
+    from js import bootstrap  # type: ignore
+except ImportError:
+    from .headless import bootstrap
 
 class Div(BootstrapContainer):
-    pass
+    __slots__ = ()
 class Button(HTML.Button, BootstrapContainer):
+    __slots__ = ()
     _default_class_name = "btn"
 
+    def __init__(self,
+                 inner_html: str = None,
+                 id: str = None,
+                 class_name: str = None,
+                 parent: HTML.Element = None,
+                 type: str = "button",
+                 name: str = None,
+                 value: str = None,
+                 onclick=None,
+                 preset: Preset = None) -> None:
+        super().__init__(inner_html=inner_html, id=id, class_name=class_name,
+                         parent=parent, type=type, name=name, value=value, onclick=onclick)
+        # HTML.Button's constructor does not pass a preset on to BootstrapContainer's
+        if preset is not None:
+            self.apply_preset(preset)
+
     def make_large(self):
         self.remove_class("btn-sm")
         self.add_class("btn-lg")
@@ -32,9 +52,12 @@ class Button(HTML.Button, BootstrapContainer):
         if value:
             self.set_attribute("data-bs-toggle", "button")
             self.set_attribute("autocomplete", "off")
+            # bootstrap toggles the 'active' class from javascript
+            self.observe_classes()
         else:
             self.remove_attribute("data-bs-toggle")
             self.remove_attribute("autocomplete")
+            self.unobserve_classes()
 
     @property
     def is_toggle_button_active(self) -> Union[bool, None]:
@@ -65,16 +88,20 @@ class Button(HTML.Button, BootstrapContainer):
 
 class AccordionHeader(HTML.H2, BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name: str = "accordion-header"
 
 
 class AccordionBody(BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name: str = "accordion-body"
 
 
 class AccordionItem(BootstrapContainer):
 
+    __slots__ = ("_body", "_header")
+    _stamped = True
     _default_class_name: str = "accordion-item"
 
     def __init__(self,
@@ -85,11 +112,13 @@ class AccordionItem(BootstrapContainer):
                  id=None,
                  class_name=None,
                  parent=None,
-                 inner_html=None) -> None:
+                 inner_html=None,
+                 preset: Preset = None) -> None:
         super().__init__(id=id,
                          class_name=class_name,
                          parent=parent,
-                         inner_html=inner_html)
+                         inner_html=inner_html,
+                         preset=preset)
 
         header = AccordionHeader()
 
@@ -130,6 +159,7 @@ class AccordionItem(BootstrapContainer):
 
 class Accordion(BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name: str = "accordion"
 
     def add_accordion_item(self,
@@ -146,6 +176,7 @@ class Accordion(BootstrapContainer):
 
 class AccordionFlush(Accordion):
 
+    __slots__ = ()
     _default_class_name: str = "accordion-flush"
 
 # Alerts: ---------------------------------------------------------------------
@@ -153,6 +184,7 @@ class AccordionFlush(Accordion):
 
 class Alert(BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name: str = "alert"
 
     def __init__(self,
@@ -162,11 +194,13 @@ class Alert(BootstrapContainer):
                  id=None,
                  class_name=None,
                  parent=None,
-                 inner_html=None) -> None:
+                 inner_html=None,
+                 preset: Preset = None) -> None:
         super().__init__(id=id,
                          class_name=class_name,
                          parent=parent,
-                         inner_html=inner_html)
+                         inner_html=inner_html,
+                         preset=preset)
 
         if isinstance(content, str):
             self.inner_html = content
@@ -188,41 +222,49 @@ class Alert(BootstrapContainer):
 
 class AlertPrimary(Alert):
 
+    __slots__ = ()
     _default_class_name: str = "alert alert-primary"
 
 
 class AlertSecondary(Alert):
 
+    __slots__ = ()
     _default_class_name: str = "alert alert-secondary"
 
 
 class AlertSuccess(Alert):
 
+    __slots__ = ()
     _default_class_name: str = "alert alert-success"
 
 
 class AlertDanger(Alert):
 
+    __slots__ = ()
     _default_class_name: str = "alert alert-danger"
 
 
 class AlertWarning(Alert):
 
+    __slots__ = ()
     _default_class_name: str = "alert alert-warning"
 
 
 class AlertInfo(Alert):
 
+    __slots__ = ()
     _default_class_name: str = "alert alert-info"
 
 
 class AlertLight(Alert):
 
+    __slots__ = ()
     _default_class_name: str = "alert alert-light"
 
 
 class AlertDark(Alert):
 
+    __slots__ = ()
     _default_class_name: str = "alert alert-dark"
 
 # Badges: ---------------------------------------------------------------------
@@ -230,6 +272,7 @@ class AlertDark(Alert):
 
 class Badge(HTML.Span, BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name: str = "badge"
 
     def __init__(self,
@@ -238,11 +281,13 @@ class Badge(HTML.Span, BootstrapContainer):
                  id=None,
                  class_name=None,
                  parent=None,
-                 inner_html=None) -> None:
+                 inner_html=None,
+                 preset: Preset = None) -> None:
         super().__init__(id=id,
                          class_name=class_name,
                          parent=parent,
-                         inner_html=inner_html)
+                         inner_html=inner_html,
+                         preset=preset)
 
         if isinstance(content, str):
             self.inner_html = content
@@ -255,41 +300,49 @@ class Badge(HTML.Span, BootstrapContainer):
 
 class BadgePrimary(Badge):
 
+    __slots__ = ()
     _default_class_name: str = "badge bg-primary"
 
 
 class BadgeSecondary(Badge):
 
+    __slots__ = ()
     _default_class_name: str = "badge bg-secondary"
 
 
 class BadgeSuccess(Badge):
 
+    __slots__ = ()
     _default_class_name: str = "badge bg-success"
 
 
 class BadgeDanger(Badge):
 
+    __slots__ = ()
     _default_class_name: str = "badge bg-danger"
 
 
 class BadgeWarning(Badge):
 
+    __slots__ = ()
     _default_class_name: str = "badge bg-warning"
 
 
 class BadgeInfo(Badge):
 
+    __slots__ = ()
     _default_class_name: str = "badge bg-info"
 
 
 class BadgeLight(Badge):
 
+    __slots__ = ()
     _default_class_name: str = "badge bg-light"
 
 
 class BadgeDark(Badge):
 
+    __slots__ = ()
     _default_class_name: str = "badge bg-dark"
 
 # Breadcrumb: -----------------------------------------------------------------
@@ -297,6 +350,7 @@ class BadgeDark(Badge):
 
 class Breadcrumb(HTML.Nav, BootstrapContainer):
 
+    __slots__ = ("_links", "_ordered_list", "_paths")
     _default_class_name: str = "breadcrumb"
 
     def __init__(self,
@@ -306,11 +360,13 @@ class Breadcrumb(HTML.Nav, BootstrapContainer):
                  path: List[str] = None,
                  links: List[Union[str, None]] = None,
                  custom_divider: str = None,
-                 inner_html=None) -> None:
+                 inner_html=None,
+                 preset: Preset = None) -> None:
         super().__init__(id=id,
                          class_name=class_name,
                          parent=parent,
-                         inner_html=inner_html)
+                         inner_html=inner_html,
+                         preset=preset)
 
         self.set_attribute("aria-label", "breadcrumb")
 
@@ -324,8 +380,10 @@ class Breadcrumb(HTML.Nav, BootstrapContainer):
         if path is not None and links is not None:
             self.set_path(path, links)
 
-    def _add_breadcrumb_item(self, path_part, link, is_active: bool = False) -> None:
-        li = HTML.Li(parent=self._ordered_list, class_name="breadcrumb-item")
+    @staticmethod
+    def _create_breadcrumb_item(item) -> HTML.Li:
+        path_part, link, is_active = item
+        li = HTML.Li(class_name="breadcrumb-item")
         if is_active:
             li.add_class("active")
             li.set_attribute("aria-current", "page")
@@ -336,13 +394,12 @@ class Breadcrumb(HTML.Nav, BootstrapContainer):
         return li
 
     def _update_path(self):
-        if self._ordered_list is not None:
-            self._ordered_list.destroy()
-        self._ordered_list = HTML.Ol(parent=self)
+        if self._ordered_list is None:
+            self._ordered_list = HTML.Ol(parent=self)
 
         n = len(self._paths)
-        for i, (part, link) in enumerate(zip(self._paths, self._links)):
-            self._add_breadcrumb_item(part, link, is_active=i == n-1)
+        items = [(part, link, i == n-1) for i, (part, link) in enumerate(zip(self._paths, self._links))]
+        self._ordered_list.set_children(items, factory=self._create_breadcrumb_item)
 
     def set_path(self, path: List[str], links: List[str] = None) -> None:
         if links is None:
@@ -366,84 +423,104 @@ class Breadcrumb(HTML.Nav, BootstrapContainer):
 
 
 class ButtonPrimary(Button, BootstrapContainer):
+    __slots__ = ()
     _default_class_name = "btn btn-primary"
 
 
 class ButtonSecondary(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-secondary"
 
 
 class ButtonSuccess(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-success"
 
 
 class ButtonDanger(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-danger"
 
 
 class ButtonWarning(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-warning"
 
 
 class ButtonInfo(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-info"
 
 
 class ButtonLight(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-light"
 
 
 class ButtonDark(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-dark"
 
 
 class ButtonLink(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-link"
 
 
 class ButtonOutlinePrimary(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-outline-primary"
 
 
 class ButtonOutlineSecondary(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-outline-secondary"
 
 
 class ButtonOutlineSuccess(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-outline-success"
 
 
 class ButtonOutlineDanger(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-outline-danger"
 
 
 class ButtonOutlineWarning(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-outline-warning"
 
 
 class ButtonOutlineInfo(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-outline-info"
 
 
 class ButtonOutlineLight(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-outline-light"
 
 
 class ButtonOutlineDark(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-outline-dark"
 
 
 class ButtonClose(Button):
+    __slots__ = ()
     _default_class_name = "btn btn-close"
 
 
 class ButtonCloseWhite(ButtonClose):
+    __slots__ = ()
     _default_class_name = "btn btn-close-white"
 
 # Button Groups:---------------------------------------------------------------
 
 
 class ButtonGroup(BootstrapContainer):
+    __slots__ = ()
     _default_class_name = "btn-group"
 
     def add_button(self, button: Button):
@@ -451,39 +528,52 @@ class ButtonGroup(BootstrapContainer):
 
 
 class ButtonGroupVertical(ButtonGroup):
+    __slots__ = ()
     _default_class_name = "btn-group-vertical"
 
 
 class ButtonGroupToolbar(ButtonGroup):
+    __slots__ = ()
     _default_class_name = "btn-toolbar"
 
 
 class ButtonHamburger(Button):
 
+    __slots__ = ()
     _default_class_name: str = "navbar-toggler"
 
-    def __init__(self, inner_html: str = None, id: str = None, class_name: str = None, parent: HTML.Element = None, type: str = "button", name: str = None, value: str = None, onclick=None) -> None:
+    def __init__(self, inner_html: str = None, id: str = None, class_name: str = None, parent: HTML.Element = None, type: str = "button", name: str = None, value: str = None, onclick=None, preset: Preset = None) -> None:
         super().__init__(inner_html=inner_html, id=id, class_name=class_name,
-                         parent=parent, type=type, name=name, value=value, onclick=onclick)
+                         parent=parent, type=type, name=name, value=value, onclick=onclick, preset=preset)
 
         HTML.Span(parent=self, class_name="navbar-toggler-icon")
 
 # Bootstrap Media: ------------------------------------------------------------
 
 
+class ImageCanvas(HTML.ImageCanvas, BootstrapContainer):
+    __slots__ = ()
+    _default_class_name = "img-responsive"
+
+
 class Image(HTML.Image, BootstrapContainer):
+    __slots__ = ()
     _default_class_name = "img-responsive"
+    _canvas_class = ImageCanvas
 
 
 class Video(HTML.Video, BootstrapContainer):
+    __slots__ = ()
     _default_class_name = "img-responsive"
 
 
 class ImageFluid(Image):
+    __slots__ = ()
     _default_class_name = "img-fluid"
 
 
 class Thumbnail(Image):
+    __slots__ = ()
     _default_class_name = "img-thumbnail"
 
 
@@ -491,6 +581,8 @@ class Thumbnail(Image):
 
 
 class Card(BootstrapContainer):
+    __slots__ = ("_card_body", "_card_header", "_title_image")
+    _stamped = True
     _default_class_name = "card"
 
     def __init__(self, card_body: HTML.Div,
@@ -499,9 +591,10 @@ class Card(BootstrapContainer):
                  inner_html: str = None,
                  id: str = None,
                  class_name: str = None,
-                 parent: HTML.Element = None) -> None:
+                 parent: HTML.Element = None,
+                 preset: Preset = None) -> None:
 
-        super().__init__(inner_html, id, class_name, parent)
+        super().__init__(inner_html, id, class_name, parent, preset=preset)
 
         if card_body is not None:
             card_body.add_class("card-body")
@@ -562,6 +655,8 @@ class Card(BootstrapContainer):
 
 
 class Carousel(BootstrapContainer):
+    __slots__ = ("_carousel_inner", "_control_next", "_control_prev", "_controls", "_indicators",
+                 "_slides")
     _default_class_name = "carousel slide"
 
     def __init__(self,
@@ -571,9 +666,10 @@ class Carousel(BootstrapContainer):
                  inner_html: str = None,
                  with_controls: bool = False,
                  with_indicators: bool = False,
-                 fade_animation: bool = False) -> None:
+                 fade_animation: bool = False,
+                 preset: Preset = None) -> None:
 
-        super().__init__(inner_html=inner_html, id=id, class_name=class_name, parent=parent)
+        super().__init__(inner_html=inner_html, id=id, class_name=class_name, parent=parent, preset=preset)
 
         self.set_attribute("data-bs-ride", "carousel")
 
@@ -652,11 +748,15 @@ class Carousel(BootstrapContainer):
 
 
 class CarouselDark(Carousel):
+    __slots__ = ()
     _default_class_name = "carousel carousel-dark slide"
 
 
 class DropdownButton(BootstrapContainer):
 
+    __slots__ = ("_button_class", "_callback_function", "_current_value", "_custom_title",
+                 "_dropdown_button", "_dropdown_list", "_fire_callback_on_options_change",
+                 "_options", "_title_is_value")
     _default_class_name: str = "dropdown"
 
     _default_dropdown_menu_class: str = "dropdown-menu"
@@ -671,11 +771,13 @@ class DropdownButton(BootstrapContainer):
                  option_callback=None,
                  fire_callback_on_options_change: bool = True,
                  parent: HTML.Element = None,
-                 inner_html: str = None,) -> None:
+                 inner_html: str = None,
+                 preset: Preset = None) -> None:
         super().__init__(inner_html=inner_html,
                          id=id,
                          class_name=class_name,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         self._dropdown_button = None
         self._dropdown_list = None
@@ -697,19 +799,21 @@ class DropdownButton(BootstrapContainer):
         self._dropdown_button.set_attribute("data-bs-toggle", "dropdown")
         self._dropdown_button.set_attribute("aria-expanded", "false")
 
+    def _create_option_button(self, option: str) -> HTML.Element:
+        option_button = self._button_class(inner_html=option)
+        option_button.add_class("dropdown-item")
+        option_button.onclick = lambda _, opt=option: self._on_option_click(
+            opt)
+        return option_button
+
     def _create_options(self, options):
-        self._dropdown_list = BootstrapContainer(
-            class_name=self.__class__._default_dropdown_menu_class, parent=self)
-        self._dropdown_list.set_attribute(
-            "aria-labelledby", self._dropdown_button.id)
-        self._options = []
-        for option in options:
-            option_button = self._button_class(
-                inner_html=option, parent=self._dropdown_list)
-            option_button.add_class("dropdown-item")
-            self._options.append(option)
-            option_button.onclick = lambda _, opt=option: self._on_option_click(
-                opt)
+        if self._dropdown_list is None:
+            self._dropdown_list = BootstrapContainer(
+                class_name=self.__class__._default_dropdown_menu_class, parent=self)
+            self._dropdown_list.set_attribute(
+                "aria-labelledby", self._dropdown_button.id)
+        self._options = list(options)
+        self._dropdown_list.set_children(self._options, factory=self._create_option_button)
 
         if self._fire_callback_on_options_change:
             self._on_option_click(options[0])
@@ -736,7 +840,6 @@ class DropdownButton(BootstrapContainer):
 
     @options.setter
     def options(self, options: List[str]) -> None:
-        self._dropdown_list.destroy()
         self._create_options(options)
 
     @property
@@ -752,6 +855,7 @@ class DropdownButton(BootstrapContainer):
 
 class DropdownButtonDark(DropdownButton):
 
+    __slots__ = ()
     _default_dropdown_menu_class: str = "dropdown-menu dropdown-menu-dark"
 
 
@@ -759,35 +863,43 @@ class DropdownButtonDark(DropdownButton):
 
 
 class ContainerSmall(BootstrapContainer):
+    __slots__ = ()
     _default_class_name = "container-sm"
 
 
 class ContainerMedium(BootstrapContainer):
+    __slots__ = ()
     _default_class_name = "container-md"
 
 
 class ContainerLarge(BootstrapContainer):
+    __slots__ = ()
     _default_class_name = "container-lg"
 
 
 class ContainerXL(BootstrapContainer):
+    __slots__ = ()
     _default_class_name = "container-xl"
 
 
 class ContainerXXL(BootstrapContainer):
+    __slots__ = ()
     _default_class_name = "container-xxl"
 
 
 class ContainerFluid(BootstrapContainer):
+    __slots__ = ()
     _default_class_name = "container-fluid"
 
 
 class Row(BootstrapContainer):
+    __slots__ = ()
     _default_class_name = "row"
 
 
 class Col(BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name = "col"
 
     def __init__(self,
@@ -801,71 +913,73 @@ class Col(BootstrapContainer):
                  col_md: int = None,
                  col_lg: int = None,
                  col_xl: int = None,
-                 col_xxl: int = None) -> None:
-
+                 col_xxl: int = None,
+                 preset: Preset = None) -> None:
 
-        super().__init__(inner_html, id, class_name, parent)
 
+        super().__init__(inner_html, id, class_name, parent, preset=preset)
 
-        if col is not None:
-            self.col = col
+        with self.batch():
+            if col is not None:
+                self.col = col
 
-        if col_xs is not None:
-            self.col_xs = col_xs
+            if col_xs is not None:
+                self.col_xs = col_xs
 
-        if col_sm is not None:
-            self.col_sm = col_sm
+            if col_sm is not None:
+                self.col_sm = col_sm
 
-        if col_md is not None:
-            self.col_md = col_md
+            if col_md is not None:
+                self.col_md = col_md
 
-        if col_lg is not None:
-            self.col_lg = col_lg
+            if col_lg is not None:
+                self.col_lg = col_lg
 
-        if col_xl is not None:
-            self.col_xl = col_xl
+            if col_xl is not None:
+                self.col_xl = col_xl
 
-        if col_xxl is not None:
-            self.col_xxl = col_xxl
+            if col_xxl is not None:
+                self.col_xxl = col_xxl
 
     @property
     def order(self) -> Union[str, int, None]:
-        orders = list(self._search_class_list("order-{}"))
-        if len(orders) == 0:
-            return None
-        order = orders[0]   # ignore other orders than the first one
-        _, number = order.split("-")
-
-        if number.isnumeric():
-            return int(number)
-        return number
+        for order in self._classes_with_prefix("order-"):
+            # ignore other orders than the first one
+            number = order[len("order-"):]
+            if number.isnumeric():
+                return int(number)
+            return number
+        return None
 
     @order.setter
     def order(self, value: Union[str, int, None]) -> None:
-        self._remove_classes_by_search_term("order-{}")
+        self._discard_tokens(*self._classes_with_prefix("order-"))
         if value is not None:
-            self.add_class(f"order-{str(value)}")
+            self._add_token(f"order-{str(value)}")
+        self._write_class_name()
 
 
 class ListGroup(HTML.Ul, BootstrapContainer):
+    __slots__ = ()
     _default_class_name = "list-group"
 
     def __init__(self, id: str = None,
                  class_name: str = None,
                  parent: HTML.Element = None,
                  inner_html: str = None,
-                 items: List[Union[str, HTML.Element]] = None) -> None:
+                 items: List[Union[str, HTML.Element]] = None,
+                 preset: Preset = None) -> None:
         super().__init__(inner_html=inner_html,
                          id=id,
                          class_name=class_name,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         if items is not None:
-            for item in items:
-                self.add_item(item)
+            self.append_children([self._create_item(item) for item in items])
 
-    def add_item(self, item: Union[str, HTML.Element], active: bool = False, disabled: bool = False, item_class=HTML.Li) -> None:
-        li = item_class(class_name="list-group-item", parent=self)
+    def _create_item(self, item: Union[str, HTML.Element], active: bool = False, disabled: bool = False, item_class=HTML.Li) -> HTML.Element:
+        li = item_class(class_name="list-group-item")
         if active:
             li.add_class("active")
         if disabled:
@@ -873,19 +987,27 @@ class ListGroup(HTML.Ul, BootstrapContainer):
         if isinstance(item, str):
             li.inner_html = item
         else:
-            li.append(item)
+            li.append_child(item)
 
         return li
 
+    def add_item(self, item: Union[str, HTML.Element], active: bool = False, disabled: bool = False, item_class=HTML.Li) -> HTML.Element:
+        li = self._create_item(item, active, disabled, item_class=item_class)
+        self.append_child(li)
+        return li
+
 
 class ListGroupSelectable(ListGroup):
 
+    __slots__ = ("_button_class", "_items")
+
     def __init__(self, id: str = None,
                  class_name: str = None,
                  parent: HTML.Element = None,
                  inner_html: str = None,
                  options: List[Union[HTML.Element, str]] = None,
-                 button_class=ButtonPrimary) -> None:
+                 button_class=ButtonPrimary,
+                 preset: Preset = None) -> None:
 
         self._button_class = button_class
         self._items = []
@@ -893,15 +1015,17 @@ class ListGroupSelectable(ListGroup):
                          id=id,
                          class_name=class_name,
                          parent=parent,
-                         items=options)
-
-    def add_item(self, item: Union[str, HTML.Element],
-                 active: bool = False,
-                 disabled: bool = False) -> None:
-        item = super().add_item(item,
-                                active,
-                                disabled,
-                                item_class=self._button_class)
+                         items=options,
+                         preset=preset)
+
+    def _create_item(self, item: Union[str, HTML.Element],
+                     active: bool = False,
+                     disabled: bool = False,
+                     item_class=None) -> HTML.Element:
+        item = super()._create_item(item,
+                                    active,
+                                    disabled,
+                                    item_class=self._button_class)
 
         item.add_class("list-group-item-action")
         self._items.append(item)
@@ -924,23 +1048,28 @@ class ListGroupSelectable(ListGroup):
 
 
 class ModalTitle(HTML.H5, BootstrapContainer):
+    __slots__ = ()
     _default_class_name: str = "modal-title"
 
     def __init__(self, title: str,
                  id: str = None,
                  class_name: str = None,
                  parent: HTML.Element = None,
-                 inner_html: str = None) -> None:
+                 inner_html: str = None,
+                 preset: Preset = None) -> None:
         super().__init__(inner_html=inner_html,
                          id=id,
                          class_name=class_name,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         self.inner_html = title
 
 
 class ModalHeader(BootstrapContainer):
 
+    __slots__ = ("_button", "_close_button", "_title")
+    _stamped = True
     _default_class_name: str = "modal-header"
 
     def __init__(self,
@@ -949,11 +1078,13 @@ class ModalHeader(BootstrapContainer):
                  id: str = None,
                  class_name: str = None,
                  parent: HTML.Element = None,
-                 inner_html: str = None) -> None:
+                 inner_html: str = None,
+                 preset: Preset = None) -> None:
         super().__init__(inner_html=inner_html,
                          id=id,
                          class_name=class_name,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         self._title = None
         self._close_button = None
@@ -973,26 +1104,31 @@ class ModalHeader(BootstrapContainer):
 
 class ModalBody(BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name: str = "modal-body"
 
 
 class ModalFooter(BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name: str = "modal-footer"
 
 
 class ModalContent(BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name: str = "modal-content"
 
 
 class ModalDialog(BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name: str = "modal-dialog"
 
 
 class Modal(BootstrapContainer):
 
+    __slots__ = ("_body", "_footer", "_header", "_js_modal", "_modal_content", "_modal_dialog")
     _default_class_name: str = "modal"
 
     def __init__(self,
@@ -1006,11 +1142,13 @@ class Modal(BootstrapContainer):
                  id: str = None,
                  class_name: str = None,
                  parent: HTML.Element = None,
-                 inner_html: str = None) -> None:
+                 inner_html: str = None,
+                 preset: Preset = None) -> None:
         super().__init__(inner_html=inner_html,
                          id=id,
                          class_name=class_name,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         self.set_attribute("tabindex", -1)
         if fade:
@@ -1063,11 +1201,13 @@ class Modal(BootstrapContainer):
 # navbar: ---------------------------------------------------------------------
 
 class NavItem(HTML.Li, BootstrapContainer):
+    __slots__ = ()
     _default_class_name: str = "nav-item"
 
 
 class NavList(HTML.Ul, BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name: str = "nav"
 
     def add_item(self, item: HTML.Element):
@@ -1088,20 +1228,24 @@ class NavList(HTML.Ul, BootstrapContainer):
 
 class NavListVertical(NavList):
 
+    __slots__ = ()
     _default_class_name: str = "nav flex-column"
 
 
 class NavListTabs(NavList):
 
+    __slots__ = ()
     _default_class_name: str = "nav nav-tabs"
 
 
 class NavListPills(NavList):
 
+    __slots__ = ()
     _default_class_name: str = "nav nav-pills"
 
 
 class NavbarBrand(HTML.A, BootstrapContainer):
+    __slots__ = ()
     _default_class_name: str = "navbar-brand"
 
     def __init__(self,
@@ -1123,6 +1267,8 @@ class NavbarBrand(HTML.A, BootstrapContainer):
 
 class Navbar(BootstrapContainer):
 
+    __slots__ = ("_brand", "_current_nav_link", "_current_nav_name", "_fire_callback_on_option_init",
+                 "_nav_list", "_option_callback", "_options")
     _default_class_name: str = "navbar"
     _default_nav_list_class = NavList
 
@@ -1137,11 +1283,13 @@ class Navbar(BootstrapContainer):
                  id: str = None,
                  class_name: str = None,
                  parent: HTML.Element = None,
-                 inner_html: str = None) -> None:
+                 inner_html: str = None,
+                 preset: Preset = None) -> None:
         super().__init__(inner_html=inner_html,
                          id=id,
                          class_name=class_name,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         if toggle_button_for_target is not None:
             nav_item = NavItem(parent=self)
@@ -1232,41 +1380,49 @@ class Navbar(BootstrapContainer):
 
 class NavbarVertical(Navbar):
 
+    __slots__ = ()
     _default_nav_list_class = NavListVertical
 
 
 class NavbarTabs(Navbar):
 
+    __slots__ = ()
     _default_nav_list_class = NavListTabs
 
 
 class NavbarPills(Navbar):
 
+    __slots__ = ()
     _default_nav_list_class = NavListPills
 
 
 class NavbarDark(Navbar):
 
+    __slots__ = ()
     _default_class_name: str = "navbar navbar-dark bg-dark"
 
 
 class NavbarVerticalDark(NavbarVertical):
 
+    __slots__ = ()
     _default_class_name: str = "navbar navbar-dark bg-dark"
 
 
 class NavbarTabsDark(NavbarTabs):
 
+    __slots__ = ()
     _default_class_name: str = "navbar navbar-dark bg-dark"
 
 
 class NavbarPillsDark(NavbarPills):
 
+    __slots__ = ()
     _default_class_name: str = "navbar navbar-dark bg-dark"
 
 
 class Tabs(BootstrapContainer):
 
+    __slots__ = ("_active_tab", "_content_container", "_contents", "_navbar", "_old_navbar_callback")
     _default_navbar_tabs_class = NavbarTabs
 
     def __init__(self,
@@ -1275,11 +1431,13 @@ class Tabs(BootstrapContainer):
                  id: str = None,
                  class_name: str = None,
                  parent: HTML.Element = None,
-                 inner_html: str = None) -> None:
+                 inner_html: str = None,
+                 preset: Preset = None) -> None:
         super().__init__(inner_html=inner_html,
                          id=id,
                          class_name=class_name,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         if navbar is None:
             navbar = self.__class__._default_navbar_tabs_class(
@@ -1326,18 +1484,21 @@ class Tabs(BootstrapContainer):
 
 class TabsDark(Tabs):
 
+    __slots__ = ()
     _default_navbar_tabs_class = NavbarTabsDark
 
 class ToastHeader(BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name = "toast-header"
 
     def __init__(self, title:str,
                        inner_html: str = None,
                        id: str = None,
                        class_name: str = None,
-                       parent: "Element" = None) -> None:
-        super().__init__(inner_html=inner_html, id=id, class_name=class_name, parent=parent)
+                       parent: "Element" = None,
+                       preset: Preset = None) -> None:
+        super().__init__(inner_html=inner_html, id=id, class_name=class_name, parent=parent, preset=preset)
 
         HTML.Strong(title, class_name="me-auto", parent=self)
         close_button = HTML.Button(class_name="btn-close", parent=self)
@@ -1345,19 +1506,23 @@ class ToastHeader(BootstrapContainer):
         close_button.set_attribute("aria-label", "Close")
 
 class ToastBody(BootstrapContainer):
+    __slots__ = ()
     _default_class_name: str = "toast-body"
 
 class Toast(BootstrapContainer):
 
+    __slots__ = ("_js_toast",)
+    _stamped = True
     _default_class_name: str = "toast"
 
     def __init__(self, inner_html: str = None,
                        title: str = "Toast",
                        id: str = None,
                        class_name: str = None,
-                       parent: "Element" = None) -> None:
+                       parent: "Element" = None,
+                       preset: Preset = None) -> None:
 
-        super().__init__(id=id, class_name=class_name, parent=parent)
+        super().__init__(id=id, class_name=class_name, parent=parent, preset=preset)
 
         self.set_attribute("role", "alert")
         self.set_attribute("aria-live", "assertlive")
@@ -1403,14 +1568,16 @@ class Toast(BootstrapContainer):
         self.set_attribute("data-bs-delay", attribute_value=value ,is_boolean_attribute=True)
 
 class ToastContainer(BootstrapContainer):
+    __slots__ = ()
     _default_class_name: str = "toast-container"
 
     def __init__(self, inner_html: str = None,
                        id: str = None,
                        class_name: str = None,
-                       parent: "Element" = None) -> None:
+                       parent: "Element" = None,
+                       preset: Preset = None) -> None:
 
-        super().__init__(inner_html=inner_html, id=id, class_name=class_name, parent=parent)
+        super().__init__(inner_html=inner_html, id=id, class_name=class_name, parent=parent, preset=preset)
 
         self.position = Position.ABSOLUTE
         self.p = 3
@@ -1421,20 +1588,24 @@ class ToastContainer(BootstrapContainer):
 
 class OffcanvasTitle(HTML.H5, BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name: str = "offcanvas-title"
 
 
 class OffcanvasHeader(BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name: str = "offcanvas-header"
 
     def __init__(self,
                  title: Union[str, OffcanvasTitle],
                  close_button:bool = True,
                  parent: HTML.Element = None,
-                 inner_html: str = None) -> None:
+                 inner_html: str = None,
+                 preset: Preset = None) -> None:
         super().__init__(inner_html=inner_html,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         if isinstance(title, str):
             title = OffcanvasTitle(title)
@@ -1449,19 +1620,23 @@ class OffcanvasHeader(BootstrapContainer):
 
 class OffcanvasBody(BootstrapContainer):
 
+    __slots__ = ()
     _default_class_name: str = "offcanvas-body"
 
 class Offcanvas(BootstrapContainer):
 
+    __slots__ = ("_body", "_header", "_js_offcanvas")
     _default_class_name: str = "offcanvas offcanvas-start"
 
     def __init__(self,
                  header: Union[str, OffcanvasHeader],
                  content = HTML.Element,
                  parent: HTML.Element = None,
-                 inner_html: str = None) -> None:
+                 inner_html: str = None,
+                 preset: Preset = None) -> None:
         super().__init__(inner_html=inner_html,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
 
         self.set_attribute("tabindex", "-1")
@@ -1488,23 +1663,27 @@ class Offcanvas(BootstrapContainer):
     
 class OffcanvasStart(Offcanvas):
 
-    pass
+    __slots__ = ()
 
 class OffcanvasTop(Offcanvas):
 
+    __slots__ = ()
     _default_class_name: str = "offcanvas offcanvas-top"
 
 class OffcanvasEnd(Offcanvas):
 
+    __slots__ = ()
     _default_class_name: str = "offcanvas offcanvas-end"
 
 class OffcanvasBottom(Offcanvas):
 
+    __slots__ = ()
     _default_class_name: str = "offcanvas offcanvas-bottom"
 
 
 class Progress(BootstrapContainer):
 
+    __slots__ = ("_max", "_progress_bar", "_value")
     _default_class_name: str = "progress"
 
     def __init__(self,
@@ -1513,9 +1692,11 @@ class Progress(BootstrapContainer):
                  striped: bool = True,
                  animated: bool = True,
                  parent: HTML.Element = None,
-                 inner_html: str = None) -> None:
+                 inner_html: str = None,
+                 preset: Preset = None) -> None:
         super().__init__(inner_html=inner_html,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         self._value = value
         self._max = max
@@ -2,8 +2,11 @@
 # (of course you could generate the properties genericly on the fly, but this way should work
 # with all autocompletion engines (also it is somehow autogenerated, thx to github copilot :) ))
 
-from typing import Union
+from collections import OrderedDict
+from typing import Dict, Tuple, Union
 from enum import Enum
+from functools import lru_cache
+import sys
 from . import HTML
 
 # Base Container Class: -------------------------------------------------------
@@ -23,9 +26,6 @@ class BackgroundColor(str, Enum):
     TRANSPARENT = "transparent"
 
 
-_BACKGROUND_COLORS = [color.value for color in BackgroundColor]
-
-
 class BorderColor(str, Enum):
     PRIMARY = "primary"
     SECONDARY = "secondary"
@@ -40,9 +40,6 @@ class BorderColor(str, Enum):
     TRANSPARENT = "transparent"
 
 
-_BORDER_COLORS = [color.value for color in BorderColor]
-
-
 class TextColor(str, Enum):
     PRIMARY = "primary"
     SECONDARY = "secondary"
@@ -59,9 +56,6 @@ class TextColor(str, Enum):
     WHITE50 = "white-50"
 
 
-_TEXT_COLORS = [color.value for color in TextColor]
-
-
 class TextAlign(str, Enum):
     CENTER = "center"
     JUSTIFY = "justify"
@@ -69,18 +63,12 @@ class TextAlign(str, Enum):
     END = "end"
 
 
-_TEXT_ALIGNS = [align.value for align in TextAlign]
-
-
 class JustifyContent(str, Enum):
     START = "start"
     END = "end"
     CENTER = "center"
 
 
-_JUSTIFY_CONTENTS = [align.value for align in JustifyContent]
-
-
 class VerticalAlign(str, Enum):
     TOP = "top"
     MIDDLE = "middle"
@@ -90,9 +78,6 @@ class VerticalAlign(str, Enum):
     TEXT_BOTTOM = "text-bottom"
 
 
-_VERTICAL_ALIGNS = [align.value for align in VerticalAlign]
-
-
 class DisplayProperty(str, Enum):
 
     NONE = "none"
@@ -107,18 +92,12 @@ class DisplayProperty(str, Enum):
     INLINE_FLEX = "inline-flex"
 
 
-_DISPLAY_PROPERTIES = [display.value for display in DisplayProperty]
-
-
 class Float(str, Enum):
     NONE = "none"
     START = "start"
     END = "end"
 
 
-_FLOATS = [float.value for float in Float]
-
-
 class Shadow(str, Enum):
     NONE = "shadow-none"
     SMALL = "shadow-sm"
@@ -126,9 +105,6 @@ class Shadow(str, Enum):
     LARGE = "shadow-lg"
 
 
-_SHADOWS = [shadow.value for shadow in Shadow]
-
-
 class TextDecoration(str, Enum):
     NONE = "none"
     UNDERLINE = "underline"
@@ -136,26 +112,17 @@ class TextDecoration(str, Enum):
     OVERLINE = "overline"
 
 
-_TEXT_DECORATIONS = [decoration.value for decoration in TextDecoration]
-
-
 class UserSelect(str, Enum):
     NONE = "none"
     AUTO = "auto"
     ALL = "all"
 
 
-_USER_SELECTS = [user_select.value for user_select in UserSelect]
-
-
 class PointerEvent(str, Enum):
     NONE = "none"
     AUTO = "auto"
 
 
-_POINTER_EVENTS = [pointer_events.value for pointer_events in PointerEvent]
-
-
 class Overflow(str, Enum):
     HIDDEN = "hidden"
     VISIBLE = "visible"
@@ -163,9 +130,6 @@ class Overflow(str, Enum):
     AUTO = "auto"
 
 
-_OVERFLOWS = [overflow.value for overflow in Overflow]
-
-
 class Position(str, Enum):
     RELATIVE = "position-relative"
     ABSOLUTE = "position-absolute"
@@ -177,61 +141,113 @@ class Position(str, Enum):
     STICKY_TOP = "sticky-top"
 
 
-_POSITIONS = [position.value for position in Position]
+def _is_css_param_number(value: str) -> bool:
+    return value == "auto" or value.isdigit()
+
+
+@lru_cache(maxsize=None)
+def _enum_tokens(prefix: str, enum_class) -> Dict[str, Enum]:
+    """class token -> enum member, for every member of enum_class with the given class prefix"""
+    return {prefix + member.value: member for member in enum_class}
 
 
 class BootstrapContainer(HTML.Div):
+    __slots__ = ()
     _default_class_name = "container"
 
+    def __init__(self,
+                 inner_html: str = None,
+                 id: str = None,
+                 class_name: str = None,
+                 parent: HTML.Element = None,
+                 preset: "Preset" = None) -> None:
+        """
+        preset: utilities applied on top of the default classes (see Preset). Containers
+        whose constructor comes from the HTML module (e.g. form controls, labels and
+        images) take presets through apply_preset instead
+        """
+        super().__init__(inner_html=inner_html, id=id, class_name=class_name, parent=parent)
+        if preset is not None:
+            self.apply_preset(preset)
+
     def _set_css_param_number(self, prefix, value: Union[int, str, None], breakpoint: str = None) -> None:
         if breakpoint is not None:
             prefix += f"{breakpoint}-"
 
-        # remove all existing classes set for this breakpoint
-        self._remove_classes_by_search_term(search_term=prefix + "{:d}")
-        self._remove_classes_by_search_term(search_term=prefix + "auto")
+        # remove all existing number or 'auto' classes set for this breakpoint
+        self._discard_tokens(*[css_class for css_class in self._classes_with_prefix(prefix)
+                               if _is_css_param_number(css_class[len(prefix):])])
         if value is not None:
-            self.add_class(prefix + str(value))
+            self._add_token(prefix + str(value))
+        self._write_class_name()
 
     def _get_css_param_number(self, prefix, breakpoint: str = None) -> Union[int, str, None]:
-        search_term = prefix
         if breakpoint is not None:
-            search_term += f"{breakpoint}-"
-        search_term += "{:d}"
-        col_classes = list(self._search_class_list(search_term=search_term))
-        col_classes += list(self._search_class_list(search_term=prefix + "auto"))
-        if len(col_classes) == 0:
-            return None
-
-        col_class = col_classes[0]   # ignore other orders than the first one
+            prefix += f"{breakpoint}-"
 
-        if col_class.endswith("auto"):
-            return "auto"
-        return int(col_class.split("-")[-1])
+        # ignore other values than the first one
+        for css_class in self._classes_with_prefix(prefix):
+            value = css_class[len(prefix):]
+            if value == "auto":
+                return "auto"
+            if value.isdigit():
+                return int(value)
+        return None
 
-    def _get_enum_property(self, prefix: str, enum_class, enum_values, breakpoint: str = None) -> Union[Enum, None]:
+    def _get_enum_property(self, prefix: str, enum_class, breakpoint: str = None) -> Union[Enum, None]:
         if breakpoint is not None:
             prefix += f"{breakpoint}-"
 
-        for css_class in self.class_list:
-            if css_class.startswith(prefix):
-                candidate = css_class[len(prefix):]
-                if candidate in enum_values:
-                    return enum_class(candidate)
+        tokens = _enum_tokens(prefix, enum_class)
+        for css_class in self._classes:
+            member = tokens.get(css_class)
+            if member is not None:
+                return member
         return None
 
-    def _set_enum_property(self, value: Union[Enum, None], prefix: str, enum_class, enum_values, breakpoint: str = None):
+    def _set_enum_property(self, value: Union[Enum, str, None], prefix: str, enum_class, breakpoint: str = None):
         if breakpoint is not None:
             prefix += f"{breakpoint}-"
 
-        current_property = self._get_enum_property(prefix=prefix,
-                                                   enum_class=enum_class,
-                                                   enum_values=enum_values,
-                                                   breakpoint=breakpoint)
-        if current_property is not None:
-            self.remove_class(current_property.value)
+        tokens = _enum_tokens(prefix, enum_class)
+        self._discard_tokens(*[css_class for css_class in self._classes if css_class in tokens])
         if value is not None:
-            self.add_class(prefix + value.value)
+            self._add_token(prefix + enum_class(value).value)
+        self._write_class_name()
+
+    def utilities(self, **utilities) -> "BootstrapContainer":
+        """
+        set several utility properties with a single class write, e.g.
+
+        container.utilities(p=0, m=0, w=100, col_md=4, shadow=Shadow.LARGE)
+
+        Spacing, grid, sizing, enum and on/off utilities are resolved through
+        precomputed tables instead of their properties, all other keywords are
+        assigned as properties within the same batch
+        """
+        with self.batch():
+            for name, value in utilities.items():
+                prefix = _NUMBER_UTILITIES.get(name)
+                if prefix is not None:
+                    self._set_css_param_number(prefix, value)
+                    continue
+                enum_utility = _ENUM_UTILITIES.get(name)
+                if enum_utility is not None:
+                    self._set_enum_property(value, *enum_utility)
+                    continue
+                token = _FLAG_UTILITIES.get(name)
+                if token is not None:
+                    self.set_class(token, value)
+                    continue
+                setattr(self, name, value)
+        return self
+
+    def apply_preset(self, preset: "Preset") -> None:
+        """apply the utilities of a Preset with a single class assignment"""
+        class_name = preset.class_name_for(" ".join(self._classes))
+        self._reset_classes(class_name)
+        # the interned string itself, shared by all elements with this preset
+        self._write_class_name(class_name)
 
     def _make_fluid(self):
         self.remove_class("container")
@@ -270,13 +286,13 @@ class BootstrapContainer(HTML.Div):
         """
         element's background color. Has to be a memeber of the BackgroundColor enum
         """
-        self._get_enum_property(
-            prefix="bg-", enum_class=BackgroundColor, enum_values=_BACKGROUND_COLORS)
+        return self._get_enum_property(
+            prefix="bg-", enum_class=BackgroundColor)
 
     @background_color.setter
     def background_color(self, value: Union[BackgroundColor, None]):
         self._set_enum_property(
-            value=value, prefix="bg-", enum_class=BackgroundColor, enum_values=_BACKGROUND_COLORS)
+            value=value, prefix="bg-", enum_class=BackgroundColor)
 
     @property
     def background_gradient(self) -> bool:
@@ -296,78 +312,78 @@ class BootstrapContainer(HTML.Div):
         """
         element's text color. Has to be a memeber of the TextColors enum
         """
-        self._get_enum_property(
-            prefix="text-", enum_class=TextColor, enum_values=_TEXT_COLORS)
+        return self._get_enum_property(
+            prefix="text-", enum_class=TextColor)
 
     @text_color.setter
     def text_color(self, value: Union[TextColor, None]):
         self._set_enum_property(
-            value=value, prefix="text-", enum_class=TextColor, enum_values=_TEXT_COLORS)
+            value=value, prefix="text-", enum_class=TextColor)
 
     # text properties: --------------------------------------------------------
 
     @property
     def text_align(self) -> Union[TextAlign, None]:
-        return self._get_enum_property(prefix="text-", enum_class=TextAlign, enum_values=_TEXT_ALIGNS)
+        return self._get_enum_property(prefix="text-", enum_class=TextAlign)
 
     @text_align.setter
     def text_align(self, value: Union[TextAlign, None]):
         self._set_enum_property(
-            value=value, prefix="text-", enum_class=TextAlign, enum_values=_TEXT_ALIGNS)
+            value=value, prefix="text-", enum_class=TextAlign)
     
     @property
     def text_align_xs(self) -> Union[TextAlign, None]:
-        return self._get_enum_property(prefix="text-", enum_class=TextAlign, enum_values=_TEXT_ALIGNS, breakpoint="xs")
+        return self._get_enum_property(prefix="text-", enum_class=TextAlign, breakpoint="xs")
 
     @text_align_xs.setter
     def text_align_xs(self, value: Union[TextAlign, None]):
         self._set_enum_property(value=value, prefix="text-",
-                                enum_class=TextAlign, enum_values=_TEXT_ALIGNS, breakpoint="xs")
+                                enum_class=TextAlign, breakpoint="xs")
 
     @property
     def text_align_sm(self) -> Union[TextAlign, None]:
-        return self._get_enum_property(prefix="text-", enum_class=TextAlign, enum_values=_TEXT_ALIGNS, breakpoint="sm")
+        return self._get_enum_property(prefix="text-", enum_class=TextAlign, breakpoint="sm")
 
     @text_align_sm.setter
     def text_align_sm(self, value: Union[TextAlign, None]):
         self._set_enum_property(value=value, prefix="text-",
-                                enum_class=TextAlign, enum_values=_TEXT_ALIGNS, breakpoint="sm")
+                                enum_class=TextAlign, breakpoint="sm")
 
     @property
     def text_align_md(self) -> Union[TextAlign, None]:
-        return self._get_enum_property(prefix="text-", enum_class=TextAlign, enum_values=_TEXT_ALIGNS, breakpoint="md")
+        return self._get_enum_property(prefix="text-", enum_class=TextAlign, breakpoint="md")
 
     @text_align_md.setter
     def text_align_md(self, value: Union[TextAlign, None]):
         self._set_enum_property(value=value, prefix="text-",
-                                enum_class=TextAlign, enum_values=_TEXT_ALIGNS, breakpoint="md")
+                                enum_class=TextAlign, breakpoint="md")
 
     @property
     def text_align_lg(self) -> Union[TextAlign, None]:
-        return self._get_enum_property(prefix="text-", enum_class=TextAlign, enum_values=_TEXT_ALIGNS, breakpoint="lg")
+        return self._get_enum_property(prefix="text-", enum_class=TextAlign, breakpoint="lg")
 
     @text_align_lg.setter
     def text_align_lg(self, value: Union[TextAlign, None]):
         self._set_enum_property(value=value, prefix="text-",
-                                enum_class=TextAlign, enum_values=_TEXT_ALIGNS, breakpoint="lg")
+                                enum_class=TextAlign, breakpoint="lg")
 
     @property
     def text_align_xl(self) -> Union[TextAlign, None]:
-        return self._get_enum_property(prefix="text-", enum_class=TextAlign, enum_values=_TEXT_ALIGNS, breakpoint="xl")
+        return self._get_enum_property(prefix="text-", enum_class=TextAlign, breakpoint="xl")
 
     @text_align_xl.setter
     def text_align_xl(self, value: Union[TextAlign, None]):
         self._set_enum_property(value=value, prefix="text-",
-                                enum_class=TextAlign, enum_values=_TEXT_ALIGNS, breakpoint="xl")
+                                enum_class=TextAlign, breakpoint="xl")
 
     @property
     def text_align_xxl(self) -> Union[TextAlign, None]:
-        return self._get_enum_property(prefix="text-", enum_class=TextAlign, enum_values=_TEXT_ALIGNS, breakpoint="xxl")
+        return self._get_enum_property(prefix="text-", enum_class=TextAlign, breakpoint="xxl")
 
     @text_align_xxl.setter
     def text_align_xxl(self, value: Union[TextAlign, None]):
         self._set_enum_property(value=value, prefix="text-",
-                                enum_class=TextAlign, enum_values=_TEXT_ALIGNS, breakpoint="xxl")
+                                enum_class=TextAlign, breakpoint="xxl")
 
     @property
     def text_nowrap(self) -> bool:
@@ -421,12 +437,12 @@ class BootstrapContainer(HTML.Div):
 
     @property
     def justify_content(self) -> Union[JustifyContent, None]:
-        return self._get_enum_property(prefix="justify-content-", enum_class=JustifyContent, enum_values=_JUSTIFY_CONTENTS)
+        return self._get_enum_property(prefix="justify-content-", enum_class=JustifyContent)
 
     @justify_content.setter
     def justify_content(self, value: Union[JustifyContent, None]):
         self._set_enum_property(value=value, prefix="justify-content-",
-                                enum_class=JustifyContent, enum_values=_JUSTIFY_CONTENTS)
+                                enum_class=JustifyContent)
 
     # font parameters: --------------------------------------------------------
 
@@ -510,12 +526,12 @@ class BootstrapContainer(HTML.Div):
 
     @property
     def text_decoration(self) -> Union[TextDecoration, None]:
-        return self._get_enum_property(prefix="text-decoration", enum_class=TextDecoration, enum_values=_TEXT_DECORATIONS)
+        return self._get_enum_property(prefix="text-decoration-", enum_class=TextDecoration)
 
     @text_decoration.setter
     def text_decoration(self, value: Union[TextDecoration, None]):
-        self._set_enum_property(value=value, prefix="text-decoration",
-                                enum_class=TextDecoration, enum_values=_TEXT_DECORATIONS)
+        self._set_enum_property(value=value, prefix="text-decoration-",
+                                enum_class=TextDecoration)
 
     # vertical align: ---------------------------------------------------------
 
@@ -524,12 +540,12 @@ class BootstrapContainer(HTML.Div):
         """
         vertical alignment. Has to be a member of the VerticalAlign Enum
         """
-        return self._get_enum_property(prefix="align-", enum_class=VerticalAlign, enum_values=_VERTICAL_ALIGNS)
+        return self._get_enum_property(prefix="align-", enum_class=VerticalAlign)
 
     @vertical_align.setter
     def vertical_align(self, value: Union[VerticalAlign, None]):
         self._set_enum_property(value=value, prefix="align-",
-                                enum_class=VerticalAlign, enum_values=_VERTICAL_ALIGNS)
+                                enum_class=VerticalAlign)
 
     # visibility: ------------------------------------------------------------
 
@@ -561,66 +577,60 @@ class BootstrapContainer(HTML.Div):
 
     @property
     def display_property(self) -> Union[DisplayProperty, None]:
-        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty, enum_values=_DISPLAY_PROPERTIES)
+        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty)
 
     @display_property.setter
     def display_property(self, value: Union[DisplayProperty, None]):
         self._set_enum_property(
-            value=value, prefix="d-", enum_class=DisplayProperty, enum_values=_DISPLAY_PROPERTIES)
+            value=value, prefix="d-", enum_class=DisplayProperty)
     
     @property
     def display_property_xs(self) -> Union[DisplayProperty, None]:
-        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty, enum_values=_DISPLAY_PROPERTIES, breakpoint="xs")
+        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty, breakpoint="xs")
 
     @display_property_xs.setter
     def display_property_xs(self, value: Union[DisplayProperty, None]):
-        self._set_enum_property(value=value, prefix="d-", enum_class=DisplayProperty,
-                                enum_values=_DISPLAY_PROPERTIES, breakpoint="xs")
+        self._set_enum_property(value=value, prefix="d-", enum_class=DisplayProperty, breakpoint="xs")
 
     @property
     def display_property_sm(self) -> Union[DisplayProperty, None]:
-        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty, enum_values=_DISPLAY_PROPERTIES, breakpoint="sm")
+        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty, breakpoint="sm")
 
     @display_property_sm.setter
     def display_property_sm(self, value: Union[DisplayProperty, None]):
-        self._set_enum_property(value=value, prefix="d-", enum_class=DisplayProperty,
-                                enum_values=_DISPLAY_PROPERTIES, breakpoint="sm")
+        self._set_enum_property(value=value, prefix="d-", enum_class=DisplayProperty, breakpoint="sm")
 
     @property
     def display_property_md(self) -> Union[DisplayProperty, None]:
-        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty, enum_values=_DISPLAY_PROPERTIES, breakpoint="md")
+        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty, breakpoint="md")
 
     @display_property_md.setter
     def display_property_md(self, value: Union[DisplayProperty, None]):
-        self._set_enum_property(value=value, prefix="d-", enum_class=DisplayProperty,
-                                enum_values=_DISPLAY_PROPERTIES, breakpoint="md")
+        self._set_enum_property(value=value, prefix="d-", enum_class=DisplayProperty, breakpoint="md")
 
     @property
     def display_property_lg(self) -> Union[DisplayProperty, None]:
-        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty, enum_values=_DISPLAY_PROPERTIES, breakpoint="lg")
+        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty, breakpoint="lg")
 
     @display_property_lg.setter
     def display_property_lg(self, value: Union[DisplayProperty, None]):
-        self._set_enum_property(value=value, prefix="d-", enum_class=DisplayProperty,
-                                enum_values=_DISPLAY_PROPERTIES, breakpoint="lg")
+        self._set_enum_property(value=value, prefix="d-", enum_class=DisplayProperty, breakpoint="lg")
 
     @property
     def display_property_xl(self) -> Union[DisplayProperty, None]:
-        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty, enum_values=_DISPLAY_PROPERTIES, breakpoint="xl")
+        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty, breakpoint="xl")
 
     @display_property_xl.setter
     def display_property_xl(self, value: Union[DisplayProperty, None]):
-        self._set_enum_property(value=value, prefix="d-", enum_class=DisplayProperty,
-                                enum_values=_DISPLAY_PROPERTIES, breakpoint="xl")
+        self._set_enum_property(value=value, prefix="d-", enum_class=DisplayProperty, breakpoint="xl")
 
     @property
     def display_property_xxl(self) -> Union[DisplayProperty, None]:
-        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty, enum_values=_DISPLAY_PROPERTIES, breakpoint="xxl")
+        return self._get_enum_property(prefix="d-", enum_class=DisplayProperty, breakpoint="xxl")
 
     @display_property_xxl.setter
     def display_property_xxl(self, value: Union[DisplayProperty, None]):
-        self._set_enum_property(value=value, prefix="d-", enum_class=DisplayProperty,
-                                enum_values=_DISPLAY_PROPERTIES, breakpoint="xxl")
+        self._set_enum_property(value=value, prefix="d-", enum_class=DisplayProperty, breakpoint="xxl")
 
     # borders: ----------------------------------------------------------------
 
@@ -686,13 +696,13 @@ class BootstrapContainer(HTML.Div):
         """
         element's border color. Has to be a memeber of the BorderColor enum
         """
-        self._get_enum_property(
-            prefix="border-", enum_class=BorderColor, enum_values=_BORDER_COLORS)
+        return self._get_enum_property(
+            prefix="border-", enum_class=BorderColor)
 
     @border_color.setter
     def border_color(self, value: Union[BorderColor, None]):
         self._set_enum_property(value=value, prefix="border-",
-                                enum_class=BorderColor, enum_values=_BORDER_COLORS)
+                                enum_class=BorderColor)
 
     @property
     def border_width(self) -> Union[int, None]:
@@ -712,72 +722,72 @@ class BootstrapContainer(HTML.Div):
         """
         element's float property. Has to be a member of the Float enum
         """
-        return self._get_enum_property(prefix="float-", enum_class=Float, enum_values=_FLOATS)
+        return self._get_enum_property(prefix="float-", enum_class=Float)
 
     @float.setter
     def float(self, value: Union[Float, None]):
         self._set_enum_property(
-            value=value, prefix="float-", enum_class=Float, enum_values=_FLOATS)
+            value=value, prefix="float-", enum_class=Float)
 
     @property
     def float_sm(self) -> Union[Float, None]:
         """
         element's float property for small screens. Has to be a member of the Float enum
         """
-        return self._get_enum_property(prefix="float-", enum_class=Float, enum_values=_FLOATS, breakpoint="sm")
+        return self._get_enum_property(prefix="float-", enum_class=Float, breakpoint="sm")
 
     @float_sm.setter
     def float_sm(self, value: Union[Float, None]):
         self._set_enum_property(value=value, prefix="float-",
-                                enum_class=Float, enum_values=_FLOATS, breakpoint="sm")
+                                enum_class=Float, breakpoint="sm")
 
     @property
     def float_md(self) -> Union[Float, None]:
         """
         element's float property for medium screens. Has to be a member of the Float enum
         """
-        return self._get_enum_property(prefix="float-", enum_class=Float, enum_values=_FLOATS, breakpoint="md")
+        return self._get_enum_property(prefix="float-", enum_class=Float, breakpoint="md")
 
     @float_md.setter
     def float_md(self, value: Union[Float, None]):
         self._set_enum_property(value=value, prefix="float-",
-                                enum_class=Float, enum_values=_FLOATS, breakpoint="md")
+                                enum_class=Float, breakpoint="md")
 
     @property
     def float_lg(self) -> Union[Float, None]:
         """
         element's float property for large screens. Has to be a member of the Float enum
         """
-        return self._get_enum_property(prefix="float-", enum_class=Float, enum_values=_FLOATS, breakpoint="lg")
+        return self._get_enum_property(prefix="float-", enum_class=Float, breakpoint="lg")
 
     @float_lg.setter
     def float_lg(self, value: Union[Float, None]):
         self._set_enum_property(value=value, prefix="float-",
-                                enum_class=Float, enum_values=_FLOATS, breakpoint="lg")
+                                enum_class=Float, breakpoint="lg")
 
     @property
     def float_xl(self) -> Union[Float, None]:
         """
         element's float property for extra large screens. Has to be a member of the Float enum
         """
-        return self._get_enum_property(prefix="float-", enum_class=Float, enum_values=_FLOATS, breakpoint="xl")
+        return self._get_enum_property(prefix="float-", enum_class=Float, breakpoint="xl")
 
     @float_xl.setter
     def float_xl(self, value: Union[Float, None]):
         self._set_enum_property(value=value, prefix="float-",
-                                enum_class=Float, enum_values=_FLOATS, breakpoint="xl")
+                                enum_class=Float, breakpoint="xl")
 
     @property
     def float_xxl(self) -> Union[Float, None]:
         """
         element's float property for extra extra large screens. Has to be a member of the Float enum
         """
-        return self._get_enum_property(prefix="float-", enum_class=Float, enum_values=_FLOATS, breakpoint="xxl")
+        return self._get_enum_property(prefix="float-", enum_class=Float, breakpoint="xxl")
 
     @float_xxl.setter
     def float_xxl(self, value: Union[Float, None]):
         self._set_enum_property(value=value, prefix="float-",
-                                enum_class=Float, enum_values=_FLOATS, breakpoint="xxl")
+                                enum_class=Float, breakpoint="xxl")
 
     # user select properties: -------------------------------------------------
 
@@ -786,12 +796,12 @@ class BootstrapContainer(HTML.Div):
         """
         element's user select property. Has to be a member of the UserSelect enum
         """
-        return self._get_enum_property(prefix="user-select-", enum_class=UserSelect, enum_values=_USER_SELECTS)
+        return self._get_enum_property(prefix="user-select-", enum_class=UserSelect)
 
     @user_select.setter
     def user_select(self, value: Union[UserSelect, None]):
         self._set_enum_property(value=value, prefix="user-select-",
-                                enum_class=UserSelect, enum_values=_USER_SELECTS)
+                                enum_class=UserSelect)
 
     # pointer events: ---------------------------------------------------------
 
@@ -800,12 +810,12 @@ class BootstrapContainer(HTML.Div):
         """
         element's pointer event property. Has to be a member of the PointerEvent enum
         """
-        return self._get_enum_property(prefix="pe-", enum_class=PointerEvent, enum_values=_POINTER_EVENTS)
+        return self._get_enum_property(prefix="pe-", enum_class=PointerEvent)
 
     @pointer_event.setter
     def pointer_event(self, value: Union[PointerEvent, None]):
         self._set_enum_property(
-            value=value, prefix="pe-", enum_class=PointerEvent, enum_values=_POINTER_EVENTS)
+            value=value, prefix="pe-", enum_class=PointerEvent)
 
     # max width: --------------------------------------------------------------
 
@@ -838,12 +848,12 @@ class BootstrapContainer(HTML.Div):
         """
         element's overflow property. Has to be a member of the Overflow enum
         """
-        return self._get_enum_property(prefix="overflow-", enum_class=Overflow, enum_values=_OVERFLOWS)
+        return self._get_enum_property(prefix="overflow-", enum_class=Overflow)
 
     @overflow.setter
     def overflow(self, value: Union[Overflow, None]):
         self._set_enum_property(
-            value=value, prefix="overflow-", enum_class=Overflow, enum_values=_OVERFLOWS)
+            value=value, prefix="overflow-", enum_class=Overflow)
 
     # position modifiers:------------------------------------------------------
 
@@ -852,12 +862,12 @@ class BootstrapContainer(HTML.Div):
         """
         element's position property. Has to be a member of the Position enum
         """
-        return self._get_enum_property(prefix="", enum_class=Position, enum_values=_POSITIONS)
+        return self._get_enum_property(prefix="", enum_class=Position)
 
     @position.setter
     def position(self, value: Union[Position, None]):
         self._set_enum_property(value=value, prefix="",
-                                enum_class=Position, enum_values=_POSITIONS)
+                                enum_class=Position)
 
     @property
     def position_top(self) -> Union[int, None]:
@@ -1101,7 +1111,7 @@ class BootstrapContainer(HTML.Div):
         """
         toggles the collapsed state of the element
         """
-        self.element.classList.toggle("show")
+        self.set_class("show", not self.has_class("show"))
 
     # shadow classes: ---------------------------------------------------------
 
@@ -1110,13 +1120,13 @@ class BootstrapContainer(HTML.Div):
         """
         element's shadow. Has to be a element of Shadow Enum
         """
-        self._get_enum_property(
-            prefix="", enum_class=Shadow, enum_values=_SHADOWS)
+        return self._get_enum_property(
+            prefix="", enum_class=Shadow)
 
     @shadow.setter
     def shadow(self, value: Union[Shadow, None]):
         self._set_enum_property(value=value, prefix="",
-                                enum_class=Shadow, enum_values=_SHADOWS)
+                                enum_class=Shadow)
 
     # p properties:------------------------------------------------------------
 
@@ -2317,11 +2327,11 @@ class BootstrapContainer(HTML.Div):
         """
         horizontal gutter (gutters are the space between the element and its content) for medium screens. By default, bootstrap defines the values 0,1,2,3,4,5
         """
-        return self._get_css_param_number("gx-", "gd")
+        return self._get_css_param_number("gx-", "md")
 
     @gx_md.setter
     def gx_md(self, value: Union[int, str, None]):
-        self._set_css_param_number("gx-", value, "gd")
+        self._set_css_param_number("gx-", value, "md")
 
     @property
     def gx_lg(self) -> Union[int, str, None]:
@@ -2394,11 +2404,11 @@ class BootstrapContainer(HTML.Div):
         """
         vertical gutter (gutters are the space between the element and its content) for medium screens. By default, bootstrap defines the values 0,1,2,3,4,5
         """
-        return self._get_css_param_number("gy-", "gd")
+        return self._get_css_param_number("gy-", "md")
 
     @gy_md.setter
     def gy_md(self, value: Union[int, str, None]):
-        self._set_css_param_number("gy-", value, "gd")
+        self._set_css_param_number("gy-", value, "md")
 
     @property
     def gy_lg(self) -> Union[int, str, None]:
@@ -2511,6 +2521,175 @@ class BootstrapContainer(HTML.Div):
     @col_xxl.setter
     def col_xxl(self, value: Union[int, str, None]):
         self._set_css_param_number("col-", value, "xxl")
-        
 
 
+# utility tables: ---------------------------------------------------------------
+#
+# property name -> what its setter changes, for BootstrapContainer.utilities
+
+_BREAKPOINTS = ("xs", "sm", "md", "lg", "xl", "xxl")
+
+# property name -> prefix of its number (or 'auto') classes
+_NUMBER_UTILITIES: Dict[str, str] = {
+    "font_size": "fs-",
+    "lh": "lh-",
+    "border_width": "border-",
+    "mw": "mw-",
+    "mh": "mh-",
+    "position_top": "top-",
+    "position_bottom": "bottom-",
+    "position_start": "start-",
+    "position_end": "end-",
+    "rounded_size": "rounded-",
+    "w": "w-",
+    "h": "h-",
+}
+for _name in ("p", "px", "py", "pt", "pb", "ps", "pe",
+              "m", "mx", "my", "mt", "mb", "ms", "me",
+              "g", "gx", "gy", "col"):
+    _NUMBER_UTILITIES[_name] = f"{_name}-"
+    for _breakpoint in _BREAKPOINTS:
+        _NUMBER_UTILITIES[f"{_name}_{_breakpoint}"] = f"{_name}-{_breakpoint}-"
+
+# property name -> (class prefix, enum class)
+_ENUM_UTILITIES: Dict[str, Tuple[str, type]] = {
+    "background_color": ("bg-", BackgroundColor),
+    "text_color": ("text-", TextColor),
+    "text_align": ("text-", TextAlign),
+    "justify_content": ("justify-content-", JustifyContent),
+    "text_decoration": ("text-decoration-", TextDecoration),
+    "vertical_align": ("align-", VerticalAlign),
+    "display_property": ("d-", DisplayProperty),
+    "border_color": ("border-", BorderColor),
+    "float": ("float-", Float),
+    "user_select": ("user-select-", UserSelect),
+    "pointer_event": ("pe-", PointerEvent),
+    "overflow": ("overflow-", Overflow),
+    "position": ("", Position),
+    "shadow": ("", Shadow),
+}
+for _breakpoint in _BREAKPOINTS:
+    _ENUM_UTILITIES[f"text_align_{_breakpoint}"] = (f"text-{_breakpoint}-", TextAlign)
+    _ENUM_UTILITIES[f"display_property_{_breakpoint}"] = (f"d-{_breakpoint}-", DisplayProperty)
+    if _breakpoint != "xs":
+        _ENUM_UTILITIES[f"float_{_breakpoint}"] = (f"float-{_breakpoint}-", Float)
+del _name, _breakpoint
+
+# property name -> the class it switches on and off
+_FLAG_UTILITIES: Dict[str, str] = {
+    "background_gradient": "bg-gradient",
+    "text_nowrap": "text-nowrap",
+    "text_wrap": "text-wrap",
+    "text_break": "text-break",
+    "text_lowercase": "text-lowercase",
+    "text_uppercase": "text-uppercase",
+    "text_capitalize": "text-capitalize",
+    "font_weight_bold": "fw-bold",
+    "font_weight_bolder": "fw-bolder",
+    "font_weight_light": "fw-light",
+    "font_weight_lighter": "fw-lighter",
+    "font_style_italic": "fs-italic",
+    "font_style_normal": "fs-normal",
+    "font_monospace": "font-monospace",
+    "border": "border",
+    "border_top": "border-top",
+    "border_bottom": "border-bottom",
+    "border_start": "border-start",
+    "border_end": "border-end",
+    "translate_middle": "translate-middle",
+    "rounded": "rounded",
+    "rounded_top": "rounded-top",
+    "rounded_bottom": "rounded-bottom",
+    "rounded_start": "rounded-start",
+    "rounded_end": "rounded-end",
+    "rounded_circle": "rounded-circle",
+    "rounded_pill": "rounded-pill",
+    "vw_100": "vw-100",
+    "vh_100": "vh-100",
+    "min_vw_100": "min-vw-100",
+    "min_vh_100": "min-vh-100",
+}
+
+
+# presets: ---------------------------------------------------------------------
+
+# class strings whose result each preset remembers. Elements of a few classes
+# share them, dynamically built class strings must not grow the cache forever
+_PRESET_CACHE_SIZE = 256
+
+
+class Preset(object):
+    """
+    a reusable combination of utilities (the keywords of BootstrapContainer.utilities
+    backed by its tables), e.g.
+
+    CARD = Preset(p=3, shadow=Shadow.LARGE, rounded=True)
+    container.apply_preset(CARD)
+    bHTML.Card(preset=CARD)
+
+    The resulting class string is computed once per class string it is applied
+    to and interned, so applying a preset to many similar elements costs one
+    dictionary lookup and one class assignment each. Only the most recently used
+    class strings are kept
+    """
+
+    __slots__ = ("_utilities", "_tokens", "_replaced_tokens", "_replaced_number_prefixes", "_class_names")
+
+    def __init__(self, **utilities) -> None:
+        self._utilities = utilities
+        # tokens the preset adds
+        self._tokens: Dict[str, None] = {}
+        # tokens and number class prefixes of the utilities the preset sets
+        self._replaced_tokens = set()
+        replaced_number_prefixes = []
+        for name, value in utilities.items():
+            if name in _NUMBER_UTILITIES:
+                prefix = _NUMBER_UTILITIES[name]
+                replaced_number_prefixes.append(prefix)
+                if value is not None:
+                    self._tokens[prefix + str(value)] = None
+            elif name in _ENUM_UTILITIES:
+                prefix, enum_class = _ENUM_UTILITIES[name]
+                self._replaced_tokens.update(_enum_tokens(prefix, enum_class))
+                if value is not None:
+                    self._tokens[prefix + enum_class(value).value] = None
+            elif name in _FLAG_UTILITIES:
+                token = _FLAG_UTILITIES[name]
+                self._replaced_tokens.add(token)
+                if value:
+                    self._tokens[token] = None
+            else:
+                raise TypeError(f"'{name}' is not a utility a preset can set")
+        self._replaced_number_prefixes = tuple(replaced_number_prefixes)
+        # class string applied to -> resulting class string, least recently used first
+        self._class_names: "OrderedDict[str, str]" = OrderedDict()
+
+    @property
+    def utilities(self) -> Dict[str, object]:
+        return dict(self._utilities)
+
+    def _replaces(self, token: str) -> bool:
+        if token in self._replaced_tokens:
+            return True
+        for prefix in self._replaced_number_prefixes:
+            if token.startswith(prefix) and _is_css_param_number(token[len(prefix):]):
+                return True
+        return False
+
+    def class_name_for(self, class_name: str) -> str:
+        """the class string of an element with class_name after applying this preset"""
+        resolved = self._class_names.get(class_name)
+        if resolved is not None:
+            self._class_names.move_to_end(class_name)
+            return resolved
+        tokens = {token: None for token in class_name.split() if not self._replaces(token)}
+        tokens.update(self._tokens)
+        resolved = sys.intern(" ".join(tokens))
+        self._class_names[class_name] = resolved
+        if len(self._class_names) > _PRESET_CACHE_SIZE:
+            self._class_names.popitem(last=False)
+        return resolved
+
+    def __repr__(self) -> str:
+        arguments = ", ".join(f"{name}={value!r}" for name, value in self._utilities.items())
+        return f"Preset({arguments})"
@@ -1,68 +1,82 @@
 import datetime as dt
-import uuid
 
 from .bootstrap_HTML import *
-from js import document, FileReader, btoa, Uint8Array   # type: ignore
-from pyodide.ffi import create_proxy  # type: ignore
+try:
+    from js import document, FileReader, btoa, Uint8Array   # type: ignore
+    from pyodide.ffi import create_once_callable  # type: ignore
+except ImportError:
+    from .headless import document, FileReader, btoa, Uint8Array
+    from .headless import create_once_callable
 import io
 import base64
 
 
 class InputLabel(HTML.Label, BootstrapContainer):
+    __slots__ = ()
     _default_class_name: str = "form-label"
 
 
 class InputLabelCheckbox(InputLabel):
+    __slots__ = ()
     _default_class_name: str = "form-check-label"
 
 
 class InputHelp(BootstrapContainer):
+    __slots__ = ()
     _default_class_name: str = "form-text"
 
 
 class InputFormControl(HTML.Input, BootstrapContainer):
+    __slots__ = ()
     _default_class_name: str = "form-control"
 
 
 class InputFormControlColor(InputFormControl):
+    __slots__ = ()
     _default_class_name: str = "form-control form-control-color"
 
 
 class InputFormControlNumber(InputFormControl):
+    __slots__ = ()
     _default_class_name: str = "form-control"
 
     @property
     def min(self):
-        return self.element.getAttribute("min")
+        return self.get_attribute("min")
 
     @min.setter
     def min(self, value):
-        self.element.setAttribute("min", str(value))
+        self.set_attribute("min", str(value))
 
     @property
     def max(self):
-        return self.element.getAttribute("max")
+        return self.get_attribute("max")
 
     @max.setter
     def max(self, value):
-        self.element.setAttribute("max", str(value))
+        self.set_attribute("max", str(value))
 
 
 class InputFormControlRange(InputFormControl):
+    __slots__ = ()
     _default_class_name: str = "form-range"
 
 
 class InputFormControlSelect(InputFormControl):
+    __slots__ = ()
     _default_class_name: str = "form-select"
     _tag_type: str = "select"
 
 
 class InputFormControlCheckbox(InputFormControl):
+    __slots__ = ()
     _default_class_name: str = "form-check-input"
 
 
 class InputElement(BootstrapContainer):
 
+    __slots__ = ("_help_text", "_input", "_label")
+    _stamped = True
     _default_input_type = "text"
     _default_input_class = InputFormControl
     _default_label_class = InputLabel
@@ -74,8 +88,9 @@ class InputElement(BootstrapContainer):
                  placeholder: str = None,
                  input_type=None,
                  id=None,
-                 parent=None):
-        super().__init__(parent=parent, id=id)
+                 parent=None,
+                 preset: Preset = None):
+        super().__init__(parent=parent, id=id, preset=preset)
 
         if floating_label and placeholder is None:
             placeholder = " "  # create a dummy placeholder
@@ -147,6 +162,13 @@ class InputElement(BootstrapContainer):
     def onchange(self, value):
         self._input.onchange = value
 
+    def set_onchange(self, value, throttle_ms: float = None, debounce_ms: float = None, coalesce: str = None):
+        """like assigning onchange, with the rate limiting options of HTML.Element.add_event_listener"""
+        self._input.set_onchange(value,
+                                 throttle_ms=throttle_ms,
+                                 debounce_ms=debounce_ms,
+                                 coalesce=coalesce)
+
     @property
     def floating_label(self) -> bool:
         return self.has_class("form-floating")
@@ -157,18 +179,22 @@ class InputElement(BootstrapContainer):
 
 
 class InputEmail(InputElement):
+    __slots__ = ()
     _default_input_type = "email"
 
 
 class InputPassword(InputElement):
+    __slots__ = ()
     _default_input_type = "password"
 
 
 class InputText(InputElement):
+    __slots__ = ()
     _default_input_type = "text"
 
 
 class InputFloat(InputElement):
+    __slots__ = ()
     _default_input_type = "number"
     _default_number_class = float
 
@@ -182,14 +208,16 @@ class InputFloat(InputElement):
                  step: _default_number_class = None,
                  input_type=None,
                  id=None,
-                 parent=None):
+                 parent=None,
+                 preset: Preset = None):
         super().__init__(label_text=label_text,
                          help_text=help_text,
                          floating_label=floating_label,
                          placeholder=placeholder,
                          input_type=input_type,
                          id=id,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         if min is not None:
             self.min = min
@@ -237,21 +265,25 @@ class InputFloat(InputElement):
 
 
 class InputRangeFloat(InputFloat):
+    __slots__ = ()
     _default_input_type = "range"
     _default_input_class = InputFormControlRange
 
 
 class InputInt(InputFloat):
 
+    __slots__ = ()
     _default_number_class = int
 
 
 class InputRangeInt(InputInt):
+    __slots__ = ()
     _default_input_type = "range"
     _default_input_class = InputFormControlRange
 
 
 class InputDate(InputElement):
+    __slots__ = ()
     _default_input_type = "date"
 
     @property
@@ -269,6 +301,7 @@ class InputDate(InputElement):
 
 
 class InputTime(InputElement):
+    __slots__ = ()
     _default_input_type = "time"
 
     @property
@@ -286,10 +319,12 @@ class InputTime(InputElement):
 
 
 class InputRange(InputElement):
+    __slots__ = ()
     _default_input_type = "range"
 
 
 class InputFile(InputElement):
+    __slots__ = ("_files", "_on_file_change")
     _default_input_type = "file"
 
     def __init__(self,
@@ -299,7 +334,8 @@ class InputFile(InputElement):
                  placeholder: str = None,
                  input_type=None,
                  id=None,
-                 parent=None):
+                 parent=None,
+                 preset: Preset = None):
         
         super().__init__(label_text=label_text,
                          help_text=help_text,
@@ -307,7 +343,8 @@ class InputFile(InputElement):
                          placeholder=placeholder,
                          input_type=input_type,
                          id=id,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
         
         self._files = {}
         self._input.onchange = self._load_file
@@ -339,8 +376,9 @@ class InputFile(InputElement):
             # reader is a pyodide.JsProxy
             reader = FileReader.new()
     
-            # Create a Python proxy for the callback function
-            onload_event = create_proxy(lambda event, f=f: read_file(event, f))
+            # Create a Python proxy for the callback function. onload fires once,
+            # so the proxy can release itself afterwards
+            onload_event = create_once_callable(lambda event, f=f: read_file(event, f))
     
             reader.onload = onload_event
     
@@ -360,9 +398,22 @@ class InputFile(InputElement):
     def onchange(self, value):
         self._on_file_change = value
 
+    def set_onchange(self, value, throttle_ms: float = None, debounce_ms: float = None, coalesce: str = None):
+        # the input's own change handler loads the files, so only the user callback is rate limited
+        if isinstance(self._on_file_change, HTML.RateLimitedCallback):
+            self._on_file_change.destroy()
+        if value is not None:
+            value = HTML.rate_limited(value,
+                                      throttle_ms=throttle_ms,
+                                      debounce_ms=debounce_ms,
+                                      coalesce=coalesce)
+        self._on_file_change = value
+
 
 class InputMultiFile(InputFile):
 
+    __slots__ = ()
+
     def __init__(self,
                  label_text: str = None,
                  help_text: str = None,
@@ -370,14 +421,16 @@ class InputMultiFile(InputFile):
                  placeholder: str = None,
                  input_type=None,
                  id=None,
-                 parent=None):
+                 parent=None,
+                 preset: Preset = None):
         super().__init__(label_text=label_text,
                          help_text=help_text,
                          floating_label=floating_label,
                          placeholder=placeholder,
                          input_type=input_type,
                          id=id,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
         self._input.set_attribute("multiple", True, is_boolean_attribute=True)
 
     @property
@@ -389,12 +442,19 @@ class InputMultiFile(InputFile):
 
 
 class InputColor(InputElement):
+    __slots__ = ()
     _default_input_type = "color"
     _default_input_class = InputFormControlColor
 
 
+def _create_option(option: str) -> HTML.Option:
+    return HTML.Option(inner_html=option)
+
+
 class InputDatalist(InputElement):
 
+    __slots__ = ("_datalist", "_options")
+
     def __init__(self,
                  options: List[str],
                  label_text: str = None,
@@ -403,14 +463,16 @@ class InputDatalist(InputElement):
                  placeholder: str = None,
                  input_type=None,
                  id=None,
-                 parent=None):
+                 parent=None,
+                 preset: Preset = None):
         super().__init__(label_text=label_text,
                          help_text=help_text,
                          floating_label=floating_label,
                          placeholder=placeholder,
                          input_type=input_type,
                          id=id,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         self._input.type = None
 
@@ -418,8 +480,7 @@ class InputDatalist(InputElement):
 
         self._datalist = HTML.DataList(parent=self, id=self.id+"_datalist")
 
-        for option in options:
-            HTML.Option(inner_html=option, parent=self._datalist)
+        self._datalist.set_children(options, factory=_create_option)
 
         self._input.set_attribute("list", self._datalist.id)
 
@@ -430,14 +491,12 @@ class InputDatalist(InputElement):
     @options.setter
     def options(self, value):
         self._options = value
-        for c in self._datalist.children:
-            c.destroy()
-        for option in self._options:
-            HTML.Option(inner_html=option, parent=self._datalist)
+        self._datalist.set_children(self._options, factory=_create_option)
 
 
 class InputSelect(InputElement):
 
+    __slots__ = ("_options",)
     _default_input_class = InputFormControlSelect
 
     def __init__(self,
@@ -449,14 +508,16 @@ class InputSelect(InputElement):
                  multiple: bool = False,
                  input_type=None,
                  id=None,
-                 parent=None):
+                 parent=None,
+                 preset: Preset = None):
         super().__init__(label_text=label_text,
                          help_text=help_text,
                          floating_label=floating_label,
                          placeholder=placeholder,
                          input_type=input_type,
                          id=id,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         self._input.type = None
 
@@ -464,8 +525,7 @@ class InputSelect(InputElement):
 
         self.multiple = multiple
 
-        for option in options:
-            HTML.Option(inner_html=option, parent=self._input)
+        self._input.set_children(options, factory=_create_option)
 
     @property
     def options(self):
@@ -474,10 +534,7 @@ class InputSelect(InputElement):
     @options.setter
     def options(self, value):
         self._options = value
-        for c in self._input.children:
-            c.destroy()
-        for option in self._options:
-            HTML.Option(inner_html=option, parent=self._input)
+        self._input.set_children(self._options, factory=_create_option)
 
     @property
     def multiple(self):
@@ -490,6 +547,7 @@ class InputSelect(InputElement):
 
 class InputCheckboxSingle(InputElement):
 
+    __slots__ = ()
     _default_class_name: str = "form-check"
     _default_input_type = "checkbox"
     _default_input_class = InputFormControlCheckbox
@@ -503,14 +561,16 @@ class InputCheckboxSingle(InputElement):
                  name: str = None,
                  input_type=None,
                  id=None,
-                 parent=None):
+                 parent=None,
+                 preset: Preset = None):
         super().__init__(label_text=label_text,
                          help_text=help_text,
                          floating_label=floating_label,
                          placeholder=placeholder,
                          input_type=input_type,
                          id=id,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         if name is not None:
             self._input.set_attribute("name", name)
@@ -541,15 +601,18 @@ class InputCheckboxSingle(InputElement):
 
 
 class InputRadioSingle(InputCheckboxSingle):
+    __slots__ = ()
     _default_input_type = "radio"
 
 
 class InputSwitchSingle(InputCheckboxSingle):
+    __slots__ = ()
     _default_class_name: str = "form-check form-switch"
 
 
 class InputCheckboxGroup(BootstrapContainer):
 
+    __slots__ = ("_checkbox_start", "_group_name", "_inline", "_option_checkboxes", "_options")
     _default_input_class = InputCheckboxSingle
 
     def __init__(self,
@@ -560,14 +623,16 @@ class InputCheckboxGroup(BootstrapContainer):
                  group_name: str = None,
                  class_name: str = None,
                  parent: HTML.Element = None,
-                 inner_html: str = None,) -> None:
+                 inner_html: str = None,
+                 preset: Preset = None) -> None:
         super().__init__(inner_html=inner_html,
                          id=id,
                          class_name=class_name,
-                         parent=parent)
+                         parent=parent,
+                         preset=preset)
 
         if group_name is None:
-            group_name = "id-" + str(uuid.uuid4())
+            group_name = HTML.new_id()
         if label_text is not None:
             if isinstance(label_text, str):
                 label_text = HTML.Label(inner_html=label_text, parent=self)
@@ -577,12 +642,32 @@ class InputCheckboxGroup(BootstrapContainer):
         self._options = options
         self._option_checkboxes = {}
         self._group_name = group_name
-
-        for option in options:
-            cb = self.__class__._default_input_class(
-                option, name=group_name, parent=self)
-            cb.inline = inline
-            self._option_checkboxes[option] = cb
+        self._inline = inline
+        # the checkboxes follow the label
+        self._checkbox_start = len(self._children)
+
+        self._set_option_checkboxes(options)
+
+    def _set_option_checkboxes(self, options: List[str]) -> None:
+        def create_checkbox(option):
+            cb = self.__class__._default_input_class(option, name=self._group_name)
+            cb.inline = self._inline
+            return cb
+
+        # one checkbox per distinct option, in place of the previous ones. Children
+        # added before or after them stay where they are
+        options = list(dict.fromkeys(options))
+        if self._option_checkboxes:
+            first_checkbox = next(iter(self._option_checkboxes.values()))
+            start = next(index for index, child in enumerate(self._children) if child is first_checkbox)
+        else:
+            start = min(self._checkbox_start, len(self._children))
+        checkboxes = self.set_children(options,
+                                       factory=create_checkbox,
+                                       start=start,
+                                       stop=start + len(self._option_checkboxes))
+        self._option_checkboxes = dict(zip(options, checkboxes))
+        self._checkbox_start = start
 
     @property
     def options(self):
@@ -591,13 +676,7 @@ class InputCheckboxGroup(BootstrapContainer):
     @options.setter
     def options(self, value):
         self._options = value
-        for c in self._option_checkboxes.values():
-            c.destroy()
-        self._option_checkboxes = {}
-        for option in self._options:
-            cb = self.__class__._default_input_class(
-                option, name=self._group_name, parent=self)
-            self._option_checkboxes[option] = cb
+        self._set_option_checkboxes(self._options)
 
     @property
     def value(self) -> List[str]:
@@ -625,12 +704,14 @@ class InputCheckboxGroup(BootstrapContainer):
 
 
 class InputRadioGroup(InputCheckboxGroup):
+    __slots__ = ()
     _default_input_class = InputRadioSingle
 
 
 class InputSwitchGroup(InputCheckboxGroup):
+    __slots__ = ()
     _default_input_class = InputSwitchSingle
 
 class Form(HTML.Form, BootstrapContainer):
-    pass
+    __slots__ = ()
     # TODO: implement more Form and form validation methods
\ No newline at end of file
@@ -1,34 +1,85 @@
 from . import HTML
 from . import bootstrap_HTML as bHTML
-from js import document # type: ignore
+try:
+    from js import document, setTimeout # type: ignore
+    from pyodide.ffi import create_once_callable # type: ignore
+except ImportError:
+    from .headless import document, setTimeout
+    from .headless import create_once_callable
 
-class PyScriptBootstrapApp(object):
-    def __init__(self, parent_element:str = "pyscript_app"):
-        self._main_div = bHTML.ContainerFluid(id="main")
+# attribute marking a parent element whose content was pre-rendered at build time
+PRERENDERED_ATTRIBUTE = "data-prerendered"
 
-        self._main_div.w = 100
-        self._main_div.vh_100 = True
+class PyScriptBootstrapApp(object):
+    def __init__(self,
+                 parent_element:str = "pyscript_app",
+                 id_prefix: str = None,
+                 event_delegation: bool = False,
+                 hydrate: bool = None,
+                 compile_styles: bool = False,
+                 cache_encoded_images: bool = False):
+        """
+        hydrate: adopt markup pre-rendered into parent_element (see the cli's --prerender)
+        instead of building new nodes. By default this happens if parent_element is
+        marked as pre-rendered
 
-        self._main_div.p = 0
-        self._main_div.m = 0
+        compile_styles: turn styles set through set_style, width, height etc. into
+        generated classes shared by all elements with the same styles, instead of
+        inline styles (see HTML.StyleCompiler)
 
-        self._main_div.col_xs = 12
-        self._main_div.col = 12
+        cache_encoded_images: reuse the encoded data of images whose content was shown
+        before, instead of encoding it again (see HTML.EncodeCache). Worth it for apps
+        that show the same images repeatedly, otherwise it only holds on to memory
+        """
+        if id_prefix is not None:
+            # give this app's generated element ids their own namespace
+            HTML.set_id_allocator(HTML.IdAllocator(prefix=id_prefix))
 
+        if compile_styles:
+            HTML.set_style_compiler(HTML.StyleCompiler())
 
+        if cache_encoded_images:
+            HTML.set_encode_cache(HTML.EncodeCache())
 
         self._parent_element = document.getElementById(parent_element)
-        self._parent_element.appendChild(self._main_div.element)
+
+        if hydrate is None:
+            hydrate = self._parent_element.hasAttribute(PRERENDERED_ATTRIBUTE)
+        if hydrate:
+            HTML.begin_hydration(self._parent_element)
+            # main.py runs synchronously, so this fires once the whole page is built
+            setTimeout(create_once_callable(self._end_hydration), 0)
+
+        self._main_div = bHTML.ContainerFluid(id="main")
+
+        self._main_div.apply(w=100,
+                             vh_100=True,
+                             p=0,
+                             m=0,
+                             col_xs=12,
+                             col=12)
+
+
+
+        if not self._main_div._claim_adopted_place(self._parent_element):
+            self._parent_element.appendChild(self._main_div.element)
+
+        if event_delegation:
+            # one listener per event type on the app root instead of one per element
+            HTML.set_event_delegator(HTML.EventDelegator(self._parent_element))
 
         self._toast_container = bHTML.ToastContainer(parent=self._main_div)
-        self._toast_container.position_end = 0
-        self._toast_container.position_bottom = 0
+        self._toast_container.apply(position_end=0, position_bottom=0)
 
         self._alert_container = bHTML.BootstrapContainer(parent=self._main_div)
-        self._alert_container.position_end = 0
-        self._alert_container.position_bottom = 0
-        self._alert_container.position = bHTML.Position.ABSOLUTE
+        self._alert_container.apply(position_end=0,
+                                    position_bottom=0,
+                                    position=bHTML.Position.ABSOLUTE)
     
+    def _end_hydration(self, *_):
+        HTML.end_hydration()
+        self._parent_element.removeAttribute(PRERENDERED_ATTRIBUTE)
+
     def _alert(self, message: str, alert_class: type):
         return alert_class(message, parent=self._alert_container)
         bHTML.Al
@@ -110,12 +161,20 @@ class PyScriptBootstrapApp(object):
         return self._alert(message, bHTML.AlertDark)
 
 class PyScriptBootstrapDashboard(PyScriptBootstrapApp):
-    def __init__(self, parent_element:str = "pyscript_app", brand_name = "Dashboard"):
+    def __init__(self,
+                 parent_element:str = "pyscript_app",
+                 brand_name = "Dashboard",
+                 id_prefix: str = None,
+                 event_delegation: bool = False,
+                 hydrate: bool = None,
+                 compile_styles: bool = False,
+                 cache_encoded_images: bool = False):
 
-        super().__init__(parent_element)
+        super().__init__(parent_element, id_prefix=id_prefix, event_delegation=event_delegation,
+                         hydrate=hydrate, compile_styles=compile_styles,
+                         cache_encoded_images=cache_encoded_images)
 
         self._sidebar = bHTML.Col(id="sidebar", col=12, col_sm=12, col_md=4, col_lg=3, col_xl=3)
-        self._sidebar.style = {"height": "100vh", "overflow": "auto"}
 
         self._navbar = bHTML.NavbarDark(
             parent=self._main_div,
@@ -124,43 +183,42 @@ class PyScriptBootstrapDashboard(PyScriptBootstrapApp):
             toggle_button_for_target=self.sidebar
         )
 
-        self._navbar.position = bHTML.Position.FIXED_TOP
-        self._navbar.height = "4em"
-        self._navbar.ps = 5
-        self._navbar.pe = 5
-        self._navbar.col = 12
+        self._navbar.apply(position=bHTML.Position.FIXED_TOP,
+                           height="4em",
+                           ps=5,
+                           pe=5,
+                           col=12)
 
         
         top_margin_dummy = bHTML.BootstrapContainer(id="top_margin_dummy", parent=self._main_div)
-        top_margin_dummy.height = "3.5em" # have it slightly less high than navbar
-        top_margin_dummy.width = "100vw"
-        top_margin_dummy.m = 0
-        top_margin_dummy.p = 0
+        top_margin_dummy.apply(height="3.5em", # have it slightly less high than navbar
+                               width="100vw",
+                               m=0,
+                               p=0)
 
 
         row = bHTML.Row(parent=self._main_div)
-        row.w = 100
-
-        row.height = "calc(100vh - 4em)"
-        row.p = 0
-        row.m = 0
-        row.col_xs = 12
-        row.col = 12
-
-
-        row.display_property = bHTML.DisplayProperty.INLINE_FLEX
+        row.apply(w=100,
+                  height="calc(100vh - 4em)",
+                  p=0,
+                  m=0,
+                  col_xs=12,
+                  col=12,
+                  display_property=bHTML.DisplayProperty.INLINE_FLEX)
 
         row.append_child(self.sidebar)
         self._sidebar.add_classes("sidebar")
-        self._sidebar.background_color = bHTML.BackgroundColor.LIGHT
-        self._sidebar.p = 4
-        self._sidebar.g = 2
-        self._sidebar.position = bHTML.Position.STATIC
-        self._sidebar.collapsable = True
-        self._sidebar.mw = 100
-        self._sidebar.height = "calc(100vh - 4em)"
-        self._sidebar.shadow = bHTML.Shadow.LARGE
-        self._sidebar.overflow = bHTML.Overflow.SCROLL
+        self._sidebar.apply(background_color=bHTML.BackgroundColor.LIGHT,
+                            p=4,
+                            g=2,
+                            position=bHTML.Position.STATIC,
+                            collapsable=True,
+                            mw=100,
+                            height="calc(100vh - 4em)",
+                            shadow=bHTML.Shadow.LARGE,
+                            overflow=bHTML.Overflow.SCROLL)
+        # the navbar's toggle button collapses the sidebar from javascript
+        self._sidebar.observe_classes()
         
 
 
@@ -168,10 +226,10 @@ class PyScriptBootstrapDashboard(PyScriptBootstrapApp):
 
         self._main_area = bHTML.Col(id="main_area", parent=row, col=12, col_sm=12, col_md=8, col_lg=9, col_xl=9)
         
-        self._main_area.p = 4
-        self._main_area.overflow = bHTML.Overflow.SCROLL
-        self._main_area.height = "calc(100vh - 4em)"
-        self._main_area.mw = 100
+        self._main_area.apply(p=4,
+                              overflow=bHTML.Overflow.SCROLL,
+                              height="calc(100vh - 4em)",
+                              mw=100)
     
     def show_modal(self):
         self.modal.show()
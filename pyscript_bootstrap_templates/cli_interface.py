@@ -7,6 +7,8 @@ import json
 import shutil
 import datetime as dt
 import pkg_resources
+import subprocess
+import sys
 
 def download_file(url: str, path: pathlib.Path):
     if pathlib.Path(url).exists():
@@ -141,6 +143,23 @@ if ("serviceWorker" in navigator) {
 
 
 
+def prerender_main(root_folder: pathlib.Path, parent_element: str = "pyscript_app") -> str:
+    """
+    render the project's main.py without a browser, in a fresh interpreter so the
+    element ids match the ones of the app's run in the browser.
+    Returns None if main.py cannot run outside the browser
+    """
+    result = subprocess.run([sys.executable, "-m", "pyscript_bootstrap_templates.prerender",
+                             "main.py", "--parent-element", parent_element],
+                            cwd=str(root_folder),
+                            capture_output=True,
+                            text=True)
+    if result.returncode != 0:
+        print(f"could not prerender main.py, leaving {parent_element} empty:\n{result.stderr}")
+        return None
+    return result.stdout
+
+
 def generate_project_files(root_folder: pathlib.Path,
                    title: str,
                    packages: List[str],
@@ -151,6 +170,7 @@ def generate_project_files(root_folder: pathlib.Path,
                    bootstrap_css_url: str = "https://cdn.jsdelivr.net/npm/bootstrap@5.0.2/dist/css/bootstrap.min.css",
                    bootstrap_js_url: str = "https://cdn.jsdelivr.net/npm/bootstrap@5.0.2/dist/js/bootstrap.bundle.min.js",
                    pyscript_bootstrap_templates_wheel_url: str = "https://github.com/antielektron/pyscript_bootstrap_templates/raw/main/dist/pyscript_bootstrap_templates-0.2.0-py3-none-any.whl",
+                   prerender: bool = False,
                    **_):
 
     if paths is None:
@@ -233,11 +253,19 @@ btn.onclick = lambda _: bHTML.AlertSuccess(
     index_html = (root_folder / "index.html")
     main_py = (root_folder / "main.py")
 
-    index_html.write_text(html, encoding="utf-8")
-
     # only create if not existing:
     if not main_py.exists():
         main_py.write_text(py, encoding="utf-8")
+
+    if prerender:
+        # inline the app's markup, so it shows before python has loaded.
+        # The app then hydrates it instead of building it again
+        from pyscript_bootstrap_templates.prerender import inline_prerendered_markup
+        markup = prerender_main(root_folder)
+        if markup is not None:
+            html = inline_prerendered_markup(html, markup)
+
+    index_html.write_text(html, encoding="utf-8")
     
 
 
@@ -320,6 +348,8 @@ def main():
                                     help="the url of the pyscript bootstrap templates wheel file", default="https://github.com/antielektron/pyscript_bootstrap_templates/raw/main/dist/pyscript_bootstrap_templates-0.2.0-py3-none-any.whl")
     argument_parser.add_argument("--pwa-bg-color", type=str, help="background color for pwa configuration", default="#000000")
     argument_parser.add_argument("--pwa-theme-color", type=str, help="theme color for pwa configuration", default="#ffffff")
+    argument_parser.add_argument("--prerender", action="store_true", default=None,
+                                 help="render main.py at build time and inline the markup into index.html")
 
 
 
@@ -337,7 +367,8 @@ def main():
         'bootstrap_js_url': args.bootstrap_js_url,
         'pyscript_bootstrap_templates_wheel_url': args.pyscript_bootstrap_templates_wheel_url,
         'pwa_bg_color': args.pwa_bg_color,
-        'pwa_theme_color': args.pwa_theme_color
+        'pwa_theme_color': args.pwa_theme_color,
+        'prerender': args.prerender
     }
 
 
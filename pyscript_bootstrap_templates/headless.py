@@ -0,0 +1,734 @@
+from typing import Callable, Dict, List, Union
+from html.parser import HTMLParser
+import base64
+import html
+import itertools
+import re
+from .markup import VOID_ELEMENTS, css_property_name, style_declarations
+
+
+# headless DOM: ----------------------------------------------------------------
+#
+# a small stand-in for the parts of the browser's js module (and pyodide.ffi)
+# this package uses. It is imported instead of them when running in plain
+# CPython, so element trees can be built and rendered to HTML strings at build
+# time or on CI, without a browser.
+
+
+# elements whose content is not escaped
+_RAW_TEXT_ELEMENTS = frozenset(("script", "style"))
+
+# attributes that are on if present, whatever their value
+_BOOLEAN_ATTRIBUTES = frozenset((
+    "allowfullscreen", "async", "autofocus", "autoplay", "checked", "controls",
+    "default", "defer", "disabled", "formnovalidate", "hidden", "inert", "ismap",
+    "loop", "multiple", "muted", "nomodule", "novalidate", "open", "readonly",
+    "required", "reversed", "selected",
+))
+
+# js property name -> attribute it reflects
+_REFLECTED_PROPERTIES = {
+    "id": "id",
+    "className": "class",
+    "value": "value",
+    "src": "src",
+    "href": "href",
+    "type": "type",
+    "name": "name",
+    "title": "title",
+    "alt": "alt",
+    "htmlFor": "for",
+    "tabIndex": "tabindex",
+    "placeholder": "placeholder",
+}
+
+# js property name -> boolean attribute it reflects
+_BOOLEAN_PROPERTIES = {
+    "disabled": "disabled",
+    "checked": "checked",
+    "hidden": "hidden",
+    "readOnly": "readonly",
+    "required": "required",
+    "multiple": "multiple",
+    "selected": "selected",
+    "open": "open",
+    "autofocus": "autofocus",
+}
+
+# '[name="value"]', with backslash escapes in the value
+_ATTRIBUTE_VALUE_SELECTOR = re.compile(r'\[([\w-]+)="((?:[^"\\]|\\.)*)"\]')
+
+
+def _js_string(value: object) -> str:
+    """the string javascript makes of a value, e.g. when passed to setAttribute"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+class CSSStyleDeclaration(object):
+    """element.style: css properties by their camelCase js name, plus cssText"""
+
+    def __init__(self) -> None:
+        object.__setattr__(self, "_properties", {})
+
+    def setProperty(self, name: str, value: object) -> None:
+        if value is None or value == "":
+            self._properties.pop(name, None)
+        else:
+            self._properties[name] = str(value)
+
+    def getPropertyValue(self, name: str) -> str:
+        return self._properties.get(name, "")
+
+    def removeProperty(self, name: str) -> str:
+        return self._properties.pop(name, "")
+
+    @property
+    def length(self) -> int:
+        return len(self._properties)
+
+    @property
+    def cssText(self) -> str:
+        return " ".join(f"{name}: {value};" for name, value in self._properties.items())
+
+    @cssText.setter
+    def cssText(self, value: str) -> None:
+        self._properties.clear()
+        for name, property_value in style_declarations(value).items():
+            self.setProperty(name, property_value)
+
+    def __getattr__(self, name: str) -> str:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.getPropertyValue(css_property_name(name))
+
+    def __setattr__(self, name: str, value: object) -> None:
+        if name == "cssText":
+            object.__setattr__(self, name, value)
+        else:
+            self.setProperty(css_property_name(name), value)
+
+
+class Node(object):
+
+    nodeType: int = None
+
+    def __init__(self, owner_document: "Document" = None) -> None:
+        self.parentNode: Union["Node", None] = None
+        self.childNodes: List["Node"] = []
+        self.ownerDocument = owner_document
+
+    @property
+    def parentElement(self) -> Union["HTMLElement", None]:
+        return self.parentNode if isinstance(self.parentNode, HTMLElement) else None
+
+    @property
+    def firstChild(self) -> Union["Node", None]:
+        return self.childNodes[0] if self.childNodes else None
+
+    @property
+    def lastChild(self) -> Union["Node", None]:
+        return self.childNodes[-1] if self.childNodes else None
+
+    @property
+    def children(self) -> List["HTMLElement"]:
+        return [node for node in self.childNodes if isinstance(node, HTMLElement)]
+
+    def _detach(self, node: "Node") -> List["Node"]:
+        """the nodes to insert for node, taken out of their current parent"""
+        if isinstance(node, DocumentFragment):
+            nodes = node.childNodes
+            node.childNodes = []
+        else:
+            if node.parentNode is not None:
+                node.parentNode.childNodes.remove(node)
+            nodes = [node]
+        for child in nodes:
+            child.parentNode = self
+        return nodes
+
+    def appendChild(self, node: "Node") -> "Node":
+        self.childNodes.extend(self._detach(node))
+        return node
+
+    def insertBefore(self, node: "Node", reference: Union["Node", None]) -> "Node":
+        if reference is None:
+            return self.appendChild(node)
+        nodes = self._detach(node)
+        index = self.childNodes.index(reference)
+        self.childNodes[index:index] = nodes
+        return node
+
+    def removeChild(self, node: "Node") -> "Node":
+        self.childNodes.remove(node)
+        node.parentNode = None
+        return node
+
+    def replaceChildren(self, *nodes: "Node") -> None:
+        for child in self.childNodes:
+            child.parentNode = None
+        self.childNodes = []
+        for node in nodes:
+            self.appendChild(node)
+
+    def remove(self) -> None:
+        if self.parentNode is not None:
+            self.parentNode.removeChild(self)
+
+    def contains(self, node: "Node") -> bool:
+        while node is not None:
+            if node is self:
+                return True
+            node = node.parentNode
+        return False
+
+    def _serialize(self, out: List[str]) -> None:
+        for child in self.childNodes:
+            child._serialize(out)
+
+    @property
+    def textContent(self) -> str:
+        return "".join(child.textContent for child in self.childNodes)
+
+    @textContent.setter
+    def textContent(self, value: str) -> None:
+        self.replaceChildren(Text(_js_string(value), self.ownerDocument))
+
+
+class Text(Node):
+
+    nodeType = 3
+
+    def __init__(self, data: str, owner_document: "Document" = None) -> None:
+        super().__init__(owner_document)
+        self.data = data
+
+    @property
+    def textContent(self) -> str:
+        return self.data
+
+    @textContent.setter
+    def textContent(self, value: str) -> None:
+        self.data = value
+
+    def cloneNode(self, deep: bool = False) -> "Text":
+        return Text(self.data, self.ownerDocument)
+
+    def _serialize(self, out: List[str]) -> None:
+        parent = self.parentNode
+        if isinstance(parent, HTMLElement) and parent.tagName.lower() in _RAW_TEXT_ELEMENTS:
+            out.append(self.data)
+        else:
+            out.append(html.escape(self.data, quote=False))
+
+
+class DocumentFragment(Node):
+
+    nodeType = 11
+
+    def cloneNode(self, deep: bool = False) -> "DocumentFragment":
+        fragment = DocumentFragment(self.ownerDocument)
+        if deep:
+            for child in self.childNodes:
+                fragment.appendChild(child.cloneNode(True))
+        return fragment
+
+
+class Event(object):
+
+    def __init__(self, type: str, bubbles: bool = True, **properties) -> None:
+        self.type = type
+        self.bubbles = bubbles
+        self.target = None
+        self.currentTarget = None
+        self.cancelBubble = False
+        self.defaultPrevented = False
+        self.__dict__.update(properties)
+
+    def stopPropagation(self) -> None:
+        self.cancelBubble = True
+
+    def preventDefault(self) -> None:
+        self.defaultPrevented = True
+
+
+class HTMLElement(Node):
+
+    nodeType = 1
+
+    def __init__(self, tag_name: str, owner_document: "Document" = None) -> None:
+        object.__setattr__(self, "tagName", tag_name.upper())
+        object.__setattr__(self, "_attributes", {})
+        object.__setattr__(self, "_style", CSSStyleDeclaration())
+        object.__setattr__(self, "_listeners", {})
+        object.__setattr__(self, "_properties", {})
+        super().__init__(owner_document)
+
+    # attributes:
+
+    def hasAttribute(self, name: str) -> bool:
+        if name == "style":
+            return self._style.length > 0
+        return name.lower() in self._attributes
+
+    def getAttribute(self, name: str) -> Union[str, None]:
+        if name == "style":
+            return self._style.cssText if self._style.length else None
+        return self._attributes.get(name.lower())
+
+    def setAttribute(self, name: str, value: object) -> None:
+        if name == "style":
+            self._style.cssText = _js_string(value)
+        else:
+            self._attributes[name.lower()] = _js_string(value)
+
+    def removeAttribute(self, name: str) -> None:
+        if name == "style":
+            self._style.cssText = ""
+        else:
+            self._attributes.pop(name.lower(), None)
+
+    @property
+    def style(self) -> CSSStyleDeclaration:
+        return self._style
+
+    @property
+    def classList(self) -> List[str]:
+        return self.className.split()
+
+    @property
+    def content(self) -> DocumentFragment:
+        """the inert content of a <template>"""
+        if self.tagName != "TEMPLATE":
+            raise AttributeError("content")
+        if "content" not in self._properties:
+            self._properties["content"] = DocumentFragment(self.ownerDocument)
+        return self._properties["content"]
+
+    @property
+    def innerHTML(self) -> str:
+        out = []
+        Node._serialize(self, out)
+        return "".join(out)
+
+    @innerHTML.setter
+    def innerHTML(self, value: str) -> None:
+        self.replaceChildren(*_parse_fragment(_js_string(value), self.ownerDocument))
+
+    @property
+    def outerHTML(self) -> str:
+        out = []
+        self._serialize(out)
+        return "".join(out)
+
+    def __getattr__(self, name: str) -> object:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in _REFLECTED_PROPERTIES:
+            return self._attributes.get(_REFLECTED_PROPERTIES[name], "")
+        if name in _BOOLEAN_PROPERTIES:
+            return _BOOLEAN_PROPERTIES[name] in self._attributes
+        if name in self._properties:
+            return self._properties[name]
+        raise AttributeError(name)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        if name == "style":
+            self._style.cssText = _js_string(value)
+        elif name in _REFLECTED_PROPERTIES:
+            self._attributes[_REFLECTED_PROPERTIES[name]] = _js_string(value)
+        elif name in _BOOLEAN_PROPERTIES:
+            if value:
+                self._attributes[_BOOLEAN_PROPERTIES[name]] = ""
+            else:
+                self._attributes.pop(_BOOLEAN_PROPERTIES[name], None)
+        elif name in ("parentNode", "childNodes", "ownerDocument") or isinstance(
+                getattr(type(self), name, None), property):
+            object.__setattr__(self, name, value)
+        else:
+            self._properties[name] = value
+
+    # tree:
+
+    def cloneNode(self, deep: bool = False) -> "HTMLElement":
+        clone = HTMLElement(self.tagName.lower(), self.ownerDocument)
+        clone._attributes.update(self._attributes)
+        clone._style.cssText = self._style.cssText
+        if deep:
+            for child in self.childNodes:
+                clone.appendChild(child.cloneNode(True))
+        return clone
+
+    def _iter_elements(self):
+        stack = list(reversed(self.children))
+        while stack:
+            element = stack.pop()
+            yield element
+            stack.extend(reversed(element.children))
+
+    def getElementById(self, id: str) -> Union["HTMLElement", None]:
+        for element in self._iter_elements():
+            if element._attributes.get("id") == id:
+                return element
+        return None
+
+    def querySelectorAll(self, selector: str) -> List["HTMLElement"]:
+        """supports '*', 'tag', '#id', '.class', '[attribute]' and '[attribute="value"]' selectors only"""
+        selector = selector.strip()
+        value_match = _ATTRIBUTE_VALUE_SELECTOR.fullmatch(selector)
+        if value_match is not None:
+            name = value_match.group(1).lower()
+            value = re.sub(r"\\(.)", r"\1", value_match.group(2))
+            match = lambda element: element._attributes.get(name) == value
+        elif selector == "*":
+            match = lambda element: True
+        elif selector.startswith("#"):
+            match = lambda element: element._attributes.get("id") == selector[1:]
+        elif selector.startswith("."):
+            match = lambda element: selector[1:] in element._attributes.get("class", "").split()
+        elif selector.startswith("[") and selector.endswith("]"):
+            match = lambda element: selector[1:-1].lower() in element._attributes
+        else:
+            match = lambda element: element.tagName == selector.upper()
+        return [element for element in self._iter_elements() if match(element)]
+
+    def querySelector(self, selector: str) -> Union["HTMLElement", None]:
+        elements = self.querySelectorAll(selector)
+        return elements[0] if elements else None
+
+    def insertAdjacentHTML(self, position: str, markup: str) -> None:
+        node = DocumentFragment(self.ownerDocument)
+        for child in _parse_fragment(markup, self.ownerDocument):
+            node.appendChild(child)
+        if position == "beforeend":
+            self.appendChild(node)
+        elif position == "afterbegin":
+            self.insertBefore(node, self.firstChild)
+        elif position == "beforebegin":
+            self.parentNode.insertBefore(node, self)
+        elif position == "afterend":
+            index = self.parentNode.childNodes.index(self)
+            following = self.parentNode.childNodes[index + 1:index + 2]
+            self.parentNode.insertBefore(node, following[0] if following else None)
+        else:
+            raise ValueError(f"unknown position '{position}'")
+
+    def getContext(self, context_type: str) -> None:
+        # there is no canvas without a browser
+        return None
+
+    # events:
+
+    def addEventListener(self, event_name: str, listener: Callable, *_) -> None:
+        listeners = self._listeners.setdefault(event_name, [])
+        if listener not in listeners:
+            listeners.append(listener)
+
+    def removeEventListener(self, event_name: str, listener: Callable, *_) -> None:
+        listeners = self._listeners.get(event_name, [])
+        if listener in listeners:
+            listeners.remove(listener)
+
+    def dispatchEvent(self, event: Event) -> bool:
+        event.target = self
+        node = self
+        while node is not None:
+            event.currentTarget = node
+            for listener in list(getattr(node, "_listeners", {}).get(event.type, ())):
+                listener(event)
+            if not event.bubbles or event.cancelBubble:
+                break
+            node = node.parentNode
+        return not event.defaultPrevented
+
+    def click(self) -> None:
+        self.dispatchEvent(Event("click"))
+
+    # serialization:
+
+    def _serialize(self, out: List[str]) -> None:
+        tag = self.tagName.lower()
+        out.append("<" + tag)
+        attributes = dict(self._attributes)
+        if self._style.length:
+            attributes["style"] = self._style.cssText
+        for name, value in attributes.items():
+            if name in _BOOLEAN_ATTRIBUTES and value in ("", name):
+                out.append(" " + name)
+            else:
+                out.append(f' {name}="{html.escape(value, quote=True)}"')
+        out.append(">")
+        if tag in VOID_ELEMENTS:
+            return
+        Node._serialize(self, out)
+        out.append(f"</{tag}>")
+
+
+class _FragmentParser(HTMLParser):
+    """builds nodes from markup, as assigning innerHTML does"""
+
+    def __init__(self, owner_document: "Document") -> None:
+        super().__init__(convert_charrefs=True)
+        self._document = owner_document
+        self.root = DocumentFragment(owner_document)
+        self._open: List[Node] = [self.root]
+
+    def _create(self, tag: str, attributes) -> HTMLElement:
+        element = HTMLElement(tag, self._document)
+        for name, value in attributes:
+            element.setAttribute(name, "" if value is None else value)
+        self._open[-1].appendChild(element)
+        return element
+
+    def handle_starttag(self, tag: str, attributes) -> None:
+        element = self._create(tag, attributes)
+        if tag not in VOID_ELEMENTS:
+            self._open.append(element)
+
+    def handle_startendtag(self, tag: str, attributes) -> None:
+        self._create(tag, attributes)
+
+    def handle_endtag(self, tag: str) -> None:
+        for index in range(len(self._open) - 1, 0, -1):
+            if self._open[index].tagName == tag.upper():
+                del self._open[index:]
+                return
+
+    def handle_data(self, data: str) -> None:
+        self._open[-1].appendChild(Text(data, self._document))
+
+
+def _parse_fragment(markup: str, owner_document: "Document") -> List[Node]:
+    if not markup:
+        return []
+    parser = _FragmentParser(owner_document)
+    parser.feed(markup)
+    parser.close()
+    return list(parser.root.childNodes)
+
+
+class Document(Node):
+
+    nodeType = 9
+
+    def __init__(self) -> None:
+        super().__init__(self)
+        self.documentElement = HTMLElement("html", self)
+        self.head = HTMLElement("head", self)
+        self.body = HTMLElement("body", self)
+        self.documentElement.appendChild(self.head)
+        self.documentElement.appendChild(self.body)
+        self.appendChild(self.documentElement)
+
+    def createElement(self, tag_name: str) -> HTMLElement:
+        return HTMLElement(tag_name, self)
+
+    def createDocumentFragment(self) -> DocumentFragment:
+        return DocumentFragment(self)
+
+    def createTextNode(self, data: str) -> Text:
+        return Text(data, self)
+
+    def importNode(self, node: Node, deep: bool = False) -> Node:
+        return node.cloneNode(deep)
+
+    def getElementById(self, id: str) -> Union[HTMLElement, None]:
+        return self.documentElement.getElementById(id)
+
+    def querySelectorAll(self, selector: str) -> List[HTMLElement]:
+        return self.documentElement.querySelectorAll(selector)
+
+    def querySelector(self, selector: str) -> Union[HTMLElement, None]:
+        return self.documentElement.querySelector(selector)
+
+
+document = Document()
+
+
+# timers: ----------------------------------------------------------------------
+#
+# nothing runs on its own without an event loop. Scheduled callbacks are queued
+# until run_timers() is called
+
+_timer_ids = itertools.count(1)
+_timers: Dict[int, Callable] = {}
+
+
+def setTimeout(callback: Callable, delay_ms: float = 0, *args) -> int:
+    handle = next(_timer_ids)
+    _timers[handle] = lambda: callback(*args)
+    return handle
+
+
+def clearTimeout(handle: int) -> None:
+    _timers.pop(handle, None)
+
+
+def requestAnimationFrame(callback: Callable) -> int:
+    return setTimeout(callback, 0, 0)
+
+
+cancelAnimationFrame = clearTimeout
+
+
+def run_timers() -> int:
+    """run all queued timeouts and animation frames (including ones they schedule), return how many ran"""
+    count = 0
+    while _timers:
+        handle = next(iter(_timers))
+        _timers.pop(handle)()
+        count += 1
+    return count
+
+
+# other js globals: ------------------------------------------------------------
+
+
+class _Constructible(object):
+    """a js class: instances are created with .new(...) as with pyodide"""
+
+    @classmethod
+    def new(cls, *args, **kwargs):
+        return cls(*args, **kwargs)
+
+
+class MutationObserver(_Constructible):
+
+    def __init__(self, callback: Callable) -> None:
+        self._callback = callback
+
+    def observe(self, target: Node, options: object = None) -> None:
+        pass
+
+    def disconnect(self) -> None:
+        pass
+
+
+class CanvasRenderingContext2D(_Constructible):
+    pass
+
+
+class FileReader(_Constructible):
+    pass
+
+
+class Blob(_Constructible):
+
+    def __init__(self, parts: List[object] = (), options: dict = None) -> None:
+        self._data = b"".join(part.encode() if isinstance(part, str) else bytes(part) for part in parts)
+        self.type = (options or {}).get("type", "")
+
+    @property
+    def size(self) -> int:
+        return len(self._data)
+
+
+class URL(object):
+    """object urls are data uris here, there is no blob store to refer to"""
+
+    @staticmethod
+    def createObjectURL(blob: Blob) -> str:
+        return f"data:{blob.type};base64,{base64.b64encode(blob._data).decode('ascii')}"
+
+    @staticmethod
+    def revokeObjectURL(url: str) -> None:
+        pass
+
+
+class ImageData(_Constructible):
+
+    def __init__(self, data: object, width: int, height: int = None) -> None:
+        self.data = data
+        self.width = width
+        self.height = height
+
+
+class Uint8Array(_Constructible):
+
+    def __init__(self, buffer: bytes = b"") -> None:
+        self._buffer = bytes(buffer)
+
+    def __iter__(self):
+        return iter(self._buffer)
+
+
+class Object(object):
+
+    @staticmethod
+    def fromEntries(entries) -> dict:
+        return dict(entries)
+
+
+def btoa(data: str) -> str:
+    return base64.b64encode(data.encode("latin-1")).decode("ascii")
+
+
+class _BootstrapComponent(_Constructible):
+    """bootstrap's js components only animate things in the browser"""
+
+    def __init__(self, element: HTMLElement, options: object = None) -> None:
+        self._element = element
+
+    def show(self) -> None:
+        pass
+
+    def hide(self) -> None:
+        pass
+
+    def toggle(self) -> None:
+        pass
+
+    def dispose(self) -> None:
+        pass
+
+
+class _Bootstrap(object):
+    Modal = type("Modal", (_BootstrapComponent,), {})
+    Toast = type("Toast", (_BootstrapComponent,), {})
+    Offcanvas = type("Offcanvas", (_BootstrapComponent,), {})
+    Collapse = type("Collapse", (_BootstrapComponent,), {})
+    Tooltip = type("Tooltip", (_BootstrapComponent,), {})
+
+
+bootstrap = _Bootstrap()
+
+
+# pyodide.ffi: -----------------------------------------------------------------
+
+
+class _Proxy(object):
+
+    def __init__(self, function: Callable) -> None:
+        self._function = function
+
+    def __call__(self, *args, **kwargs):
+        if self._function is None:
+            raise RuntimeError("called a destroyed proxy")
+        return self._function(*args, **kwargs)
+
+    def destroy(self) -> None:
+        self._function = None
+
+
+def create_proxy(function: Callable) -> _Proxy:
+    return _Proxy(function)
+
+
+def create_once_callable(function: Callable) -> _Proxy:
+    proxy = _Proxy(None)
+
+    def call_once(*args, **kwargs):
+        proxy.destroy()
+        return function(*args, **kwargs)
+
+    proxy._function = call_once
+    return proxy
+
+
+def to_js(value: object, dict_converter: Callable = None, **_) -> object:
+    if isinstance(value, dict) and dict_converter is not None:
+        return dict_converter(value.items())
+    return value
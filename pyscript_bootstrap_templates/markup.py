@@ -0,0 +1,40 @@
+from typing import Dict
+from functools import lru_cache
+import re
+
+
+# html and css syntax: ---------------------------------------------------------
+#
+# shared by the element wrappers (HTML), which generate markup and styles
+# themselves in places, and the headless DOM, so both follow the same rules.
+
+
+# elements without closing tag
+VOID_ELEMENTS = frozenset((
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+))
+
+# a ';' between css declarations, not one inside parentheses like url(...)
+DECLARATION_SEPARATOR = re.compile(r";(?![^(]*\))")
+
+
+@lru_cache(maxsize=None)
+def css_property_name(property_name: str) -> str:
+    """translate a js style property name ('backgroundColor') into its css name ('background-color')"""
+    if property_name.startswith("--"):
+        return property_name
+    return re.sub(r"([A-Z])", r"-\1", property_name).lower()
+
+
+def style_declarations(css_text: str) -> Dict[str, str]:
+    """
+    css property name -> value of the declarations of a cssText. As in browsers,
+    declarations without a value are dropped
+    """
+    declarations = {}
+    for declaration in DECLARATION_SEPARATOR.split(css_text or ""):
+        name, _, value = declaration.partition(":")
+        if name.strip() and value.strip():
+            declarations[name.strip()] = value.strip()
+    return declarations
@@ -0,0 +1,66 @@
+
+import argparse
+import contextlib
+import pathlib
+import runpy
+import sys
+
+from . import headless
+from . import HTML
+from .bootstrap_templates import PRERENDERED_ATTRIBUTE
+
+
+def render_main(main_py: pathlib.Path, parent_element: str = "pyscript_app") -> str:
+    """
+    run a project's main.py against the headless DOM and return the markup it
+    builds inside parent_element.
+
+    Element ids are handed out in creation order, so running this in a fresh
+    interpreter gives the same ids as the app's first run in the browser,
+    which is what lets the app hydrate the markup instead of rebuilding it
+    """
+    container = headless.document.createElement("div")
+    container.id = parent_element
+    headless.document.body.appendChild(container)
+
+    main_py = pathlib.Path(main_py).resolve()
+    sys.path.insert(0, str(main_py.parent))
+    # keep prints of main.py out of the rendered markup
+    with contextlib.redirect_stdout(sys.stderr):
+        runpy.run_path(str(main_py), run_name="__main__")
+
+    markup = container.innerHTML
+    compiler = HTML.get_style_compiler()
+    if compiler is not None and compiler.css_text:
+        # the generated style classes have to work before python has run
+        markup = f"<style>{compiler.css_text}</style>" + markup
+    return markup
+
+
+def inline_prerendered_markup(index_html: str, markup: str, parent_element: str = "pyscript_app") -> str:
+    """put markup into the (empty) parent element of an index.html and mark it for hydration"""
+    opening_tag = f'<div id="{parent_element}"'
+    start = index_html.index(opening_tag)
+    end = index_html.index(">", start) + 1
+    closing = index_html.index("</div>", end)
+    return (index_html[:start]
+            + index_html[start:end - 1] + f' {PRERENDERED_ATTRIBUTE}="true">'
+            + markup
+            + index_html[closing:])
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(
+        description="render a project's main.py to html, without a browser")
+    argument_parser.add_argument("main_py", type=pathlib.Path, help="the main.py to render")
+    argument_parser.add_argument("--parent-element", type=str, default="pyscript_app",
+                                 help="id of the element the app is built in")
+
+    args = argument_parser.parse_args()
+
+    sys.stdout.write(render_main(args.main_py, args.parent_element))
+
+
+if __name__ == "__main__":
+    main()
+    exit(0)
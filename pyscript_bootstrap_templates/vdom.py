@@ -0,0 +1,177 @@
+from typing import Dict, Iterable, List, Union
+from . import HTML
+
+
+# virtual element trees: -------------------------------------------------------
+#
+# a render function returns a tree of VNodes instead of building elements. A
+# VDomRoot keeps the previously rendered tree and patches the real elements
+# so they match the new one, instead of destroying and rebuilding them.
+
+
+class VNode(object):
+    """
+    description of an element to render.
+
+    element_class is any HTML.Element subclass. init holds constructor arguments
+    (changing them recreates the element), class_name holds classes added on top of
+    the element class' default classes, attributes and style are set with
+    set_attribute/set_style and the remaining keyword arguments are assigned as
+    properties (e.g. onclick=..., value=..., col_md=...).
+
+    Children with a key are matched by key between renders, all others by position
+    """
+
+    def __init__(self,
+                 element_class: type,
+                 *children: "VNode",
+                 key: object = None,
+                 id: str = None,
+                 init: Dict[str, object] = None,
+                 class_name: str = None,
+                 attributes: Dict[str, object] = None,
+                 style: Dict[str, str] = None,
+                 inner_html: str = None,
+                 **props) -> None:
+        children = [child for child in children if child is not None]
+        if inner_html is not None and children:
+            raise ValueError("a VNode cannot have inner_html and children")
+        self.element_class = element_class
+        self.children: List["VNode"] = children
+        self.key = key
+        self.id = id
+        self.init = init or {}
+        self.classes = class_name.split() if class_name else []
+        self.attributes = attributes or {}
+        self.style = style or {}
+        self.inner_html = inner_html
+        self.props = props
+        # the element this node is rendered to, set once mounted
+        self.element: HTML.Element = None
+
+    def _same_kind(self, other: "VNode") -> bool:
+        return (self.element_class is other.element_class
+                and self.id == other.id
+                and self.init == other.init)
+
+    def __repr__(self) -> str:
+        return f"VNode({self.element_class.__name__}, key={self.key!r}, children={len(self.children)})"
+
+
+def _as_list(nodes: Union[VNode, Iterable[VNode], None]) -> List[VNode]:
+    if nodes is None:
+        return []
+    if isinstance(nodes, VNode):
+        return [nodes]
+    return [node for node in nodes if node is not None]
+
+
+def _match_key(node: VNode, index: int) -> object:
+    return ("key", node.key) if node.key is not None else ("index", index)
+
+
+def _create(node: VNode) -> HTML.Element:
+    element = node.element_class(id=node.id, **node.init)
+    node.element = element
+    with element.batch():
+        if node.classes:
+            element.add_classes(*node.classes)
+        for name, value in node.attributes.items():
+            element.set_attribute(name, value)
+        for name, value in node.style.items():
+            element.set_style(name, value)
+    for name, value in node.props.items():
+        setattr(element, name, value)
+    if node.inner_html is not None:
+        element.inner_html = node.inner_html
+    _reconcile_children(element, [], node.children)
+    return element
+
+
+def _patch(old: VNode, new: VNode) -> None:
+    element = old.element
+    new.element = element
+    with element.batch():
+        removed_classes = [token for token in old.classes if token not in new.classes]
+        if removed_classes:
+            element.remove_classes(*removed_classes)
+        if new.classes != old.classes:
+            element.add_classes(*new.classes)
+
+        for name in old.attributes.keys() - new.attributes.keys():
+            element.remove_attribute(name)
+        for name, value in new.attributes.items():
+            if name not in old.attributes or old.attributes[name] != value:
+                element.set_attribute(name, value)
+
+        for name in old.style.keys() - new.style.keys():
+            element.remove_style(name)
+        for name, value in new.style.items():
+            if name not in old.style or old.style[name] != value:
+                element.set_style(name, value)
+
+    for name in old.props.keys() - new.props.keys():
+        setattr(element, name, None)
+    for name, value in new.props.items():
+        if name not in old.props or old.props[name] != value:
+            setattr(element, name, value)
+
+    if new.inner_html is not None:
+        if old.children:
+            # the inner html replaces the rendered children, which are destroyed with their listeners
+            element._place_children([], start=len(element.children) - len(old.children))
+            old.children = []
+        if new.inner_html != old.inner_html:
+            element.inner_html = new.inner_html
+    elif old.inner_html is not None:
+        element.inner_html = ""
+    _reconcile_children(element, old.children, new.children)
+
+
+def _reconcile_children(parent: HTML.Element, old_nodes: List[VNode], new_nodes: List[VNode]) -> List[VNode]:
+    """
+    patch the elements of old_nodes into those of new_nodes. The rendered children are
+    kept after the children the parent's element class creates itself
+    """
+    # rendered children sit at the end of parent's children
+    offset = len(parent.children) - len(old_nodes)
+    old_by_key = {_match_key(node, index): node for index, node in enumerate(old_nodes)}
+    seen = set()
+    for index, node in enumerate(new_nodes):
+        key = _match_key(node, index)
+        if key in seen:
+            raise ValueError(f"duplicate key {node.key!r}")
+        seen.add(key)
+        old = old_by_key.pop(key, None)
+        if old is not None and old._same_kind(node):
+            _patch(old, node)
+        else:
+            _create(node)
+    # destroys the elements of stale nodes and moves as few elements as possible
+    parent._place_children([node.element for node in new_nodes], start=offset)
+    return new_nodes
+
+
+class VDomRoot(object):
+    """
+    renders VNode trees into container. Each render patches the elements of the
+    previous render instead of rebuilding them, so only changed nodes touch the DOM
+    """
+
+    def __init__(self, container: HTML.Element) -> None:
+        self._container = container
+        self._tree: List[VNode] = []
+
+    @property
+    def container(self) -> HTML.Element:
+        return self._container
+
+    @property
+    def tree(self) -> List[VNode]:
+        return self._tree
+
+    def render(self, nodes: Union[VNode, Iterable[VNode], None]) -> None:
+        self._tree = _reconcile_children(self._container, self._tree, _as_list(nodes))
+
+    def clear(self) -> None:
+        self.render(None)
@@ -42,7 +42,6 @@ setup(
 
     install_requires=[
         "pillow",
-        "parse",
     ],
 
     entry_points={
@@ -0,0 +1,36 @@
+from pyscript_bootstrap_templates import HTML
+
+
+def test_empty_style_value_in_batch_removes_the_property():
+    element = HTML.Div()
+    element.set_style("color", "red")
+    element.element
+    with element.batch():
+        element.set_style("display", "none")
+    assert element.element.style.display == "none"
+
+    with element.batch():
+        element.set_style("display", "none")
+        element.set_style("display", "")
+
+    assert element.element.style.display == ""
+    assert "display" not in element.element.style.cssText
+    assert element.element.style.color == "red"
+
+
+def test_show_restores_display_inside_apply():
+    element = HTML.Div()
+    element.element
+    element.hide()
+    element.apply(style={"display": ""})
+    assert element.element.style.display == ""
+
+
+def test_batched_styles_are_merged_into_existing_ones():
+    element = HTML.Div()
+    element.element
+    element.set_style("backgroundImage", "url(a;b.png)")
+    with element.batch():
+        element.set_style("color", "red")
+        element.set_style("color", "blue")
+    assert element.element.style.cssText == "background-image: url(a;b.png); color: blue;"
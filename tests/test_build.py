@@ -0,0 +1,65 @@
+from pyscript_bootstrap_templates import HTML, headless
+
+
+def _spec():
+    return [
+        (HTML.Ul, {"class_name": "list"}, [
+            (HTML.Li, {"inner_html": f"item <b>{i}</b>"}, [(HTML.Span, {"class_name": 'quoted"class'})])
+            for i in range(3)
+        ]),
+        (HTML.Input, {}),
+        (HTML.P, {"inner_html": "text"}),
+    ]
+
+
+def _with_ids(build):
+    previous = HTML.get_id_allocator()
+    HTML.set_id_allocator(HTML.IdAllocator(prefix="spec-"))
+    try:
+        return build()
+    finally:
+        HTML.set_id_allocator(previous)
+
+
+def test_build_inserts_the_same_markup_as_appending():
+    def build():
+        root = HTML.Div(id="spec-root")
+        root.element
+        root.build(_spec())
+        return root
+
+    def append():
+        root = HTML.Div(id="spec-root")
+        root.element
+        root.append_children(HTML.from_spec(_spec()))
+        return root
+
+    built = _with_ids(build)
+    appended = _with_ids(append)
+
+    assert built.to_html() == appended.to_html()
+
+
+def test_built_elements_bind_to_the_inserted_nodes():
+    root = HTML.Div()
+    headless.document.body.appendChild(root.element)
+    ul, input_element, p = root.build(_spec())
+    span = ul.children[1].children[0]
+
+    span.add_class("active")
+    clicked = []
+    p.add_event_listener("click", clicked.append)
+    p.element.click()
+
+    assert span.element is root.element.querySelector(f'[id="{span.id}"]')
+    assert "active" in span.element.className.split()
+    assert len(clicked) == 1
+    assert ul.children[1].element.parentNode is ul.element
+    root.element.remove()
+
+
+def test_from_spec_without_parent_returns_unattached_elements():
+    div = HTML.from_spec((HTML.Div, {}, [(HTML.P,)]))
+
+    assert div.parent is None
+    assert len(div.children) == 1 and div.children[0].parent is div
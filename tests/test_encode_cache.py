@@ -0,0 +1,35 @@
+import numpy as np
+
+from pyscript_bootstrap_templates import HTML
+
+
+def test_content_is_not_hashed_without_encode_cache(monkeypatch):
+    hashed = []
+    monkeypatch.setattr(HTML, "content_hash", lambda *parts: hashed.append(parts))
+    previous = HTML.get_encode_cache()
+    HTML.set_encode_cache(None)
+    try:
+        HTML.Image.from_numpy_array(np.zeros((4, 4, 3), dtype=np.uint8))
+        HTML.Image.from_bytes(b"not really a png")
+    finally:
+        HTML.set_encode_cache(previous)
+
+    assert hashed == []
+
+
+def test_equal_arrays_share_the_cached_url():
+    cache = HTML.EncodeCache()
+    previous = HTML.get_encode_cache()
+    HTML.set_encode_cache(cache)
+    try:
+        first = HTML.Image.from_numpy_array(np.zeros((4, 4, 3), dtype=np.uint8))
+        second = HTML.Image.from_numpy_array(np.zeros((4, 4, 3), dtype=np.uint8))
+    finally:
+        HTML.set_encode_cache(previous)
+
+    assert first.src == second.src
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_encode_cache_is_off_by_default():
+    assert HTML.get_encode_cache() is None
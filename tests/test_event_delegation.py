@@ -0,0 +1,53 @@
+from pyscript_bootstrap_templates import HTML, headless
+
+
+def test_delegated_listeners_share_one_root_listener():
+    root = HTML.Div()
+    HTML.set_event_delegator(HTML.EventDelegator(root.element))
+    try:
+        clicked = []
+        buttons = [HTML.Button(parent=root) for _ in range(3)]
+        for i, button in enumerate(buttons):
+            button.add_event_listener("click", lambda event, i=i: clicked.append(i))
+
+        buttons[2].element.click()
+        buttons[0].element.click()
+
+        assert clicked == [2, 0]
+        assert all(proxy is None for button in buttons for _, _, proxy in button._listeners["click"])
+        assert len(HTML.get_event_delegator()._proxies) == 1
+    finally:
+        HTML.set_event_delegator(None)
+
+
+def test_delegated_events_bubble_through_ancestors_until_stopped():
+    root = HTML.Div()
+    HTML.set_event_delegator(HTML.EventDelegator(root.element))
+    try:
+        outer = HTML.Div(parent=root)
+        inner = HTML.Span(parent=outer)
+        calls = []
+        outer.add_event_listener("click", lambda event: calls.append("outer"))
+        inner.add_event_listener("click", lambda event: calls.append("inner"))
+
+        inner.element.click()
+        inner.add_event_listener("click", lambda event: event.stopPropagation())
+        inner.element.click()
+    finally:
+        HTML.set_event_delegator(None)
+
+    assert calls == ["inner", "outer", "inner"]
+
+
+def test_non_bubbling_events_are_listened_to_directly():
+    root = HTML.Div()
+    HTML.set_event_delegator(HTML.EventDelegator(root.element))
+    try:
+        input_element = HTML.Input(parent=root)
+        focused = []
+        input_element.add_event_listener("focus", focused.append)
+        input_element.element.dispatchEvent(headless.Event("focus"))
+    finally:
+        HTML.set_event_delegator(None)
+
+    assert len(focused) == 1
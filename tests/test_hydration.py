@@ -0,0 +1,51 @@
+from pyscript_bootstrap_templates import HTML, headless
+from pyscript_bootstrap_templates import bootstrap_HTML as bHTML
+from pyscript_bootstrap_templates.bootstrap_templates import PRERENDERED_ATTRIBUTE, PyScriptBootstrapApp
+
+
+def _app_root(markup: str = None):
+    root = headless.document.createElement("div")
+    root.id = "hydration_app"
+    if markup is not None:
+        root.setAttribute(PRERENDERED_ATTRIBUTE, "true")
+        root.innerHTML = markup
+    headless.document.body.appendChild(root)
+    return root
+
+
+def _build(app: PyScriptBootstrapApp) -> list:
+    card = bHTML.Card(card_body=HTML.Div(inner_html="body"), parent=app.main)
+    button = bHTML.ButtonPrimary("click", parent=app.main)
+    return [card, button]
+
+
+def test_hydration_adopts_prerendered_nodes():
+    previous = HTML.get_id_allocator()
+    try:
+        # what the prerender step builds at build time
+        HTML.set_id_allocator(HTML.IdAllocator(prefix="hydrated-"))
+        root = _app_root()
+        _build(PyScriptBootstrapApp("hydration_app"))
+        markup = root.innerHTML
+        root.remove()
+
+        # the same code in the browser, with the markup in place
+        HTML.set_id_allocator(HTML.IdAllocator(prefix="hydrated-"))
+        root = _app_root(markup)
+        prerendered = {node.id: node for node in root.querySelectorAll("[id]")}
+        widgets = _build(PyScriptBootstrapApp("hydration_app"))
+        headless.run_timers()
+    finally:
+        HTML.set_id_allocator(previous)
+
+    assert not HTML.is_hydrating()
+    assert not root.hasAttribute(PRERENDERED_ATTRIBUTE)
+    for widget in widgets:
+        assert widget.element is prerendered[widget.id]
+    assert root.innerHTML == markup
+
+    clicked = []
+    widgets[1].add_event_listener("click", clicked.append)
+    prerendered[widgets[1].id].click()
+    assert len(clicked) == 1
+    root.remove()
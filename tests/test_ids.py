@@ -0,0 +1,37 @@
+import gc
+
+from pyscript_bootstrap_templates import HTML
+
+
+def test_ids_are_allocated_in_order():
+    previous = HTML.get_id_allocator()
+    HTML.set_id_allocator(HTML.IdAllocator(prefix="app-", start=5))
+    try:
+        first, second = HTML.Div(), HTML.Span()
+        explicit = HTML.Div(id="explicit")
+        third = HTML.Div()
+    finally:
+        HTML.set_id_allocator(previous)
+
+    assert [first.id, second.id, explicit.id, third.id] == ["app-5", "app-6", "explicit", "app-7"]
+
+
+def test_elements_are_registered_by_id_until_released():
+    div = HTML.Div()
+    element_id = div.id
+    assert HTML._element_registry[element_id] is div
+
+    del div
+    gc.collect()
+
+    assert element_id not in HTML._element_registry
+
+
+def test_destroyed_elements_are_unregistered():
+    parent = HTML.Div()
+    child = HTML.Span(parent=parent)
+
+    parent.destroy()
+
+    assert parent.id not in HTML._element_registry
+    assert child.id not in HTML._element_registry
@@ -0,0 +1,23 @@
+import numpy as np
+from PIL import Image as PILImage
+
+from pyscript_bootstrap_templates import HTML
+
+
+def _megapixel_image():
+    return PILImage.fromarray(np.zeros((1000, 1000, 3), dtype=np.uint8))
+
+
+def test_auto_encoder_stays_lossless_by_default():
+    # png is expected to take longer than 20ms for a megapixel, jpeg and bmp not
+    encoder = HTML.AutoEncoder(latency_budget_ms=20)
+    data, mime_type = encoder.encode(_megapixel_image())
+
+    assert mime_type == "image/bmp"
+
+
+def test_auto_encoder_uses_jpeg_only_with_a_quality():
+    encoder = HTML.AutoEncoder(latency_budget_ms=20, jpeg_quality=90)
+    data, mime_type = encoder.encode(_megapixel_image())
+
+    assert mime_type == "image/jpeg"
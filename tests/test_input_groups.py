@@ -0,0 +1,36 @@
+from pyscript_bootstrap_templates import HTML
+from pyscript_bootstrap_templates import bootstrap_inputs as bInputs
+
+
+def _labels(group):
+    return [checkbox.element.textContent for checkbox in group.option_checkboxes.values()]
+
+
+def test_changing_options_keeps_other_children():
+    group = bInputs.InputCheckboxGroup(["a", "b"], label_text="pick")
+    label = group.children[0]
+    note = HTML.Small(inner_html="note", parent=group)
+    a = group.option_checkboxes["a"]
+
+    group.options = ["c", "a", "d"]
+
+    assert group.children[0] is label
+    assert group.children[-1] is note
+    assert group.option_checkboxes["a"] is a
+    assert group.children[1:-1] == list(group.option_checkboxes.values())
+    assert _labels(group) == ["c", "a", "d"]
+    assert [node for node in group.element.childNodes] == [child.element for child in group.children]
+
+    group.options = []
+    group.options = ["e"]
+
+    assert group.children[0] is label and group.children[-1] is note
+    assert _labels(group) == ["e"]
+
+
+def test_changed_options_keep_inline():
+    group = bInputs.InputCheckboxGroup(["a"], inline=True)
+
+    group.options = ["a", "b"]
+
+    assert all(checkbox.inline for checkbox in group.option_checkboxes.values())
@@ -0,0 +1,33 @@
+from pyscript_bootstrap_templates import HTML
+
+
+def test_detached_trees_create_no_nodes():
+    parent = HTML.Div()
+    child = HTML.Span(parent=parent)
+    child.add_class("a")
+    child.set_style("color", "red")
+
+    assert parent._element is None and child._element is None
+
+
+def test_accessing_the_node_creates_the_subtree():
+    parent = HTML.Div()
+    child = HTML.Span(parent=parent, inner_html="text")
+    child.add_class("a")
+
+    node = parent.element
+
+    assert node.childNodes[0] is child._element
+    assert child._element.className == "a"
+    assert child._element.textContent == "text"
+
+
+def test_children_of_elements_with_a_node_get_one():
+    # even if the parent's node is not in the document yet
+    parent = HTML.Div()
+    parent.element
+
+    child = HTML.Span(parent=parent)
+
+    assert child._element is not None
+    assert parent.element.childNodes[0] is child._element
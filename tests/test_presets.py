@@ -0,0 +1,37 @@
+from pyscript_bootstrap_templates import bootstrap_HTML as bHTML
+from pyscript_bootstrap_templates import bootstrap_HTML_container as bContainer
+from pyscript_bootstrap_templates import bootstrap_inputs as bInputs
+
+CARD = bHTML.Preset(p=3, shadow=bHTML.Shadow.LARGE, rounded=True)
+
+
+def test_containers_take_a_preset_keyword():
+    card = bHTML.Card(card_body=bHTML.Div(), preset=CARD)
+    button = bHTML.ButtonPrimary("x", preset=CARD)
+
+    assert card.class_name == "card p-3 shadow-lg rounded"
+    assert button.class_name == "btn btn-primary p-3 shadow-lg rounded"
+    assert type(bHTML.Card) is type
+
+
+def test_stamped_widgets_keep_their_preset():
+    inputs = [bInputs.InputText(label_text=str(i), preset=CARD if i % 2 else None) for i in range(6)]
+
+    for i, input_element in enumerate(inputs):
+        assert input_element.has_class("shadow-lg") == bool(i % 2)
+        assert input_element.element.className == input_element.class_name
+
+
+def test_preset_replaces_utilities_of_the_same_kind():
+    div = bHTML.Div(class_name="container p-1 shadow-sm", preset=CARD)
+
+    assert div.class_name == "container p-3 shadow-lg rounded"
+
+
+def test_cached_class_strings_are_bounded():
+    preset = bHTML.Preset(p=2)
+    for i in range(bContainer._PRESET_CACHE_SIZE + 10):
+        preset.class_name_for(f"dynamic-{i}")
+
+    assert len(preset._class_names) == bContainer._PRESET_CACHE_SIZE
+    assert preset.class_name_for("dynamic-0") == "dynamic-0 p-2"
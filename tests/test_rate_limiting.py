@@ -0,0 +1,69 @@
+import pytest
+
+from pyscript_bootstrap_templates import HTML, headless
+
+
+def test_debounce_runs_once_with_the_last_event():
+    calls = []
+    callback = HTML.rate_limited(calls.append, debounce_ms=50)
+
+    for event in range(5):
+        callback(event)
+    assert calls == []
+    headless.run_timers()
+
+    assert calls == [4]
+
+
+def test_throttle_runs_first_and_last_call_of_a_burst():
+    calls = []
+    callback = HTML.rate_limited(calls.append, throttle_ms=10_000)
+
+    for event in range(5):
+        callback(event)
+    assert calls == [0]
+    headless.run_timers()
+
+    assert calls == [0, 4]
+
+
+def test_animation_frame_coalescing():
+    calls = []
+    callback = HTML.rate_limited(calls.append, coalesce="animation_frame")
+
+    callback("a")
+    callback("b")
+    headless.run_timers()
+    callback("c")
+    headless.run_timers()
+
+    assert calls == ["b", "c"]
+
+
+def test_destroy_cancels_scheduled_calls():
+    calls = []
+    callback = HTML.rate_limited(calls.append, debounce_ms=50)
+
+    callback("a")
+    callback.destroy()
+    headless.run_timers()
+
+    assert calls == []
+
+
+def test_options_cannot_be_combined():
+    with pytest.raises(ValueError):
+        HTML.rate_limited(print, throttle_ms=10, debounce_ms=10)
+    assert HTML.rate_limited(print) is print
+
+
+def test_listener_options_are_applied():
+    button = HTML.Button()
+    calls = []
+    button.add_event_listener("click", calls.append, debounce_ms=50)
+
+    button.element.click()
+    button.element.click()
+    headless.run_timers()
+
+    assert len(calls) == 1
@@ -0,0 +1,76 @@
+import itertools
+
+from pyscript_bootstrap_templates import HTML
+
+
+def _item(value):
+    return HTML.Li(inner_html=str(value))
+
+
+def _node_texts(element):
+    return [node.textContent for node in element.element.childNodes]
+
+
+def test_every_permutation_reuses_and_orders_the_children():
+    for before, after in itertools.product(itertools.permutations([1, 2, 3, 4]), repeat=2):
+        ul = HTML.Ul()
+        ul.element
+        created = ul.set_children(before, factory=_item)
+        by_value = dict(zip(before, created))
+
+        children = ul.set_children(after, factory=_item)
+
+        assert children == [by_value[value] for value in after]
+        assert ul.children == children
+        assert [child.element for child in children] == list(ul.element.childNodes)
+        assert _node_texts(ul) == [str(value) for value in after]
+
+
+def test_removed_keys_are_destroyed_and_new_ones_created():
+    ul = HTML.Ul()
+    ul.element
+    one, two, three = ul.set_children([1, 2, 3], factory=_item)
+
+    children = ul.set_children([4, 3, 1, 5], factory=_item)
+
+    assert children[1:3] == [three, one]
+    assert two.id not in HTML._element_registry
+    assert _node_texts(ul) == ["4", "3", "1", "5"]
+
+
+def test_children_before_start_are_kept():
+    ul = HTML.Ul()
+    header = HTML.Li(inner_html="header", parent=ul)
+    ul.element
+    ul.set_children([1, 2], factory=_item, start=1)
+
+    ul.set_children([2, 3, 1], factory=_item, start=1)
+
+    assert ul.children[0] is header
+    assert _node_texts(ul) == ["header", "2", "3", "1"]
+
+
+def test_update_is_called_for_reused_children():
+    ul = HTML.Ul()
+    ul.element
+    ul.set_children([{"id": 1, "text": "a"}], factory=lambda item: _item(item["text"]), key=lambda item: item["id"])
+
+    def update(child, item):
+        child.inner_html = item["text"]
+
+    ul.set_children([{"id": 1, "text": "b"}], factory=lambda item: _item(item["text"]),
+                    key=lambda item: item["id"], update=update)
+
+    assert _node_texts(ul) == ["b"]
+
+
+def test_children_from_stop_are_kept():
+    ul = HTML.Ul()
+    ul.element
+    ul.set_children([1, 2], factory=_item)
+    footer = HTML.Li(inner_html="footer", parent=ul)
+
+    ul.set_children([2, 3], factory=_item, stop=2)
+
+    assert ul.children[-1] is footer
+    assert _node_texts(ul) == ["2", "3", "footer"]
@@ -0,0 +1,55 @@
+from pyscript_bootstrap_templates import HTML, headless
+from pyscript_bootstrap_templates import bootstrap_HTML as bHTML
+from pyscript_bootstrap_templates import bootstrap_inputs as bInputs
+
+_STAMPED_CLASSES = (bInputs.InputElement, bHTML.Card, bHTML.AccordionItem, bHTML.Toast, bHTML.ModalHeader)
+
+
+def _build(count: int) -> HTML.Div:
+    root = HTML.Div()
+    root.element
+    for i in range(count):
+        bInputs.InputText(label_text=f"label {i}",
+                          help_text="help" if i % 2 else None,
+                          placeholder=f"placeholder {i}",
+                          parent=root)
+        bHTML.Card(card_body=HTML.Div(inner_html=f"body {i}"), parent=root)
+        bHTML.AccordionItem(f"content {i}", f"title {i}", show_on_default=i % 2 == 0, parent=root)
+        bHTML.Toast(f"toast {i}", title=f"title {i}", parent=root)
+        bHTML.ModalHeader(f"header {i}", parent=root)
+    return root
+
+
+def _build_with_ids(count: int) -> HTML.Div:
+    previous = HTML.get_id_allocator()
+    HTML.set_id_allocator(HTML.IdAllocator(prefix="stamp-"))
+    try:
+        return _build(count)
+    finally:
+        HTML.set_id_allocator(previous)
+
+
+def test_stamped_widgets_match_constructed_ones(monkeypatch):
+    HTML._stamp_templates.clear()
+    stamped = _build_with_ids(6)
+    assert any(template is not None for template in HTML._stamp_templates.values())
+
+    for cls in _STAMPED_CLASSES:
+        monkeypatch.setattr(cls, "_stamped", False)
+    constructed = _build_with_ids(6)
+
+    assert stamped.to_html() == constructed.to_html()
+
+
+def test_stamped_widgets_keep_their_listeners():
+    HTML._stamp_templates.clear()
+    root = _build(4)
+    inputs = [child for child in root.children if isinstance(child, bInputs.InputText)]
+    changed = []
+    for i, input_element in enumerate(inputs):
+        input_element.onchange = lambda event, i=i: changed.append(i)
+
+    for input_element in inputs:
+        input_element._input.element.dispatchEvent(headless.Event("change"))
+
+    assert changed == [0, 1, 2, 3]
@@ -0,0 +1,37 @@
+from pyscript_bootstrap_templates import HTML
+
+
+def _compiled_classes(element):
+    return [token for token in element.class_list if token.startswith("ps-style-")]
+
+
+def test_switching_to_inline_styles_keeps_compiled_styles():
+    HTML.set_style_compiler(HTML.StyleCompiler())
+    element = HTML.Div()
+    element.set_style("color", "red")
+    assert _compiled_classes(element)
+
+    HTML.set_style_compiler(None)
+
+    assert _compiled_classes(element) == []
+    assert element.get_style("color") == "red"
+    assert element.element.style.color == "red"
+
+
+def test_switching_compilers_keeps_compiled_styles():
+    first = HTML.StyleCompiler()
+    HTML.set_style_compiler(first)
+    element = HTML.Div()
+    element.element
+    element.set_styles(color="red", marginTop="4px")
+
+    second = HTML.StyleCompiler()
+    HTML.set_style_compiler(second)
+    try:
+        assert first.style_element is None
+        (token,) = _compiled_classes(element)
+        assert token in element.element.className
+        assert f".{token} {{ color: red; margin-top: 4px; }}" in second.css_text
+        assert element.get_style("marginTop") == "4px"
+    finally:
+        HTML.set_style_compiler(None)
@@ -0,0 +1,38 @@
+from pyscript_bootstrap_templates import HTML
+
+
+def test_text_and_attribute_values_are_escaped():
+    div = HTML.Div(id="escaped")
+    div.set_attribute("title", 'a "b" <c> & d')
+    span = HTML.Span(parent=div)
+    span.element.textContent = "1 < 2 & 3"
+
+    assert div.to_html() == ('<div id="escaped" title="a &quot;b&quot; &lt;c&gt; &amp; d">'
+                             f'<span id="{span.id}">1 &lt; 2 &amp; 3</span></div>')
+
+
+def test_void_elements_have_no_closing_tag():
+    div = HTML.Div(id="void")
+    HTML.Br(id="void-br", parent=div)
+    HTML.Hr(id="void-hr", parent=div)
+
+    assert div.to_html() == '<div id="void"><br id="void-br"><hr id="void-hr"></div>'
+
+
+def test_boolean_attributes_are_written_bare():
+    button = HTML.Button(id="boolean")
+    button.element.disabled = True
+    button.set_attribute("hidden", "")
+
+    assert button.to_html() == '<button id="boolean" type="button" disabled hidden></button>'
+
+    button.element.disabled = False
+
+    assert button.to_html() == '<button id="boolean" type="button" hidden></button>'
+
+
+def test_inner_html_is_parsed():
+    div = HTML.Div(id="parsed", inner_html="<b>bold</b> &amp; plain")
+
+    assert div.to_html() == '<div id="parsed"><b>bold</b> &amp; plain</div>'
+    assert div.element.childNodes[0].tagName == "B"
@@ -0,0 +1,61 @@
+from pyscript_bootstrap_templates import HTML
+from pyscript_bootstrap_templates.vdom import VDomRoot, VNode
+
+
+def _root():
+    host = HTML.Div()
+    host.element
+    return host, VDomRoot(host)
+
+
+def test_inner_html_destroys_the_rendered_children():
+    host, root = _root()
+    root.render(VNode(HTML.Div, VNode(HTML.Span, inner_html="a")))
+    span = host.children[0].children[0]
+
+    root.render(VNode(HTML.Div, inner_html="text"))
+    root.render(VNode(HTML.Div, VNode(HTML.Span, inner_html="b")))
+
+    div = host.children[0]
+    assert [child.inner_html for child in div.children] == ["b"]
+    assert span.id not in HTML._element_registry
+    assert host.to_html() == f'<div id="{host.id}"><div id="{div.id}"><span id="{div.children[0].id}">b</span></div></div>'
+
+
+def _items(*keys):
+    return VNode(HTML.Ul, *[VNode(HTML.Li, key=key, inner_html=str(key)) for key in keys])
+
+
+def _texts(element):
+    return [node.textContent for node in element.element.childNodes]
+
+
+def test_keyed_children_are_reordered_not_recreated():
+    host, root = _root()
+    root.render(_items(1, 2, 3))
+    ul = host.children[0]
+    one, two, three = ul.children
+
+    root.render(_items(3, 1, 2))
+
+    assert host.children[0] is ul
+    assert ul.children == [three, one, two]
+    assert _texts(ul) == ["3", "1", "2"]
+
+    root.render(_items(2, 4))
+
+    assert ul.children[0] is two
+    assert _texts(ul) == ["2", "4"]
+    assert one.id not in HTML._element_registry and three.id not in HTML._element_registry
+
+
+def test_children_replace_inner_html():
+    host, root = _root()
+    root.render(VNode(HTML.Div, inner_html="text"))
+    div = host.children[0]
+
+    root.render(VNode(HTML.Div, VNode(HTML.Span, inner_html="a"), VNode(HTML.Span, inner_html="b")))
+
+    assert host.children[0] is div
+    assert [child.inner_html for child in div.children] == ["a", "b"]
+    assert _texts(div) == ["a", "b"]